@@ -45,7 +45,10 @@ import colorama
 
 from .cad import create_cad
 from .database import CellDatabase
-from .designer import BatterySystemDesigns
+from .designer import DEFAULT_CHUNK_SIZE, STRATEGIES, BatterySystemDesigns
+from .designer.design_cache import DesignCache
+from .designer.requirement_sweep import RequirementSweep, SweepSpecification
+from .designer.shared_precomputation import SharedPrecomputation
 from .requirements import Requirements
 from .simulation import LifeCycleSimulation
 from .utils import (
@@ -61,6 +64,18 @@ warnings.simplefilter(action="ignore", category=FutureWarning)
 CONTEXT_SETTINGS = {"help_option_names": ["-h", "--help"]}
 
 
+def parse_sweep(
+    ctx: click.Context, param: click.Parameter, value: Optional[str]
+) -> Optional[SweepSpecification]:
+    """parses the sweep specification of the design command"""
+    if value is None:
+        return None
+    try:
+        return SweepSpecification.parse(value)
+    except ValueError as error:
+        raise click.BadParameter(str(error), ctx, param) from error
+
+
 @click.group(context_settings=CONTEXT_SETTINGS, invoke_without_command=True)
 @click.version_option(version=__version__)
 @click.option(
@@ -182,10 +197,12 @@ def remove(
 @click.option(
     "-r",
     "--requirements",
-    "requirements_file",
-    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    "requirements_files",
+    type=click.Path(exists=True, path_type=Path),
+    multiple=True,
     is_eager=True,
-    help="Read a battery system configuration from a FILE path.",
+    help="Read a battery system configuration from a FILE path. Several files or a "
+    "DIRECTORY of json files are designed in one run.",
 )
 @click.option(
     "-d",
@@ -201,7 +218,8 @@ def remove(
     type=click.Path(exists=False, dir_okay=False, path_type=Path),
     default=(Path(os.getcwd()) / "report"),
     is_eager=True,
-    help="Write report file to FILE.",
+    help="Write report file to FILE. For several requirement files the name of "
+    "each requirement file is appended.",
 )
 @click.option(
     "--max-number-of-solutions",
@@ -230,17 +248,83 @@ def remove(
     default=multiprocessing.cpu_count() - 1,
     help="Number of cpu cores used for the calculations.",
 )
+@click.option(
+    "--chunk-size",
+    type=click.IntRange(min=1),
+    default=DEFAULT_CHUNK_SIZE,
+    help="Number of parameter sets of a cell that are checked at once. "
+    "Smaller values reduce the memory usage.",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Determines the system designs of all cells without using the design cache.",
+)
+@click.option(
+    "--time-budget",
+    type=click.FloatRange(min=0),
+    default=None,
+    help="Time in seconds after which the best system designs found so far are "
+    "reported.",
+)
+@click.option(
+    "--max-candidates",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Maximal number of checked parameter sets, the most promising ones are "
+    "checked first.",
+)
+@click.option(
+    "--stream",
+    is_flag=True,
+    help="Writes the best system designs of each checked part of the search to a "
+    "JSON Lines file next to the report as soon as they are found.",
+)
+@click.option(
+    "--sweep",
+    type=str,
+    default=None,
+    callback=parse_sweep,
+    help="Sweeps one requirement as NAME=START:STOP:STEP or NAME=VALUE,VALUE,... "
+    "(e.g. energy=40000:120000:10000) and reports the best system designs of all "
+    "values in one table.",
+)
+@click.option(
+    "--strategy",
+    type=click.Choice(STRATEGIES, case_sensitive=True),
+    default="branch-and-bound",
+    help="Searches the best system designs by checking all parameter sets "
+    "(exhaustive), the parameter sets that are not pruned by the requirements "
+    "(branch-and-bound), an evolving sample of them (sampling) or by mixed-integer "
+    "linear programs (milp), which is faster if few solutions are requested from a "
+    "large design space.",
+)
+@click.option(
+    "--strategy-plugin",
+    type=str,
+    required=False,
+    help="Use a custom search strategy instead of --strategy. The module needs to "
+    "be installed in the same python installation/environment.",
+)
 @click.pass_context
-def design(  # pylint: disable=too-many-arguments
+def design(  # pylint: disable=too-many-arguments,too-many-locals,too-many-branches
     ctx: click.Context,
     verbose: int,
-    requirements_file: Path,
+    requirements_files: tuple[Path, ...],
     database: Path,
     report_file: Path,
     max_number_of_solutions: int,
     cell: Optional[str],
     overhead_plugin: Optional[str],
     cores: Optional[int],
+    chunk_size: int,
+    no_cache: bool,
+    time_budget: Optional[float],
+    max_candidates: Optional[int],
+    stream: bool,
+    sweep: Optional[SweepSpecification],
+    strategy: str,
+    strategy_plugin: Optional[str],
 ) -> None:
     """system design task"""
     colorama.init()
@@ -249,31 +333,105 @@ def design(  # pylint: disable=too-many-arguments
     # load database
     cell_database = CellDatabase(database)
 
-    # get requirements configuration file
-    if not requirements_file:
+    # get requirements configuration files
+    requirements_files = [
+        y
+        for x in requirements_files
+        for y in (sorted(x.glob("*.json")) if x.is_dir() else [x])
+    ]
+    if not requirements_files:
         sys.exit(ERROR_MESSAGES["no-requirements"])
-    requirements_file: Path = Path(requirements_file)
-    requirement = Requirements(requirements_file)
-    if cell is not None:
-        manufacturer, model = tuple(cell.split(":"))
-        if requirement.manufacturer is not None or requirement.model is not None:
-            logging.warning(
-                "Requirement settings for manufacturer, cell model "
-                "and cell format were overwritten"
+    if len({x.stem for x in requirements_files}) < len(requirements_files):
+        sys.exit("Requirement files need distinct names to name their reports.")
+    if sweep is not None and (time_budget is not None or max_candidates is not None):
+        logging.warning("The budgets are ignored, as a sweep checks all parameter sets")
+    if sweep is not None and stream:
+        logging.warning("The designs of a sweep are not streamed")
+    if sweep is not None and (strategy != "branch-and-bound" or strategy_plugin):
+        logging.warning("A sweep checks all parameter sets, the strategy is ignored")
+    design_cache = None if no_cache else DesignCache()
+    # the designs of all requirement files share the database and the intermediate
+    # results that do not depend on the differing requirements
+    shared = SharedPrecomputation.from_design_cache(design_cache)
+    found_all = True
+    for requirements_file in requirements_files:
+        requirement = Requirements(requirements_file)
+        if cell is not None:
+            manufacturer, model = tuple(cell.split(":"))
+            if requirement.manufacturer is not None or requirement.model is not None:
+                logging.warning(
+                    "Requirement settings for manufacturer, cell model "
+                    "and cell format were overwritten"
+                )
+            requirement.manufacturer = manufacturer
+            requirement.model = model
+            requirement.format = None
+        report = report_file
+        if len(requirements_files) > 1:
+            report = report_file.with_name(
+                f"{report_file.name}_{requirements_file.stem}"
             )
-        requirement.manufacturer = manufacturer
-        requirement.model = model
-        requirement.format = None
 
-    bat_sys_variants = BatterySystemDesigns(
-        requirement,
-        cell_database,
-        max_number_of_solutions,
-        overhead_plugin,
-        cores,
-    )
-    bat_sys_variants.create_report(report_file)
-    ctx.exit(0)
+        if sweep is None:
+            bat_sys_variants = BatterySystemDesigns(
+                requirement,
+                cell_database,
+                max_number_of_solutions,
+                overhead_plugin,
+                cores,
+                chunk_size,
+                design_cache,
+                time_budget,
+                max_candidates,
+                shared,
+                Path(f"{report}.jsonl") if stream else None,
+                strategy,
+                strategy_plugin,
+            )
+            found = bool(bat_sys_variants.system_designs)
+        else:
+            bat_sys_variants = RequirementSweep(
+                requirement,
+                cell_database,
+                sweep,
+                max_number_of_solutions,
+                overhead_plugin,
+                cores,
+                chunk_size,
+                shared,
+            )
+            found = any(x.system_designs for x in bat_sys_variants.designs)
+        if len(requirements_files) == 1 or found:
+            bat_sys_variants.create_report(report)
+        else:
+            logging.error("No fitting system found for %s", requirements_file)
+            found_all = False
+    ctx.exit(0 if found_all else 1)
+
+
+@main.group(context_settings=CONTEXT_SETTINGS)
+def cache() -> None:
+    """BaSD design cache command"""
+
+
+@cache.command(name="show")
+@click.version_option(version=__version__)
+@click.option("-v", "--verbose", default=2, count=True, help="Verbose information.")
+@click.pass_context
+def show_cache(ctx: click.Context, verbose: int) -> None:
+    """shows the location, size and entries of the design cache"""
+    set_logging_level(verbose)
+    ctx.exit(DesignCache().show())
+
+
+@cache.command(name="clear")
+@click.version_option(version=__version__)
+@click.option("-v", "--verbose", default=2, count=True, help="Verbose information.")
+@click.pass_context
+def clear_cache(ctx: click.Context, verbose: int) -> None:
+    """removes all entries of the design cache"""
+    set_logging_level(verbose)
+    ctx.exit(DesignCache().clear())
 
 
 @main.command()
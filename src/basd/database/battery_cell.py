@@ -33,6 +33,8 @@
 
 """Defines the BatteryCell class which holds all relevant data information on a battery cell"""
 
+import hashlib
+import json
 
 from .cell_data.descriptors import (
     CapacitySpec,
@@ -55,9 +57,13 @@ class BatteryCell:  # pylint: disable=too-few-public-methods,too-many-instance-a
     :ivar identification: all information needed to identify the battery cell
     :ivar mechanics: all mechanical properties of the battery cell
     :ivar electrics: all electrical properties of the battery cell
+    :ivar checksum: hash of the cell data
     """
 
     def __init__(self, cfg: dict) -> None:
+        self.checksum = hashlib.sha256(
+            json.dumps(cfg, sort_keys=True).encode("utf-8")
+        ).hexdigest()
         self.identification = self._add_identification(cfg["identification"])
         self.mechanics = self._add_mechanics(cfg["basics"]["mechanics"])
         self.electrics = self._add_electrics(cfg["basics"]["electrics"])
@@ -33,44 +33,78 @@
 
 """battery_system provides the class BatterySystemDesigns
 """
+import heapq
 import json
 import logging
+import math
+import multiprocessing
 import sys
-from itertools import product
+import time
+from dataclasses import replace
+from itertools import groupby, islice
+from operator import itemgetter
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
-from joblib import Parallel, delayed
-from scipy import interpolate
+from joblib import effective_n_jobs
 
 from ..database import CellDatabase
 from ..database.battery_cell import BatteryCell
 from ..requirements import Requirements
-from .basic_sets import (
-    ElectricalConfiguration,
-    ElectricalProperties,
-    MechanicalProperties,
-    Overhead,
-)
+from ..utils import load_plugin_class
+from .basic_sets import ElectricalConfiguration
 from .cooling import Cooling
-from .find_parameter_sets import find_parameter_sets
+from .count_caps import CountCaps
+from .design_cache import DesignCache
+from .design_stream import DesignStream
+from .electrical_configurations import electrical_configurations
+from .find_parameter_sets import count_parameter_sets
+from .milp_search import MilpSearch
 from .overhead_functions import OverheadFunctions
-from .parameter_set import ParameterSet
+from .parameter_set_arrays import ParameterSetArrays
+from .pareto_system_designs import pareto_front
+from .search_statistics import DesignStatistics, SearchStatistics
+from .search_strategies import SEARCH_STRATEGIES, AbcSearchStrategy, get_search_strategy
+from .shared_precomputation import SharedPrecomputation
 from .system_design import SystemDesign
+from .work_units import (
+    CELL_ROTATION,
+    CellParameters,
+    SystemDesignRecords,
+    WorkUnit,
+    WorkUnitChecker,
+    check_work_unit,
+    initialize_worker,
+)
+
+#: default number of parameter sets that are checked at once
+DEFAULT_CHUNK_SIZE = 50000
+#: minimal number of work units per cpu core, if there are enough parameter sets
+WORK_UNITS_PER_CORE = 4
+#: strategies to search the best parameter sets, see BatterySystemDesigns
+STRATEGIES = (*SEARCH_STRATEGIES, "milp")
 
 
-class BatterySystemDesigns:
+class BatterySystemDesigns:  # pylint: disable=too-many-instance-attributes
     """BatterySystemDesigns class as first step in the pipeline finds and ranks possible
     battery system designs"""
 
-    def __init__(  # pylint: disable=too-many-arguments
+    def __init__(  # pylint: disable=too-many-arguments,too-many-locals
         self,
         requirements: Requirements,
         cell_database: CellDatabase,
         max_number_of_solutions: int,
         overhead_plugin: str,
         cores: int,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        design_cache: DesignCache | None = None,
+        time_budget: float | None = None,
+        max_candidates: int | None = None,
+        shared: SharedPrecomputation | None = None,
+        stream_file: Path | None = None,
+        strategy: str = "branch-and-bound",
+        strategy_plugin: str = "",
     ) -> None:
         """The constructor of the BatterySystemDesigns
 
@@ -79,10 +113,41 @@ class BatterySystemDesigns:
         :param max_number_of_solutions: the maximal number of solution printed into the
             report
         :param cores: number of cpu cores used for the calculations
+        :param chunk_size: number of parameter sets of a cell that are generated and
+            checked at once
+        :param design_cache: cache of the best parameter sets of each cell, None
+            checks all cells
+        :param time_budget: time in seconds after which the best system designs
+            found so far are returned, None checks all parameter sets
+        :param max_candidates: maximal number of checked parameter sets, None checks
+            all parameter sets
+        :param shared: intermediate results shared with the designs of other
+            requirements, e.g., in a batch run
+        :param stream_file: JSON Lines file to which the best parameter sets of each
+            work unit are written as soon as it is checked, None writes no file
+        :param strategy: strategy to search the best parameter sets in STRATEGIES
+        :param strategy_plugin: installed module implementing a class called
+            'SearchStrategy' derived from AbcSearchStrategy, which replaces strategy
         """
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown search strategy '{strategy}'.")
         self.requirements = requirements
         self.cell_database = cell_database
         self.max_number_of_solutions = max_number_of_solutions
+        self.chunk_size = chunk_size
+        self.design_cache = design_cache
+        # cells with the same number of cells in series or in parallel share the
+        # enumerated parameter sets, which are persisted along the design cache
+        self.shared = shared or SharedPrecomputation.from_design_cache(design_cache)
+        self.time_budget = time_budget
+        self.max_candidates = max_candidates
+        self.stream_file = stream_file
+        self.strategy = strategy
+        self.strategy_plugin = strategy_plugin
+        #: True if all parameter sets have been checked within the budgets
+        self.exhaustive = True
+        #: wall time of the stages and search statistics of the checked cells
+        self.statistics = DesignStatistics()
         considered_cells, overhead_functions = self._filter_inputs_by_settings(
             overhead_plugin
         )
@@ -90,46 +155,622 @@ class BatterySystemDesigns:
         self.overhead_functions = overhead_functions
         self.system_designs = self.determine_battery_system_designs(cores)
 
-    def determine_battery_system_designs(  # pylint: disable=too-many-locals
+    def determine_battery_system_designs(  # pylint: disable=too-many-locals,too-many-branches
         self, cores
     ) -> list:
         """determines all valid battery system designs for all considered cells and
         cooling systems
 
+        The parameter sets of each cell are split into work units, which are
+        scheduled dynamically on the cpu cores. The worker processes are initialized
+        once with the data shared by all work units and return the best parameter
+        sets as numeric records. Only the finally selected records are turned into
+        system designs. The parameter sets of a work unit are searched by the search
+        strategy (AbcSearchStrategy). The result of the complete strategies does not
+        depend on the number of cores or work units.
+
+        The most promising work units are checked first, so that the best system
+        designs found so far are returned, if the time or candidate budget is
+        exhausted.
+
+        The 'milp' strategy searches the same best parameter sets by mixed-integer
+        linear programs in this process instead (MilpSearch).
+
         :return: a list with all validated battery system designs
         """
-        system_designs = []
-        result = Parallel(n_jobs=cores, backend="multiprocessing", verbose=1)(
-            delayed(self._system_designs_per_cell)(cell, logging.getLogger().level)
-            for cell in self.considered_cells
+        deadline = None
+        if self.time_budget is not None:
+            deadline = time.time() + self.time_budget
+        statistics = self.statistics
+        with statistics.stage("cell_parameters"):
+            cell_parameters = self._cell_parameters()
+        pareto = self.requirements.optimized_by == "pareto"
+        max_number_per_cell = self._max_number_per_cell()
+        with statistics.stage("precomputed_records"):
+            records_per_cell = self._precomputed_records(
+                cell_parameters, max_number_per_cell
+            )
+        with statistics.stage("design_cache"):
+            cache_keys = (
+                {}
+                if self.design_cache is None
+                else self.design_cache.load_cells(
+                    cell_parameters,
+                    records_per_cell,
+                    self.requirements,
+                    self.overhead_functions,
+                    max_number_per_cell,
+                )
+            )
+        stream = self._design_stream(cell_parameters, records_per_cell)
+        unchecked = [i for i, x in enumerate(records_per_cell) if x is None]
+        search_strategy = self._search_strategy()
+        if search_strategy is None:
+            with statistics.stage("milp_search"):
+                result, complete_cells = self._search_cells(
+                    cell_parameters, unchecked, max_number_per_cell, deadline, stream
+                )
+            # cells whose best parameter sets are cut off by the other cells are not
+            # stored in the design cache
+            cache_keys = {x: y for x, y in cache_keys.items() if x in complete_cells}
+            incomplete_cells = set()
+        else:
+            with statistics.stage("work_units"):
+                work_units, incomplete_cells = self._schedule(
+                    cell_parameters, self._work_units(cell_parameters, unchecked, cores)
+                )
+            checker = WorkUnitChecker(
+                self.requirements,
+                self.overhead_functions,
+                cell_parameters,
+                max_number_per_cell,
+                self.chunk_size,
+                deadline,
+                {
+                    (x.cell_index, x.cooling_index): self.shared.overhead_table(
+                        cell_parameters[x.cell_index].cell,
+                        self.requirements,
+                        self.overhead_functions[x.cooling_index],
+                    )
+                    for x in work_units
+                },
+                search_strategy,
+            )
+            # the wall time includes the transfer of the work units and records
+            # between the processes
+            with statistics.stage("check_work_units"):
+                result = self._check_work_units(checker, work_units, cores, stream)
+        for records in result:
+            statistics.add(
+                str(cell_parameters[records.cell_index].cell), records.statistics
+            )
+        with statistics.stage("merge"):
+            for cell_index, group in groupby(result, key=lambda x: x.cell_index):
+                records_per_cell[cell_index] = self._merge_work_units(
+                    cell_index, list(group), max_number_per_cell
+                )
+        for cell_index, records in enumerate(records_per_cell):
+            if records is None:
+                records = SystemDesignRecords.from_rows(cell_index, [])
+                records_per_cell[cell_index] = records
+            if cell_index in incomplete_cells:
+                records.exhaustive = False
+            if cell_index in cache_keys and records.exhaustive:
+                self.design_cache.store(
+                    cache_keys[cell_index], records, max_number_per_cell
+                )
+        self.exhaustive = all(x.exhaustive for x in records_per_cell)
+        if not self.exhaustive:
+            logging.warning(
+                "Not all parameter sets were checked within the budget or by the "
+                "search strategy, the best system designs found so far are reported"
+            )
+        with statistics.stage("merge"):
+            if pareto:
+                records = self._pareto_front(cell_parameters, records_per_cell)
+            else:
+                # parameter sets with the same objective value are ranked in the
+                # order of the considered cells
+                records = list(
+                    islice(
+                        heapq.merge(
+                            *(x.rows() for x in records_per_cell), key=itemgetter(0)
+                        ),
+                        self.max_number_of_solutions,
+                    )
+                )
+        with statistics.stage("system_designs"):
+            system_designs = self._create_system_designs(cell_parameters, records)
+        if self.requirements.only_best and not pareto:
+            for system_design in system_designs:
+                logging.info("Added best configuration of cell %s", system_design.cell)
+        statistics.log_summary()
+        return system_designs
+
+    def _search_cells(  # pylint: disable=too-many-arguments
+        self,
+        cell_parameters: list[CellParameters],
+        cell_indices: list[int],
+        max_number_per_cell: int,
+        deadline: float | None,
+        stream: DesignStream | None,
+    ) -> tuple[list[SystemDesignRecords], set[int]]:
+        """searches the best parameter sets of the cells by mixed-integer linear
+        programs
+
+        :param cell_parameters: the parameters of the considered cells
+        :param cell_indices: indices of the cells to be checked
+        :param max_number_per_cell: number of requested parameter sets per cell
+        :param deadline: time after which no further programs are solved
+        :param stream: stream to which the records of each cell are written
+        :return: the best parameter sets of each cell, and the indices of the cells
+            whose best parameter sets are complete
+        """
+        result, complete_cells = MilpSearch(
+            self.requirements,
+            self.overhead_functions,
+            cell_parameters,
+            max_number_per_cell,
+            self.max_number_of_solutions,
+            deadline,
+            self.max_candidates,
+            {
+                (i, j): self.shared.overhead_table(
+                    cell_parameters[i].cell, self.requirements, overhead_functions
+                )
+                for i in cell_indices
+                for j, overhead_functions in enumerate(self.overhead_functions)
+            },
+        ).search(cell_indices)
+        if stream is not None:
+            for records in result:
+                stream.write(records)
+        return result, complete_cells
+
+    def _search_strategy(self) -> type[AbcSearchStrategy] | None:
+        """returns the strategy by which the parameter sets of the work units are
+        searched
+
+        :return: the class of the strategy, or None if the cells are searched by
+            mixed-integer linear programs
+        """
+        if self.strategy_plugin or self.strategy != "milp":
+            return get_search_strategy(self.strategy, self.strategy_plugin)
+        if MilpSearch.applicable(self.requirements, self.overhead_functions):
+            return None
+        logging.warning(
+            "The milp strategy requires separable overhead functions and the "
+            "optimization by volume or weight, the branch-and-bound strategy is used"
         )
-        for system_design in result:
-            system_designs.extend(system_design)
-        if self.requirements.optimized_by == "volume":
-            system_designs.sort(key=lambda x: x.mechanical_properties.volume)
+        return get_search_strategy()
+
+    @staticmethod
+    def _check_work_units(
+        checker: WorkUnitChecker,
+        work_units: list[WorkUnit],
+        cores: int,
+        stream: DesignStream | None = None,
+    ) -> list[SystemDesignRecords]:
+        """checks the work units on the cpu cores
+
+        :param checker: the checker of the work units
+        :param work_units: the work units in the order they are checked
+        :param cores: number of cpu cores used for the calculations
+        :param stream: stream to which the records of each work unit are written as
+            soon as it is checked, None writes no stream
+        :return: the best parameter sets of each work unit in the order of the
+            parameter sets of each cell
+        """
+        processes = min(effective_n_jobs(cores), len(work_units))
+        result = []
+        if processes > 1:
+            with multiprocessing.Pool(
+                processes,
+                initializer=initialize_worker,
+                initargs=(checker, logging.getLogger().level),
+            ) as pool:
+                # the work units are collected as they finish, the order is restored
+                # below
+                for work_unit, records, added in pool.imap_unordered(
+                    check_work_unit, work_units, chunksize=1
+                ):
+                    # the overheads added in the worker processes are reused by the
+                    # designs of further requirements
+                    overhead_table = checker.overhead_table(work_unit)
+                    for names, values in added.items():
+                        overhead_table.setdefault(names, {}).update(values)
+                    if stream is not None:
+                        stream.write(records)
+                    result.append((work_unit, records))
+        else:
+            for work_unit in work_units:
+                records = checker.check(work_unit)
+                if stream is not None:
+                    stream.write(records)
+                result.append((work_unit, records))
+        # the work units are checked by priority, but merged in the order of the
+        # parameter sets of each cell
+        return [x for _, x in sorted(result, key=itemgetter(0))]
+
+    def _design_stream(
+        self,
+        cell_parameters: list[CellParameters],
+        records_per_cell: list[SystemDesignRecords | None],
+    ) -> DesignStream | None:
+        """creates the stream of the best parameter sets of the checked work units,
+        which starts with the cached parameter sets
+
+        :param cell_parameters: the parameters of the considered cells
+        :param records_per_cell: the cached parameter sets of each cell or None
+        :return: the stream or None, if no stream file is set
+        """
+        if self.stream_file is None:
+            return None
+        if self.requirements.optimized_by == "pareto":
+            objectives = ("volume", "weight")
         else:
-            system_designs.sort(key=lambda x: x.mechanical_properties.weight)
+            objectives = (self.requirements.optimized_by,)
+        stream = DesignStream(
+            self.stream_file,
+            [str(x.cell) for x in cell_parameters],
+            [x.cooling.name for x in self.overhead_functions],
+            objectives,
+        )
+        for records in records_per_cell:
+            if records is not None:
+                stream.write(records)
+        return stream
+
+    def _max_number_per_cell(self) -> int:
+        """returns the number of parameter sets that are kept for each cell
+
+        :return: one parameter set, if only the best one of each cell is requested,
+            otherwise the maximal number of solutions
+        """
+        if self.requirements.optimized_by == "pareto":
+            # the pareto front of all cells may contain any non-dominated parameter
+            # set of a cell
+            return sys.maxsize
         if self.requirements.only_best:
-            filtered_system_designs = []
-            filtered_cells = []
-            for system_design in system_designs.copy():
-                if system_design.cell not in filtered_cells:
-                    filtered_system_designs.append(system_design)
-                    filtered_cells.append(system_design.cell)
-                    logging.info(
-                        "Added best configuration of cell %s", system_design.cell
+            return 1
+        return self.max_number_of_solutions
+
+    def _merge_work_units(
+        self, cell_index: int, results: list[SystemDesignRecords], max_number: int
+    ) -> SystemDesignRecords:
+        """merges the best parameter sets of the work units of a cell
+
+        :param cell_index: index of the cell in the considered cells
+        :param results: the records of the work units in the order of the parameter
+            sets of the cell
+        :param max_number: number of requested parameter sets per cell
+        :return: the best parameter sets of the cell
+        """
+        if self.requirements.optimized_by == "pareto":
+            records = SystemDesignRecords.concatenate(cell_index, results)
+            return records.take(pareto_front(records.values))
+        # the records of each work unit are already sorted and the work units of a
+        # cell are in the order of its parameter sets, so that parameter sets with the
+        # same objective value are ranked as if they were checked serially
+        records = SystemDesignRecords.from_rows(
+            cell_index,
+            list(
+                islice(
+                    heapq.merge(*(x.rows() for x in results), key=itemgetter(0)),
+                    max_number,
+                )
+            ),
+        )
+        records.exhaustive = all(x.exhaustive for x in results)
+        return records
+
+    def _precomputed_records(
+        self,
+        cell_parameters: list[CellParameters],
+        max_number: int,  # pylint: disable=unused-argument
+    ) -> list[SystemDesignRecords | None]:
+        """returns the best parameter sets of the cells that are already determined,
+        e.g., by another design run sharing the intermediate results
+
+        :param cell_parameters: the parameters of the considered cells
+        :param max_number: number of requested parameter sets per cell
+        :return: the best parameter sets of each cell or None, if they have to be
+            determined
+        """
+        return [None] * len(cell_parameters)
+
+    def _pareto_front(
+        self,
+        cell_parameters: list[CellParameters],
+        records_per_cell: list[SystemDesignRecords],
+    ) -> list[tuple[list[float], SystemDesignRecords, int]]:
+        """selects the parameter sets of all cells that are not dominated in volume,
+        weight and optionally the energy overshoot
+
+        :param cell_parameters: the parameters of the considered cells
+        :param records_per_cell: the pareto front of each cell
+        :return: the pareto front as tuples of objective values, records of a cell
+            and row, sorted lexicographically by volume and weight
+        """
+        if not records_per_cell:
+            return []
+        values = []
+        for records in records_per_cell:
+            columns = [records.values.reshape(-1, 2)]
+            if self.requirements.pareto_energy:
+                # the energy of all parameter sets of a cell is the same
+                energy = cell_parameters[
+                    records.cell_index
+                ].electrical_configuration.system_energy
+                columns.append(
+                    np.full((len(records), 1), energy - self.requirements.energy)
+                )
+            values.append(np.hstack(columns))
+        rows = [row for records in records_per_cell for row in records.rows()]
+        front = pareto_front(np.concatenate(values))
+        if len(front) > self.max_number_of_solutions:
+            logging.warning(
+                "The pareto front consists of %s system designs, only the %s with the "
+                "smallest volume are reported",
+                len(front),
+                self.max_number_of_solutions,
+            )
+        return [rows[i] for i in front[: self.max_number_of_solutions].tolist()]
+
+    def _create_system_designs(
+        self,
+        cell_parameters: list[CellParameters],
+        records: list[tuple[float, SystemDesignRecords, int]],
+    ) -> list[SystemDesign]:
+        """creates the system designs of the selected records
+
+        :param cell_parameters: the parameters of the considered cells
+        :param records: the selected records as tuples of objective value, records of
+            a cell and row
+        :return: the system designs in the order of the records
+        """
+        rows_per_cooling = {}
+        for position, (_, cell_records, i) in enumerate(records):
+            key = (cell_records.cell_index, int(cell_records.cooling_index[i]))
+            rows_per_cooling.setdefault(key, []).append((position, cell_records, i))
+        system_designs = [None] * len(records)
+        for (cell_index, cooling_index), rows in rows_per_cooling.items():
+            parameter_sets = ParameterSetArrays(
+                cell_parameters[cell_index].cell,
+                self.requirements,
+                [self.overhead_functions[cooling_index]],
+                np.array([x.counts[i] for _, x, i in rows], dtype=np.int64),
+                np.array([x.cell_rotation[i] for _, x, i in rows], dtype=np.int64),
+                np.zeros(len(rows), dtype=np.int64),
+            )
+            checks = parameter_sets.check_upper_bounds()
+            if len(checks) != len(rows):
+                raise RuntimeError("Validated parameter sets could not be restored.")
+            for j, (position, _, _) in enumerate(rows):
+                system_designs[position] = checks.system_design(
+                    j, cell_parameters[cell_index].electrical_configuration
+                )
+        return system_designs
+
+    def _cell_parameters(self) -> list[CellParameters]:
+        """determines the electrical configuration and the parameters of the series
+        and parallel connection of all considered cells
+
+        :return: the parameters in the order of the considered cells
+        """
+        # the electrical configurations of all cells that are not shared yet are
+        # determined at once
+        keys = [
+            self.shared.electrical_key(x, self.requirements)
+            for x in self.considered_cells
+        ]
+        missing = {
+            key: cell
+            for key, cell in zip(keys, self.considered_cells)
+            if key not in self.shared.electrical_configurations
+        }
+        self.shared.electrical_configurations.update(
+            zip(
+                missing,
+                electrical_configurations(list(missing.values()), self.requirements),
+            )
+        )
+        logging.debug(
+            "Determined the electrical configurations of %s cells", len(missing)
+        )
+        cell_parameters = []
+        for cell, key in zip(self.considered_cells, keys):
+            logging.info("Process %s", cell)
+            electrical_configuration = self.shared.electrical_configurations[key]
+            logging.debug(electrical_configuration)
+            # get all possible parameters for the series and the parallel connection
+            # within the caps of the requirements, parameters with fewer cells are
+            # checked first as the most promising ones
+            caps = self._count_caps(cell, electrical_configuration)
+            cell_parameters.append(
+                CellParameters(
+                    cell,
+                    electrical_configuration,
+                    self.shared.parameter_sets.parameter_sets(
+                        electrical_configuration.cells_in_series,
+                        max_products=caps.series,
+                    ),
+                    self.shared.parameter_sets.parameter_sets(
+                        electrical_configuration.cells_in_parallel,
+                        max_products=caps.parallel,
+                    ),
+                )
+            )
+            logging.debug(
+                "Capped the parameters of the series connection from %s to %s and "
+                "of the parallel connection from %s to %s",
+                count_parameter_sets(electrical_configuration.cells_in_series),
+                len(cell_parameters[-1].parameters_series),
+                count_parameter_sets(electrical_configuration.cells_in_parallel),
+                len(cell_parameters[-1].parameters_parallel),
+            )
+        logging.debug(
+            "Enumerated parameter sets of %s targets, reused them %s times",
+            self.shared.parameter_sets.misses,
+            self.shared.parameter_sets.hits,
+        )
+        logging.debug(
+            "%s of %s cells have no parameter sets within the caps",
+            sum(len(x) == 0 for x in cell_parameters),
+            len(cell_parameters),
+        )
+        return cell_parameters
+
+    def _count_caps(
+        self, cell: BatteryCell, electrical_configuration: ElectricalConfiguration
+    ) -> CountCaps:
+        """derives the caps of the counts of a cell from the requirements
+
+        :param cell: the considered cell
+        :param electrical_configuration: the electrical configuration of the cell
+        :return: the caps of the series and parallel connection
+        """
+        return CountCaps.from_requirements(
+            cell, self.requirements, electrical_configuration, self.overhead_functions
+        )
+
+    def _work_units(
+        self, cell_parameters: list[CellParameters], cell_indices: list[int], cores: int
+    ) -> list[WorkUnit]:
+        """splits the parameter sets of all considered cells into work units
+
+        A work unit covers the parameter sets of one cell and cooling type for a
+        slice of the series parameters, with all parallel parameters and cell
+        rotations. The units are sized so that the work can be spread over all cpu
+        cores, even if only one cell is considered.
+
+        :param cell_parameters: the parameters of the considered cells
+        :param cell_indices: indices of the cells to be checked
+        :param cores: number of cpu cores used for the calculations
+        :return: the work units in the order of the cells and their parameter sets
+        """
+        number_of_parameter_sets = len(self.overhead_functions) * sum(
+            len(cell_parameters[i]) for i in cell_indices
+        )
+        unit_size = min(
+            self.chunk_size,
+            math.ceil(
+                number_of_parameter_sets
+                / (WORK_UNITS_PER_CORE * effective_n_jobs(cores))
+            ),
+        )
+        work_units = []
+        for cell_index in cell_indices:
+            parameters = cell_parameters[cell_index]
+            # the caps may leave a cell without parameters of one connection
+            if len(parameters) == 0:
+                continue
+            # number of series parameters per work unit
+            step = max(
+                1,
+                unit_size // (len(parameters.parameters_parallel) * len(CELL_ROTATION)),
+            )
+            for cooling_index in range(len(self.overhead_functions)):
+                for start in range(0, len(parameters.parameters_series), step):
+                    work_units.append(
+                        WorkUnit(
+                            cell_index,
+                            cooling_index,
+                            start,
+                            min(start + step, len(parameters.parameters_series)),
+                        )
                     )
-                    if set(filtered_cells) == set(self.considered_cells):
-                        break
-            system_designs = filtered_system_designs
-        return system_designs[: self.max_number_of_solutions]
+        logging.debug(
+            "Split %s parameter sets into %s work units",
+            number_of_parameter_sets,
+            len(work_units),
+        )
+        return work_units
+
+    def _schedule(
+        self, cell_parameters: list[CellParameters], work_units: list[WorkUnit]
+    ) -> tuple[list[WorkUnit], set[int]]:
+        """orders the work units by a lower bound of their objective and limits them
+        to the candidate budget
+
+        The lower bound is the volume or weight of the bare cells of the first
+        parameter set of a work unit, which is the one with the fewest cells.
+
+        :param cell_parameters: the parameters of the considered cells
+        :param work_units: the work units in the order of the parameter sets
+        :return: the work units in the order they are checked and the indices of the
+            cells whose parameter sets are not all checked
+        """
+
+        def lower_bound(work_unit: WorkUnit) -> float:
+            parameters = cell_parameters[work_unit.cell_index]
+            mechanics = parameters.cell.mechanics
+            number_of_cells = int(
+                parameters.parameters_series[work_unit.series_start].prod()
+                * parameters.parameters_parallel[0].prod()
+            )
+            if self.requirements.optimized_by == "weight":
+                return number_of_cells * mechanics.weight
+            return (
+                number_of_cells * mechanics.height * mechanics.length * mechanics.width
+            )
+
+        work_units = sorted(work_units, key=lambda x: (lower_bound(x), x))
+        if self.max_candidates is None:
+            return work_units, set()
+        scheduled_units = []
+        incomplete_cells = set()
+        remaining = self.max_candidates
+        for work_unit in work_units:
+            per_series_parameter = len(
+                cell_parameters[work_unit.cell_index].parameters_parallel
+            ) * len(CELL_ROTATION)
+            series_stop = min(
+                work_unit.series_stop,
+                work_unit.series_start + math.ceil(remaining / per_series_parameter),
+            )
+            if series_stop < work_unit.series_stop:
+                incomplete_cells.add(work_unit.cell_index)
+                # the parameter sets beyond the budget are unchecked candidates
+                number = (work_unit.series_stop - series_stop) * per_series_parameter
+                self.statistics.add(
+                    str(cell_parameters[work_unit.cell_index].cell),
+                    SearchStatistics(candidates=number, unchecked=number),
+                )
+            if series_stop > work_unit.series_start:
+                scheduled_units.append(replace(work_unit, series_stop=series_stop))
+            remaining -= (series_stop - work_unit.series_start) * per_series_parameter
+        logging.info(
+            "Check %s work units within the budget of %s parameter sets",
+            len(scheduled_units),
+            self.max_candidates,
+        )
+        return scheduled_units, incomplete_cells
 
     def create_report(self, report_file_name: Path) -> None:
         """create_report takes the result from determine_possible_systems and creates
-        a csv file with all possible systems
+        a csv file with all possible systems, the wall time of the stages and the
+        search statistics are written to a json file next to it
         """
         if not getattr(self, "system_designs", None):
             sys.exit("No fitting system found. Please check requirements and settings.")
+        with self.statistics.stage("report"):
+            df = self.report_data_frame()
+            out_csv = Path(f"{report_file_name}.csv")
+            df.to_csv(out_csv, sep=",", float_format="%.2f", index=True)
+            df.insert(0, "Nr.", df.index)
+            dict_df = df.to_dict("records")
+            out_json = Path(f"{report_file_name}.json")
+            with open(out_json, mode="w", encoding="utf-8") as f:
+                json.dump(dict_df, f, indent=4, ensure_ascii=False)
+        self.statistics.write(Path(f"{report_file_name}.statistics.json"))
+
+    def report_data_frame(self) -> pd.DataFrame:  # pylint: disable=too-many-locals
+        """returns the properties of all system designs as reported
+
+        :return: one row per system design in the order of the system designs, with
+            the numeric values rounded as in the report
+        """
         columns = [
             "Manufacturer",
             "Model",
@@ -198,8 +839,11 @@ class BatterySystemDesigns:
             "Overhead weight pack (%)",
             "Overall volume overhead (%)",
             "Overall weight overhead (%)",
+            "Exhaustive search",
         ]
-        df = pd.DataFrame(columns=columns)
+        # the values are collected column by column and the data frame is created
+        # once, as appending rows to a data frame copies it each time
+        data = {x: [] for x in columns}
         for i in self.system_designs:
             mech_prop = i.mechanical_properties
             volume_without_overhead = (
@@ -293,221 +937,18 @@ class BatterySystemDesigns:
                 / mech_prop.weight_without_overhead
                 * 100
                 - 100,
+                "Exhaustive search": self.exhaustive,
             }
-            df.loc[len(df)] = row
+            for column, value in row.items():
+                data[column].append(value)
+        df = pd.DataFrame(data, columns=columns)
         # cast specific columns to numeric values to control the float point precision
         # in the report
         columns_with_units = [x for x in df.columns if "(" in x and ")" in x]
-        df.loc[:, columns_with_units] = df.loc[:, columns_with_units].apply(
-            pd.to_numeric, errors="coerce", axis=1
-        )
-        df = df.round(2)
-        out_csv = Path(f"{report_file_name}.csv")
-        df.to_csv(out_csv, sep=",", float_format="%.2f", index=True)
-        df.insert(0, "Nr.", df.index)
-        dict_df = df.to_dict("records")
-        out_json = Path(f"{report_file_name}.json")
-        with open(out_json, mode="w", encoding="utf-8") as f:
-            json.dump(dict_df, f, indent=4, ensure_ascii=False)
-
-    def _determine_battery_system_configuration(  # pylint: disable=too-many-locals
-        self, cell_data: BatteryCell
-    ) -> ElectricalConfiguration:
-        """determines all relevant parameter of the electrical configuration
-
-        :param requirements: requirements object with all defined requirements of the
-            battery system
-        :param cell_data: the data of one specific cell
-        :return: relevant parameter of the electrical configuration of
-            the battery system
-        """
-        cells_in_series = np.ceil(
-            self.requirements.nominal_voltage / cell_data.electrics.voltage.nominal
-        )
-        nominal_system_voltage = cells_in_series * cell_data.electrics.voltage.nominal
-        min_system_voltage = cells_in_series * cell_data.electrics.voltage.minimum
-        if min_system_voltage < self.requirements.minimum_voltage:
-            lower_bound_cell_voltage = (
-                self.requirements.minimum_voltage / cells_in_series
-            )
-        else:
-            lower_bound_cell_voltage = cell_data.electrics.voltage.minimum
-        max_system_voltage = cells_in_series * cell_data.electrics.voltage.maximum
-        if max_system_voltage > self.requirements.maximum_voltage:
-            upper_bound_cell_voltage = (
-                self.requirements.maximum_voltage / cells_in_series
-            )
-        else:
-            upper_bound_cell_voltage = cell_data.electrics.voltage.maximum
-        soc = list(range(0, 101))[::-1]
-        f_soc = interpolate.interp1d(
-            cell_data.electrics.discharge_curve, soc, bounds_error=True
-        )
-        lower_soc = f_soc(lower_bound_cell_voltage)
-        upper_soc = f_soc(upper_bound_cell_voltage)
-        used_cell_capacity = (
-            (upper_soc - lower_soc) / 100 * cell_data.electrics.capacity.initial
-        )
-        required_system_capacity = self.requirements.energy / nominal_system_voltage
-        cells_in_parallel = np.ceil(required_system_capacity / used_cell_capacity)
-        max_discharge_power = (
-            cells_in_parallel
-            * cell_data.electrics.cont_current.discharge
-            * nominal_system_voltage
-        )
-        if max_discharge_power <= self.requirements.cont_max_discharge_power:
-            cells_in_parallel = np.ceil(
-                self.requirements.cont_max_discharge_power
-                / nominal_system_voltage
-                / cell_data.electrics.cont_current.discharge
-            )
-        max_charge_power = (
-            cells_in_parallel
-            * cell_data.electrics.cont_current.charge
-            * nominal_system_voltage
-        )
-        if max_charge_power <= self.requirements.cont_max_charge_power:
-            cells_in_parallel = np.ceil(
-                self.requirements.cont_max_charge_power
-                / nominal_system_voltage
-                / cell_data.electrics.cont_current.charge
-            )
-        system_capacity = cells_in_parallel * used_cell_capacity
-        electrical_configuration = ElectricalConfiguration(
-            int(cells_in_parallel),
-            int(cells_in_series),
-            nominal_system_voltage,
-            system_capacity,
-            lower_bound_cell_voltage,
-            upper_bound_cell_voltage,
-            used_cell_capacity,
-            system_capacity * nominal_system_voltage,
-        )
-        return electrical_configuration
-
-    def _check_upper_bounds(  # pylint: disable=too-many-locals, too-many-branches
-        self, list_of_parameter_sets: list[ParameterSet]
-    ) -> tuple[list[ParameterSet], list[dict[str, Overhead]]]:
-        """checks the parameter set for upper bound conditions
-
-        :param list_of_parameter_sets: a list with the parameter sets fulfilling the
-            lower bound condition from the electrical configuration
-        :return: a tuple with the validated parameter sets and their overheads
-        """
-        validated_parameter_sets = []
-        mechanical_properties = []
-        module_voltages = []
-        slave_utils = []
-        number_of_parameter_sets = len(list_of_parameter_sets)
-
-        for i, parameter_set in enumerate(list_of_parameter_sets):
-            logging.debug(
-                "Check parameter set number %s of %s", i, number_of_parameter_sets
-            )
-            module_voltage = parameter_set.get_maximum_module_voltage()
-            if module_voltage >= self.requirements.max_module_voltage:
-                continue
-            bjb = False
-            dimensions = {}
-            # first it is tried to place the bjb in length direction, then in width
-            # direction and last in height direction
-            # if bjb variable is never set to true, the loop will go to the next
-            # parameter set
-            for dim in ["length", "width", "height"]:
-                value, overhead = getattr(parameter_set, f"get_{dim}")(bjb=not bjb)
-                if value >= getattr(self.requirements, dim):
-                    if not bjb:
-                        value, overhead = getattr(parameter_set, f"get_{dim}")(
-                            bjb=False
-                        )
-                        if value >= getattr(self.requirements, dim):
-                            break
-                    else:
-                        break
-                else:
-                    bjb = True
-                dimensions[dim] = value
-                dimensions[f"{dim}_overhead"] = overhead
-            if len(dimensions) < 6:
-                continue
-            if not bjb:
-                logging.warning(
-                    "Overhead Functions: Battery junction box not consider in any direction"
-                )
-                continue
-            weight, weight_overhead = parameter_set.get_weight()
-            if weight >= self.requirements.weight:
-                continue
-            # check slave requirement
-            slave_util = parameter_set.get_slave_utilization(
-                self.requirements.slave_max
-            )
-            if slave_util is not None and (
-                # not fulfilling the requirements
-                slave_util.min < self.requirements.slave_min
-                or slave_util.max > self.requirements.slave_max
-            ):
-                # in case the workload per slave has to be equalized
-                if self.requirements.slave_equal and slave_util.max != slave_util.min:
-                    continue
-                continue
-            validated_parameter_sets.append(parameter_set)
-            # calculate mechanical system properties without overhead
-            height_without_overhead = (
-                parameter_set.cell.mechanics.height
-                * parameter_set.string.z
-                * parameter_set.pack.z
-            )
-            length_without_overhead = (
-                parameter_set.cell.mechanics.length
-                * parameter_set.pack.y
-                * parameter_set.string.y
-                * parameter_set.module.y
-                * parameter_set.cell_block.y
-            )
-            width_without_overhead = (
-                parameter_set.cell.mechanics.width
-                * parameter_set.pack.x
-                * parameter_set.string.x
-                * parameter_set.module.x
-                * parameter_set.cell_block.x
-            )
-            weight_without_overhead = (
-                parameter_set.cell.mechanics.weight
-                * parameter_set.pack.x
-                * parameter_set.pack.y
-                * parameter_set.pack.z
-                * parameter_set.string.x
-                * parameter_set.string.y
-                * parameter_set.string.z
-                * parameter_set.module.x
-                * parameter_set.module.y
-                * parameter_set.cell_block.x
-                * parameter_set.cell_block.y
-            )
-            mechanical_properties_of_one_set = MechanicalProperties(
-                dimensions["height"],
-                dimensions["length"],
-                dimensions["width"],
-                weight,
-                dimensions["height_overhead"],
-                dimensions["length_overhead"],
-                dimensions["width_overhead"],
-                weight_overhead,
-                height_without_overhead,
-                length_without_overhead,
-                width_without_overhead,
-                weight_without_overhead,
-            )
-            mechanical_properties.append(mechanical_properties_of_one_set)
-            module_voltages.append(module_voltage)
-            slave_utils.append(slave_util)
-        return (
-            validated_parameter_sets,
-            mechanical_properties,
-            module_voltages,
-            slave_utils,
+        df[columns_with_units] = df[columns_with_units].apply(
+            pd.to_numeric, errors="coerce"
         )
+        return df.round(2)
 
     def _filter_inputs_by_settings(
         self, overhead_plugin: str = ""
@@ -551,84 +992,8 @@ class BatterySystemDesigns:
             )
         return considered_cells, overhead_functions
 
-    def _system_designs_per_cell(  # pylint: disable=too-many-locals
-        self, cell: BatteryCell, log_level: int
-    ) -> list[SystemDesign]:
-        """TODO"""
-        logging.getLogger().setLevel(log_level)
-        system_designs_per_cell = []
-        logging.info("Process %s", cell)
-        # get electrical system configuration
-        electrical_configuration = self._determine_battery_system_configuration(cell)
-        logging.debug(electrical_configuration)
-        start_parameter = [1, 1, 1, 1, 1]
-        # get all possible parameters for the series connection
-        parameters_series = find_parameter_sets(
-            start_parameter,
-            lambda x: np.prod(x)
-            >= electrical_configuration.cells_in_series,  # pylint: disable=cell-var-from-loop
-        )
-        start_parameter = [1, 1, 1, 1, 1]
-        # get all possible parameters for the parallel connection
-        parameters_parallel = find_parameter_sets(
-            start_parameter,
-            lambda x: np.prod(x)
-            >= electrical_configuration.cells_in_parallel,  # pylint: disable=cell-var-from-loop
-        )
-        parameter_sets = []
-        cell_rotation = (0, 1)  # 0=0° or 1=90° cell rotation
-        # overhead functions is a list with a overhead definition for each cooling type
-        for cart_product in product(
-            self.overhead_functions,
-            parameters_series,
-            parameters_parallel,
-            cell_rotation,
-        ):
-            parameter_set = ParameterSet(
-                cell=cell, overhead=cart_product[0], requirements=self.requirements
-            )  # overhead
-            parameter_set["series"] = cart_product[1]  # series
-            parameter_set["parallel"] = cart_product[2]  # parallel
-            parameter_set.cell_rotation = cart_product[3]  # rotation
-            parameter_sets.append(parameter_set)
-            logging.debug(parameter_set)
-        (
-            validated_parameter_sets,
-            mechanical_properties,
-            max_module_voltages,
-            workloads,
-        ) = self._check_upper_bounds(parameter_sets)
-        # initialize all validated system designs
-        for i, parameter_set in enumerate(validated_parameter_sets):
-            electrical_property = ElectricalProperties(
-                parameter_set,
-                electrical_configuration,
-                max_module_voltage=max_module_voltages[i],
-                workload=workloads[i],
-            )
-            mechanical_property = mechanical_properties[i]
-            system_design = SystemDesign(
-                parameter_set,
-                mechanical_property,
-                electrical_property,
-            )
-            system_designs_per_cell.append(system_design)
-        return system_designs_per_cell
-
     @staticmethod
     def _get_overhead_functions(overhead_plugin: str = ""):
         if overhead_plugin:
-            import importlib  # pylint: disable=import-outside-toplevel
-
-            try:
-                plugin = importlib.import_module(overhead_plugin)
-                logging.debug("Using custom overhead implementation '%s'", plugin)
-            except ModuleNotFoundError:
-                sys.exit("Could not find %s", overhead_plugin)
-            if not hasattr(plugin, "OverheadFunctions"):
-                sys.exit(
-                    f"Plugin {overhead_plugin} does not implement a class called "
-                    "'OverheadFunctions'.\nPlease check the documentation."
-                )
-            return plugin.OverheadFunctions
+            return load_plugin_class(overhead_plugin, "OverheadFunctions")
         return OverheadFunctions
@@ -39,7 +39,7 @@ from typing import Literal
 from ..database.battery_cell import BatteryCell
 
 
-@dataclass
+@dataclass(slots=True)
 class CellBlock:
     """dataclass for the cell block
 
@@ -51,7 +51,7 @@ class CellBlock:
     y: int = 1
 
 
-@dataclass
+@dataclass(slots=True)
 class Module:
     """dataclass for the module
 
@@ -64,7 +64,7 @@ class Module:
     y: int = 1
 
 
-@dataclass
+@dataclass(slots=True)
 class String:
     """dataclass for the string
 
@@ -79,7 +79,7 @@ class String:
     z: int = 1
 
 
-@dataclass
+@dataclass(slots=True)
 class Pack:
     """dataclass for the pack
 
@@ -185,7 +185,7 @@ class MechanicalProperties:  # pylint: disable=too-many-instance-attributes
             self.volume = self.height * self.length * self.width
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class BasicParameterSet:  # pylint: disable=too-many-instance-attributes
     """Defines the basic parameter set for the battery system layout
 
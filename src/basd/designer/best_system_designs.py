@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2010 - 2024, Fraunhofer-Gesellschaft zur Foerderung der angewandten Forschung e.V.
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""best_system_designs provides the BestSystemDesigns class which keeps only the best
+system designs while they are found
+"""
+
+import heapq
+from itertools import count
+from typing import Any
+
+import numpy as np
+
+
+class BestSystemDesigns:
+    """BestSystemDesigns collects the system designs with the smallest objective values
+    in a bounded heap. Designs with the same objective value are ranked in the order
+    they have been added.
+
+    :param max_number: the maximal number of kept system designs
+    """
+
+    def __init__(self, max_number: int) -> None:
+        self.max_number = max_number
+        # max-heap with the entries (-value, -sequence number, system design)
+        self._heap: list[tuple[float, int, Any]] = []
+        self._sequence = count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def accepts(self, value: float) -> bool:
+        """checks whether a system design with this objective value would be kept
+
+        :param value: objective value of the system design
+        :return: True if the system design would be kept
+        """
+        if len(self._heap) < self.max_number:
+            return True
+        return bool(self._heap) and value < -self._heap[0][0]
+
+    def add(self, value: float, system_design: Any) -> None:
+        """adds a system design, if it is one of the best system designs
+
+        :param value: objective value of the system design
+        :param system_design: the system design
+        """
+        if not self.accepts(value):
+            return
+        entry = (-value, -next(self._sequence), system_design)
+        if len(self._heap) < self.max_number:
+            heapq.heappush(self._heap, entry)
+        else:
+            heapq.heapreplace(self._heap, entry)
+
+    def candidates(self, values: np.ndarray) -> np.ndarray:
+        """selects the indices of the values that would be kept, if they are added
+        in the order of the index
+
+        :param values: objective values of system designs
+        :return: indices of the values that might be kept in ascending order
+        """
+        index = np.argsort(values, kind="stable")[: max(self.max_number, 0)]
+        if self._heap and len(self._heap) == self.max_number:
+            index = index[values[index] < -self._heap[0][0]]
+        return np.sort(index)
+
+    def sorted(self) -> list:
+        """returns the kept system designs
+
+        :return: the system designs sorted by their objective value
+        """
+        return [x[2] for x in sorted(self._heap, reverse=True)]
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2010 - 2024, Fraunhofer-Gesellschaft zur Foerderung der angewandten Forschung e.V.
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""count_caps provides the CountCaps class which derives the maximal counts of the
+series and parallel connection from the requirements and the cell, so that layouts
+that can never fulfill the requirements are not enumerated
+"""
+
+import math
+from dataclasses import dataclass
+
+from ..database.battery_cell import BatteryCell
+from ..requirements import Requirements
+from .basic_sets import ElectricalConfiguration
+from .find_parameter_sets import MaxProducts
+from .overhead_functions import OverheadFunctions
+from .parameter_set_arrays import LAYOUT_FIELDS, PARALLEL_COLUMNS, SERIES_COLUMNS
+
+#: counts that multiply the cell size in each direction, as stacked by
+#: ParameterSetArrays
+STACKED_COUNTS = {
+    "length": ("cell_block_y", "module_y", "string_y", "pack_y"),
+    "width": ("cell_block_x", "module_x", "string_x", "pack_x"),
+    "height": ("string_z", "pack_z"),
+}
+#: relative tolerance of the caps, so that rounding never excludes a layout
+TOLERANCE = 1e-9
+
+
+@dataclass(frozen=True)
+class CountCaps:
+    """Holds the maximal products of the counts of the series and parallel
+    connection of one cell
+
+    The module voltage caps the number of cells in series of a module. For monotone
+    overhead functions, the size of a battery system in each direction is at least
+    the product of the counts in this direction and the smaller side of the cell,
+    and its weight and volume are at least the weight and volume of all cells. As
+    the counts of the other connection are at least one and their product at least
+    its number of cells, these bounds cap the counts of each connection on its own.
+    Cells whose bare cells already exceed the weight or the volume get no parameter
+    sets at all.
+
+    :param series: the maximal products of the parameters of the series connection
+    :param parallel: the maximal products of the parameters of the parallel
+        connection
+    """
+
+    series: MaxProducts = ()
+    parallel: MaxProducts = ()
+
+    @classmethod
+    def from_requirements(
+        cls,
+        cell: BatteryCell,
+        requirements: Requirements,
+        electrical_configuration: ElectricalConfiguration,
+        overhead_functions: list[OverheadFunctions],
+    ) -> "CountCaps":
+        """derives the caps of the counts of a cell from the requirements
+
+        :param cell: the cell used in the system designs
+        :param requirements: requirements of the battery system
+        :param electrical_configuration: the electrical configuration of the cell
+        :param overhead_functions: overhead functions, one for each cooling type
+        :return: the caps of the series and parallel connection
+        """
+        series = [
+            (
+                positions(SERIES_COLUMNS, ("module_x", "module_y")),
+                max_product(
+                    requirements.max_module_voltage, cell.electrics.voltage.maximum
+                ),
+            )
+        ]
+        parallel = []
+        if not all(getattr(x, "monotone", False) for x in overhead_functions):
+            return cls(tuple(series), tuple(parallel))
+        mechanics = cell.mechanics
+        # the cell may be rotated in length and width direction
+        cell_size = {
+            "length": min(mechanics.length, mechanics.width),
+            "width": min(mechanics.length, mechanics.width),
+            "height": mechanics.height,
+        }
+        for direction, names in STACKED_COUNTS.items():
+            cap = max_product(getattr(requirements, direction), cell_size[direction])
+            series.append((positions(SERIES_COLUMNS, names), cap))
+            parallel.append((positions(PARALLEL_COLUMNS, names), cap))
+        # the other connection has at least the number of cells of its target
+        series.append(
+            bare_cells_cap(
+                cell, requirements, electrical_configuration.cells_in_parallel
+            )
+        )
+        parallel.append(
+            bare_cells_cap(cell, requirements, electrical_configuration.cells_in_series)
+        )
+        return cls(tuple(series), tuple(parallel))
+
+
+def bare_cells_cap(
+    cell: BatteryCell, requirements: Requirements, other_cells: int
+) -> tuple[tuple[int, ...], int]:
+    """returns the cap of the product of all counts of a connection, so that the
+    bare cells neither exceed the weight nor the volume
+
+    :param cell: the cell used in the system designs
+    :param requirements: requirements of the battery system
+    :param other_cells: the minimal number of cells of the other connection
+    :return: the positions of all counts and their maximal product
+    """
+    mechanics = cell.mechanics
+    cell_volume = mechanics.length * mechanics.width * mechanics.height
+    return (
+        tuple(range(len(SERIES_COLUMNS))),
+        min(
+            max_product(requirements.weight, mechanics.weight * other_cells),
+            max_product(requirements.volume, cell_volume * other_cells),
+        ),
+    )
+
+
+def positions(columns: tuple[int, ...], names: tuple[str, ...]) -> tuple[int, ...]:
+    """returns the positions of counts in the parameters of a connection
+
+    :param columns: columns of the parameters of the connection in LAYOUT_FIELDS
+    :param names: names of the counts
+    :return: the positions of the counts that belong to the connection
+    """
+    index = {LAYOUT_FIELDS.index(x) for x in names}
+    return tuple(i for i, column in enumerate(columns) if column in index)
+
+
+def max_product(limit: float, size: float) -> int:
+    """returns the maximal product of counts, whose multiple of the size does not
+    exceed the limit
+
+    :param limit: the upper bound of the requirement
+    :param size: the size of one count
+    :return: the maximal product
+    """
+    return math.floor(limit / size * (1 + TOLERANCE))
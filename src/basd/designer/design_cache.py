@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2010 - 2024, Fraunhofer-Gesellschaft zur Foerderung der angewandten Forschung e.V.
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""design_cache provides the DesignCache class which stores the best parameter sets of
+each cell on disk, so that a rerun only checks the cells whose inputs changed
+"""
+
+import hashlib
+import inspect
+import json
+import logging
+import os
+import sys
+import zipfile
+from dataclasses import dataclass
+from datetime import datetime
+from importlib import metadata
+from pathlib import Path
+
+import numpy as np
+
+from ..database.battery_cell import BatteryCell
+from ..requirements import Requirements
+from ..utils import BASD_TMP_DIR
+from ..utils.basd_version import __version__
+from .overhead_functions import OverheadFunctions
+from .work_units import CellParameters, SystemDesignRecords
+
+#: directory of the design cache
+DESIGN_CACHE_DIR = Path(BASD_TMP_DIR) / "design_cache"
+#: default maximal size of the design cache in bytes
+DEFAULT_MAX_CACHE_SIZE = 256 * 1024**2
+#: requirements that influence the system designs of a cell
+REQUIREMENT_FIELDS = (
+    "optimized_by",
+    "energy",
+    "nominal_voltage",
+    "maximum_voltage",
+    "minimum_voltage",
+    "cont_max_charge_power",
+    "cont_max_discharge_power",
+    "max_module_voltage",
+    "slave_min",
+    "slave_max",
+    "slave_equal",
+    "weight",
+    "width",
+    "height",
+    "length",
+)
+
+
+@dataclass
+class CacheEntry:
+    """Defines a file of the design cache
+
+    :param path: path of the cache file
+    :param size: size of the cache file in bytes
+    :param last_used: time of the last use of the cache file
+    """
+
+    path: Path
+    size: int
+    last_used: datetime
+
+
+class DesignCache:
+    """DesignCache stores the best validated parameter sets of each cell in files,
+    which are addressed by the hash of all inputs of the cell. The least recently
+    used files are removed, if the cache exceeds its maximal size.
+
+    :param cache_dir: directory of the cache files
+    :param max_size: maximal size of all cache files in bytes
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path = DESIGN_CACHE_DIR,
+        max_size: int = DEFAULT_MAX_CACHE_SIZE,
+    ) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.max_size = max_size
+        #: directory of the persisted parameter sets of the series and parallel
+        #: connection
+        self.parameter_sets_dir = self.cache_dir / "parameter_sets"
+
+    @staticmethod
+    def key(
+        cell: BatteryCell,
+        requirements: Requirements,
+        overhead_functions: list[OverheadFunctions],
+    ) -> str:
+        """returns the key of the system designs of a cell
+
+        :param cell: the cell used in the system designs
+        :param requirements: the requirements of the battery system
+        :param overhead_functions: overhead functions, one for each cooling type
+        :return: the hash of all inputs of the cell
+        """
+        plugins = []
+        for overhead_class in dict.fromkeys(type(x) for x in overhead_functions):
+            module = sys.modules.get(overhead_class.__module__)
+            try:
+                version = metadata.version(overhead_class.__module__.split(".")[0])
+            except metadata.PackageNotFoundError:
+                version = getattr(module, "__version__", None)
+            try:
+                source = Path(inspect.getsourcefile(overhead_class)).read_bytes()
+            except (OSError, TypeError):
+                source = b""
+            plugins.append(
+                [
+                    overhead_class.__module__,
+                    overhead_class.__qualname__,
+                    version,
+                    hashlib.sha256(source).hexdigest(),
+                ]
+            )
+        inputs = {
+            "basd": __version__,
+            "cell": cell.checksum,
+            "requirements": {x: getattr(requirements, x) for x in REQUIREMENT_FIELDS},
+            "cooling": [x.cooling.name for x in overhead_functions],
+            "overhead": plugins,
+        }
+        return hashlib.sha256(
+            json.dumps(inputs, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+    def load(
+        self, key: str, cell_index: int, max_number: int
+    ) -> SystemDesignRecords | None:
+        """loads the best validated parameter sets of a cell
+
+        :param key: the key of the system designs of the cell
+        :param cell_index: index of the cell in the considered cells
+        :param max_number: number of requested parameter sets
+        :return: the parameter sets or None, if they are not cached or the cached
+            parameter sets are not sufficient
+        """
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                stored_max_number = int(data["max_number"])
+                records = SystemDesignRecords(
+                    cell_index,
+                    data["values"],
+                    data["cooling_index"],
+                    data["counts"],
+                    data["cell_rotation"],
+                )
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+            logging.warning("Invalid design cache file %s is ignored", path)
+            return None
+        # all valid parameter sets are cached, if less than requested were stored
+        if stored_max_number < max_number and len(records) == stored_max_number:
+            return None
+        os.utime(path)
+        return records.take(slice(max_number))
+
+    def load_cells(  # pylint: disable=too-many-arguments
+        self,
+        cell_parameters: list[CellParameters],
+        records_per_cell: list[SystemDesignRecords | None],
+        requirements: Requirements,
+        overhead_functions: list[OverheadFunctions],
+        max_number: int,
+    ) -> dict[int, str]:
+        """loads the best validated parameter sets of the cells, which are not
+        determined yet
+
+        :param cell_parameters: the parameters of the considered cells
+        :param records_per_cell: the parameter sets of each cell or None, which is
+            replaced by the cached parameter sets
+        :param requirements: the requirements of the battery system
+        :param overhead_functions: overhead functions, one for each cooling type
+        :param max_number: number of requested parameter sets per cell
+        :return: the keys of the cells that have to be determined
+        """
+        keys = {}
+        for cell_index, parameters in enumerate(cell_parameters):
+            if records_per_cell[cell_index] is not None:
+                continue
+            key = self.key(parameters.cell, requirements, overhead_functions)
+            records = self.load(key, cell_index, max_number)
+            if records is None:
+                keys[cell_index] = key
+            else:
+                logging.info("Use cached system designs of %s", parameters.cell)
+                records_per_cell[cell_index] = records
+        return keys
+
+    def store(self, key: str, records: SystemDesignRecords, max_number: int) -> None:
+        """stores the best validated parameter sets of a cell
+
+        :param key: the key of the system designs of the cell
+        :param records: the best validated parameter sets of the cell
+        :param max_number: number of requested parameter sets
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path.with_name(f"{key}.{os.getpid()}.tmp.npz")
+        np.savez(
+            tmp_path,
+            max_number=max_number,
+            values=records.values,
+            cooling_index=records.cooling_index,
+            counts=records.counts,
+            cell_rotation=records.cell_rotation,
+        )
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def entries(self) -> list[CacheEntry]:
+        """returns the files of the design cache including the persisted parameter
+        sets
+
+        :return: the cache files, the most recently used first
+        """
+        entries = []
+        for path in [
+            *self.cache_dir.glob("*.npz"),
+            *self.parameter_sets_dir.glob("*.npy"),
+        ]:
+            if path.name.endswith((".tmp.npz", ".tmp.npy")):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append(
+                CacheEntry(path, stat.st_size, datetime.fromtimestamp(stat.st_mtime))
+            )
+        return sorted(entries, key=lambda x: x.last_used, reverse=True)
+
+    def size(self) -> int:
+        """returns the size of the design cache
+
+        :return: size of all cache files in bytes
+        """
+        return sum(x.size for x in self.entries())
+
+    def show(self) -> int:
+        """prints the location, size and files of the design cache
+
+        :return: error code
+        """
+        entries = self.entries()
+        print(f"Design cache: {self.cache_dir}")
+        print(
+            f"{len(entries)} entries, {sum(x.size for x in entries) / 1024**2:.2f} MiB "
+            f"of {self.max_size / 1024**2:.2f} MiB"
+        )
+        for entry in entries:
+            print(
+                f"{entry.path.stem} {entry.size / 1024:10.1f} KiB "
+                f"{entry.last_used:%Y-%m-%d %H:%M:%S}"
+            )
+        return 0
+
+    def clear(self) -> int:
+        """removes all files of the design cache and the persisted parameter sets
+
+        :return: error code
+        """
+        entries = self.entries()
+        for entry in entries:
+            entry.path.unlink(missing_ok=True)
+        print(f"Removed {len(entries)} entries from the design cache")
+        return 0
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.npz"
+
+    def _evict(self) -> None:
+        """removes the least recently used files until the maximal size is met"""
+        entries = self.entries()
+        size = sum(x.size for x in entries)
+        while entries and size > self.max_size:
+            entry = entries.pop()
+            entry.path.unlink(missing_ok=True)
+            size -= entry.size
+            logging.debug("Removed %s from the design cache", entry.path.name)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2010 - 2024, Fraunhofer-Gesellschaft zur Foerderung der angewandten Forschung e.V.
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""design_stream provides the DesignStream class which writes the best parameter sets
+of each checked work unit to a JSON Lines file as soon as they are available
+"""
+
+import json
+from pathlib import Path
+
+from .parameter_set_arrays import LAYOUT_FIELDS
+from .work_units import SystemDesignRecords
+
+
+class DesignStream:  # pylint: disable=too-few-public-methods
+    """DesignStream appends the best parameter sets of each checked work unit or cached
+    cell to a JSON Lines file, one parameter set per line. The file is flushed after
+    each work unit, so that it can be consumed while the designs are determined and
+    keeps the checked work units if the run is aborted. The lines are in the order in
+    which the work units finish, the report contains the sorted system designs.
+
+    :param file_name: the JSON Lines file, which is overwritten
+    :param cells: identifier of each considered cell
+    :param coolings: name of the cooling type of each overhead function
+    :param objectives: names of the objective values of the parameter sets, i.e.,
+        volume and weight for pareto fronts
+    """
+
+    def __init__(
+        self,
+        file_name: Path,
+        cells: list[str],
+        coolings: list[str],
+        objectives: tuple[str, ...],
+    ) -> None:
+        self.file_name = file_name
+        self.cells = cells
+        self.coolings = coolings
+        self.objectives = objectives
+        self.file_name.write_text("", encoding="utf-8")
+
+    def write(self, records: SystemDesignRecords) -> None:
+        """appends the parameter sets of the records
+
+        :param records: the best parameter sets of a work unit or cell
+        """
+        cell = self.cells[records.cell_index]
+        values = records.values.reshape(len(records), len(self.objectives)).tolist()
+        lines = [
+            json.dumps(
+                {
+                    "cell": cell,
+                    "cooling": self.coolings[cooling_index],
+                    **dict(zip(self.objectives, value)),
+                    "cell_rotation": cell_rotation,
+                    **dict(zip(LAYOUT_FIELDS, counts)),
+                }
+            )
+            + "\n"
+            for value, cooling_index, counts, cell_rotation in zip(
+                values,
+                records.cooling_index.tolist(),
+                records.counts.tolist(),
+                records.cell_rotation.tolist(),
+            )
+        ]
+        with open(self.file_name, mode="a", encoding="utf-8") as f:
+            f.writelines(lines)
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2010 - 2024, Fraunhofer-Gesellschaft zur Foerderung der angewandten Forschung e.V.
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""direction_checks provides the DirectionChecks class which checks the length, width
+and height of the distinct counts of each direction, so that parameter sets exceeding
+the requirements in any direction are skipped before they are stacked
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from ..database.battery_cell import BatteryCell
+from ..requirements import Requirements
+from .overhead_functions import OverheadFunctions
+from .parameter_set_arrays import (
+    LAYOUT_FIELDS,
+    PARALLEL_COLUMNS,
+    SERIES_COLUMNS,
+    OverheadCache,
+    ParameterSetArrays,
+)
+
+#: counts that determine the size of a battery system in each direction for
+#: separable overhead functions, besides the cell, the cooling and the cell rotation
+DIRECTION_COUNTS = {
+    "length": ("cell_block_y", "module_y", "string_y", "pack_y"),
+    "width": ("cell_block_x", "module_x", "string_x", "pack_x"),
+    # the height overhead of a cell block depends on its number of cells
+    "height": ("cell_block_x", "cell_block_y", "string_z", "pack_z"),
+}
+
+
+def distinct_counts(
+    parameters: np.ndarray, columns: tuple[int, ...], index: list[int]
+) -> tuple[np.ndarray, np.ndarray]:
+    """returns the distinct counts of parameters in the passed columns, all other
+    counts are one
+
+    :param parameters: parameters of the series or parallel connection
+    :param columns: columns of the parameters in LAYOUT_FIELDS
+    :param index: columns of the distinct counts in LAYOUT_FIELDS
+    :return: the parameters with distinct counts and the index of the distinct
+        counts of each parameter
+    """
+    mask = np.isin(columns, index)
+    distinct, inverse = np.unique(parameters[:, mask], axis=0, return_inverse=True)
+    part = np.ones((len(distinct), len(columns)), dtype=np.int64)
+    part[:, mask] = distinct
+    return part, inverse.reshape(-1)
+
+
+def stack_directions(  # pylint: disable=too-many-locals
+    cell: BatteryCell,
+    requirements: Requirements,
+    overhead_functions: list[OverheadFunctions],
+    parameters: tuple[np.ndarray, np.ndarray, np.ndarray],
+    overhead_cache: OverheadCache | None = None,
+) -> dict[str, tuple[dict[str, np.ndarray], np.ndarray, np.ndarray]]:
+    """stacks the distinct counts of each direction for separable overhead
+    functions, with all other counts set to one
+
+    :param cell: used cell for all parameter sets
+    :param requirements: requirements of the battery system
+    :param overhead_functions: overhead functions, one for each cooling type
+    :param parameters: parameters of the series connection, parameters of the
+        parallel connection and considered cell rotations
+    :param overhead_cache: cache of the overheads of each level
+    :return: for each direction the stack as returned by
+        ParameterSetArrays.stack_directions, indexed by cooling, distinct series
+        counts, distinct parallel counts and rotation, the index of the distinct
+        series counts of each series parameter and the index of the distinct parallel
+        counts of each parallel parameter
+    """
+    series, parallel, rotation = parameters
+    series = np.asarray(series, dtype=np.int64).reshape(-1, 5)
+    parallel = np.asarray(parallel, dtype=np.int64).reshape(-1, 5)
+    stacks = {}
+    for direction, names in DIRECTION_COUNTS.items():
+        index = [LAYOUT_FIELDS.index(x) for x in names]
+        series_counts, series_index = distinct_counts(series, SERIES_COLUMNS, index)
+        parallel_counts, parallel_index = distinct_counts(
+            parallel, PARALLEL_COLUMNS, index
+        )
+        partial = ParameterSetArrays.from_product(
+            cell,
+            requirements,
+            overhead_functions,
+            series_counts,
+            parallel_counts,
+            cell_rotation=tuple(np.asarray(rotation).tolist()),
+            overhead_cache=overhead_cache,
+        )
+        shape = (len(overhead_functions), len(series_counts), len(parallel_counts), -1)
+        stack = {
+            key: value.reshape(shape)
+            for key, value in partial.stack_directions()[direction].items()
+        }
+        stacks[direction] = (stack, series_index, parallel_index)
+    return stacks
+
+
+@dataclass
+class DirectionChecks:
+    """Holds the length, width and height checks of the distinct counts of each
+    direction of the parameter sets of one cell, which are joined to skip the
+    parameter sets of the cartesian product exceeding the requirements
+
+    For separable overhead functions the size in a direction only depends on the
+    counts in DIRECTION_COUNTS. It is stacked once for the distinct series and
+    parallel counts of the direction, with all other counts set to one. A parameter
+    set exceeds the requirements, if it can not fulfill them in any direction
+    regardless of the placement of the battery junction box.
+
+    :param exceeded: for each direction whether the requirements are exceeded,
+        indexed by cooling, distinct series counts, distinct parallel counts and
+        rotation
+    :param series_index: for each direction the index of the distinct series counts
+        of each series parameter
+    :param parallel_index: for each direction the index of the distinct parallel
+        counts of each parallel parameter
+    """
+
+    exceeded: dict[str, np.ndarray] = field(repr=False)
+    series_index: dict[str, np.ndarray] = field(repr=False)
+    parallel_index: dict[str, np.ndarray] = field(repr=False)
+
+    @classmethod
+    def from_parameters(  # pylint: disable=too-many-arguments
+        cls,
+        cell: BatteryCell,
+        requirements: Requirements,
+        overhead_functions: list[OverheadFunctions],
+        parameters: tuple[np.ndarray, np.ndarray, np.ndarray],
+        overhead_cache: OverheadCache | None = None,
+    ) -> "DirectionChecks":
+        """checks the distinct counts of each direction
+
+        :param cell: used cell for all parameter sets
+        :param requirements: requirements of the battery system
+        :param overhead_functions: overhead functions, one for each cooling type
+        :param parameters: parameters of the series connection, parameters of the
+            parallel connection and considered cell rotations
+        :param overhead_cache: cache of the overheads of each level
+        :return: the checks of each direction
+        """
+        checks = cls({}, {}, {})
+        for direction, (stack, series_index, parallel_index) in stack_directions(
+            cell, requirements, overhead_functions, parameters, overhead_cache
+        ).items():
+            smallest = stack["pack"] + np.minimum(stack["pack_bjb"], stack["pack_min"])
+            checks.exceeded[direction] = smallest >= getattr(requirements, direction)
+            checks.series_index[direction] = series_index
+            checks.parallel_index[direction] = parallel_index
+        return checks
+
+    def join(self, series: slice = slice(None)) -> np.ndarray:
+        """joins the checks of all directions for the cartesian product of series
+        and parallel parameters
+
+        :param series: the checked series parameters
+        :return: whether the requirements are exceeded, indexed by cooling, series
+            parameters, parallel parameters and rotation
+        """
+        exceeded = None
+        for direction, direction_exceeded in self.exceeded.items():
+            joined = direction_exceeded[
+                :,
+                self.series_index[direction][series, None],
+                self.parallel_index[direction][None, :],
+                :,
+            ]
+            exceeded = joined if exceeded is None else exceeded | joined
+        return exceeded
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2010 - 2024, Fraunhofer-Gesellschaft zur Foerderung der angewandten Forschung e.V.
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""electrical_configurations provides the electrical_configurations function which
+determines the electrical configuration of many cells at once on stacked arrays of
+their electrical properties
+"""
+
+import numpy as np
+
+from ..database.battery_cell import BatteryCell
+from ..requirements import Requirements
+from .basic_sets import ElectricalConfiguration
+
+#: state of charge in % of each point of the discharge curves
+STATE_OF_CHARGE = np.arange(100, -1, -1, dtype=np.float64)
+
+
+def electrical_configurations(  # pylint: disable=too-many-locals
+    cells: list[BatteryCell], requirements: Requirements
+) -> list[ElectricalConfiguration]:
+    """determines all relevant parameter of the electrical configuration of the
+    battery systems of all cells in one vectorized pass
+
+    The number of cells in series follows from the nominal voltage, the voltage
+    bounds of a cell from the voltage requirements, its usable capacity from the
+    states of charge at the voltage bounds and the number of cells in parallel from
+    the energy and the continuous power.
+
+    :param cells: the data of the cells
+    :param requirements: requirements object with all defined requirements of the
+        battery system
+    :raises ValueError: a discharge curve has not one voltage per state of charge or
+        a voltage bound is outside of it
+    :return: relevant parameter of the electrical configuration of the battery
+        system of each cell
+    """
+    if not cells:
+        return []
+    for cell in cells:
+        if len(cell.electrics.discharge_curve) != len(STATE_OF_CHARGE):
+            raise ValueError(
+                f"The discharge curve of {cell.identification} has "
+                f"{len(cell.electrics.discharge_curve)} instead of "
+                f"{len(STATE_OF_CHARGE)} voltages."
+            )
+    voltage = {
+        x: np.array([getattr(c.electrics.voltage, x) for c in cells])
+        for x in ("nominal", "minimum", "maximum")
+    }
+    cells_in_series = np.ceil(requirements.nominal_voltage / voltage["nominal"])
+    nominal_system_voltage = cells_in_series * voltage["nominal"]
+    lower_bound_cell_voltage = np.where(
+        cells_in_series * voltage["minimum"] < requirements.minimum_voltage,
+        requirements.minimum_voltage / cells_in_series,
+        voltage["minimum"],
+    )
+    upper_bound_cell_voltage = np.where(
+        cells_in_series * voltage["maximum"] > requirements.maximum_voltage,
+        requirements.maximum_voltage / cells_in_series,
+        voltage["maximum"],
+    )
+    discharge_curves = np.array(
+        [c.electrics.discharge_curve for c in cells], dtype=np.float64
+    )
+    lower_soc = state_of_charge(discharge_curves, lower_bound_cell_voltage, cells)
+    upper_soc = state_of_charge(discharge_curves, upper_bound_cell_voltage, cells)
+    capacity = np.array([c.electrics.capacity.initial for c in cells])
+    used_cell_capacity = (upper_soc - lower_soc) / 100 * capacity
+    required_system_capacity = requirements.energy / nominal_system_voltage
+    cells_in_parallel = np.ceil(required_system_capacity / used_cell_capacity)
+    for current, power in (
+        (
+            np.array([c.electrics.cont_current.discharge for c in cells]),
+            requirements.cont_max_discharge_power,
+        ),
+        (
+            np.array([c.electrics.cont_current.charge for c in cells]),
+            requirements.cont_max_charge_power,
+        ),
+    ):
+        # the continuous power has to be provided by the cells in parallel
+        cells_in_parallel = np.where(
+            cells_in_parallel * current * nominal_system_voltage <= power,
+            np.ceil(power / nominal_system_voltage / current),
+            cells_in_parallel,
+        )
+    system_capacity = cells_in_parallel * used_cell_capacity
+    return [
+        ElectricalConfiguration(
+            int(cells_in_parallel[i]),
+            int(cells_in_series[i]),
+            nominal_system_voltage[i],
+            system_capacity[i],
+            lower_bound_cell_voltage[i],
+            upper_bound_cell_voltage[i],
+            used_cell_capacity[i],
+            system_capacity[i] * nominal_system_voltage[i],
+        )
+        for i in range(len(cells))
+    ]
+
+
+def state_of_charge(
+    discharge_curves: np.ndarray, cell_voltage: np.ndarray, cells: list[BatteryCell]
+) -> np.ndarray:
+    """interpolates the state of charge of each cell at a voltage linearly in the
+    same way as scipy.interpolate.interp1d over the discharge curve
+
+    :param discharge_curves: the voltage of each cell at each state of charge
+    :param cell_voltage: the voltage of each cell
+    :param cells: the cells, to name them in errors
+    :raises ValueError: a voltage is outside of the discharge curve of its cell
+    :return: the state of charge of each cell in %
+    """
+    order = np.argsort(discharge_curves, axis=1, kind="mergesort")
+    voltages = np.take_along_axis(discharge_curves, order, axis=1)
+    states_of_charge = STATE_OF_CHARGE[order]
+    outside = (cell_voltage < voltages[:, 0]) | (cell_voltage > voltages[:, -1])
+    if outside.any():
+        i = int(np.flatnonzero(outside)[0])
+        raise ValueError(
+            f"The voltage {cell_voltage[i]} V is outside of the discharge curve of "
+            f"{cells[i].identification}."
+        )
+    rows = np.arange(len(cell_voltage))
+    # index of the first voltage of the sorted curve that is not below the voltage
+    high = np.clip(
+        np.count_nonzero(voltages < cell_voltage[:, None], axis=1),
+        1,
+        voltages.shape[1] - 1,
+    )
+    low = high - 1
+    slope = (states_of_charge[rows, high] - states_of_charge[rows, low]) / (
+        voltages[rows, high] - voltages[rows, low]
+    )
+    return slope * (cell_voltage - voltages[rows, low]) + states_of_charge[rows, low]
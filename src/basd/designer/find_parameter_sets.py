@@ -34,11 +34,20 @@
 """file containing the solver for the optimization of the integer program
 """
 
+import logging
+import os
+from dataclasses import dataclass, field
 from itertools import permutations
-from typing import Callable
+from math import factorial, prod
+from pathlib import Path
+from typing import Callable, Iterator
 
 import numpy as np
 
+#: maximal products of the parameters at some positions of a parameter set, as
+#: positions and maximal product
+MaxProducts = tuple[tuple[tuple[int, ...], int], ...]
+
 
 def find_parameter_sets(
     parameter: list,
@@ -101,3 +110,228 @@ def find_parameter_sets(
         # the set cast speeds up the whole permutation process
         solution.extend(list(set(permutations(para))))
     return solution
+
+
+def enumerate_parameter_sets(
+    target: int, size: int = 5, max_products: MaxProducts = ()
+) -> np.ndarray:
+    """enumerate_parameter_sets directly enumerates the same parameter sets as
+    find_parameter_sets with the validation function ``np.prod(x) >= target``
+
+    Instead of testing candidate parameter sets one by one and deduplicating all
+    permutations of the found solutions, the first parameter of each non-increasing
+    solution is computed from the product of the remaining ones and every solution is
+    expanded into its distinct permutations only.
+
+    If caps are passed, the solutions whose largest parameter exceeds the caps of all
+    positions are not enumerated at all, and only the permutations within the caps
+    are kept.
+
+    :param target: the minimal product of the parameters
+    :param size: the number of parameters in a parameter set
+    :param max_products: the maximal product of the parameters at some positions,
+        e.g., ``(((1, 3), 8),)`` for at most 8 as the product of the second and the
+        fourth parameter
+
+    :return: an integer array with one parameter set per row, sorted lexicographically
+        per solution
+    """
+    # a parameter can not exceed the product of any of its positions
+    max_values = [
+        min((cap for positions, cap in max_products if i in positions), default=np.inf)
+        for i in range(size)
+    ]
+    parameter_sets = [
+        parameter_set
+        for solution in _sorted_solutions(target, size, max(max_values))
+        for parameter_set in _distinct_permutations(solution)
+        if all(
+            prod(parameter_set[i] for i in positions) <= cap
+            for positions, cap in max_products
+        )
+    ]
+    return np.array(parameter_sets, dtype=np.int64).reshape(-1, size)
+
+
+def count_parameter_sets(target: int, size: int = 5) -> int:
+    """returns the number of parameter sets of enumerate_parameter_sets without caps,
+    without enumerating them
+
+    :param target: the minimal product of the parameters
+    :param size: the number of parameters in a parameter set
+    :return: the number of parameter sets
+    """
+    number = 0
+    for solution in _sorted_solutions(target, size):
+        permutations_of_solution = factorial(size)
+        for value in set(solution):
+            permutations_of_solution //= factorial(solution.count(value))
+        number += permutations_of_solution
+    return number
+
+
+def binding_max_products(target: int, max_products: MaxProducts) -> MaxProducts:
+    """returns the caps that can exclude parameter sets of a target
+
+    The product of the parameters of each solution is less than twice the target, as
+    the first parameter is the smallest one fulfilling the target. Larger caps are
+    dropped, so that the same parameter sets are enumerated for them.
+
+    :param target: the minimal product of the parameters
+    :param max_products: the maximal product of the parameters at some positions
+    :return: the caps less than twice the target
+    """
+    return tuple(x for x in max_products if x[1] < 2 * max(1, target) - 1)
+
+
+@dataclass
+class ParameterSetsMemo:
+    """Memoizes the parameter sets of enumerate_parameter_sets by target, size and
+    caps, so that cells with the same number of cells in series or in parallel share
+    them. The parameter sets are stably sorted by their product, i.e., the parameter
+    sets with the fewest cells come first.
+
+    :param directory: directory in which the parameter sets without caps are
+        additionally persisted as ``.npy`` files, None keeps them in memory only
+    :param values: the enumerated parameter sets keyed by target, size and caps
+    :param hits: number of parameter sets taken from memory or from the directory
+    :param misses: number of enumerated parameter sets
+    """
+
+    directory: Path | None = None
+    values: dict[tuple[int, int, MaxProducts], np.ndarray] = field(
+        default_factory=dict, repr=False
+    )
+    hits: int = 0
+    misses: int = 0
+
+    def parameter_sets(
+        self, target: int, size: int = 5, max_products: MaxProducts = ()
+    ) -> np.ndarray:
+        """returns the parameter sets of enumerate_parameter_sets sorted by their
+        product
+
+        :param target: the minimal product of the parameters
+        :param size: the number of parameters in a parameter set
+        :param max_products: the maximal product of the parameters at some positions
+        :return: a read-only integer array with one parameter set per row
+        """
+        key = (int(target), size, binding_max_products(target, max_products))
+        if key in self.values:
+            self.hits += 1
+            return self.values[key]
+        # the parameter sets with caps depend on the cell and the requirements and
+        # are only kept in memory
+        parameter_sets = None if key[2] else self._load(key[:2])
+        if parameter_sets is None:
+            self.misses += 1
+            parameter_sets = enumerate_parameter_sets(*key)
+            parameter_sets = parameter_sets[
+                np.argsort(parameter_sets.prod(axis=1), kind="stable")
+            ]
+            if not key[2]:
+                self._store(key[:2], parameter_sets)
+        else:
+            self.hits += 1
+        parameter_sets.flags.writeable = False
+        self.values[key] = parameter_sets
+        return parameter_sets
+
+    def _path(self, key: tuple[int, int]) -> Path:
+        return self.directory / f"parameter_sets_{key[0]}_{key[1]}.npy"
+
+    def _load(self, key: tuple[int, int]) -> np.ndarray | None:
+        """loads persisted parameter sets
+
+        :param key: target and size of the parameter sets
+        :return: the parameter sets or None, if they are not persisted
+        """
+        if self.directory is None:
+            return None
+        try:
+            parameter_sets = np.load(self._path(key), allow_pickle=False)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            logging.warning(
+                "Invalid parameter sets file %s is ignored", self._path(key)
+            )
+            return None
+        if parameter_sets.ndim != 2 or parameter_sets.shape[1] != key[1]:
+            return None
+        # the design cache removes the least recently used files first
+        os.utime(self._path(key))
+        return parameter_sets
+
+    def _store(self, key: tuple[int, int], parameter_sets: np.ndarray) -> None:
+        """persists parameter sets, if a directory is set
+
+        :param key: target and size of the parameter sets
+        :param parameter_sets: the parameter sets
+        """
+        if self.directory is None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npy")
+        np.save(tmp_path, parameter_sets)
+        os.replace(tmp_path, path)
+
+
+def _sorted_solutions(
+    target: int, size: int, max_value: float = np.inf
+) -> Iterator[list[int]]:
+    """yields the non-increasing solutions in the order find_parameter_sets finds
+    them
+
+    The trailing parameters are counted up in the same order as the backtracking
+    algorithm, while the first parameter is the smallest value fulfilling the target.
+    As in find_parameter_sets, the maximal parameter of each solution has to be
+    smaller than the one of the previous solution.
+
+    :param target: the minimal product of the parameters
+    :param size: the number of parameters in a parameter set
+    :param max_value: the maximal parameter of all solutions, the branches with larger
+        parameters are not searched
+    """
+    if size == 1:
+        if max(1, target) <= max_value:
+            yield [max(1, target)]
+        return
+    tail = [1] * (size - 1)
+    while True:
+        tail_max = max(tail)
+        if tail_max > max_value:
+            # move to the next upper branch
+            level = tail.index(tail_max) + 1
+            if level >= len(tail):
+                break
+            tail[level] += 1
+            tail[:level] = [1] * level
+            continue
+        first = max(1, -(-target // prod(tail)))
+        if first <= max_value:
+            yield [first] + tail
+            max_value = max(first, tail_max) - 1
+        tail[0] += 1
+
+
+def _distinct_permutations(values: list[int]) -> Iterator[tuple[int, ...]]:
+    """yields the distinct permutations of values in lexicographic order
+
+    :param values: the values to be permuted
+    """
+    permutation = sorted(values)
+    while True:
+        yield tuple(permutation)
+        # find the rightmost ascent, swap it with its successor and reverse the tail
+        i = len(permutation) - 2
+        while i >= 0 and permutation[i] >= permutation[i + 1]:
+            i -= 1
+        if i < 0:
+            return
+        j = len(permutation) - 1
+        while permutation[j] <= permutation[i]:
+            j -= 1
+        permutation[i], permutation[j] = permutation[j], permutation[i]
+        permutation[i + 1 :] = reversed(permutation[i + 1 :])
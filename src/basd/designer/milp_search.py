@@ -0,0 +1,919 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2010 - 2024, Fraunhofer-Gesellschaft zur Foerderung der angewandten Forschung e.V.
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""milp_search provides the MilpSearch class which determines the best parameter sets
+of the cells by solving a mixed-integer linear program for each cell, cooling type
+and cell rotation instead of checking all parameter sets
+
+The logarithm of the volume (or weight) turns the product of the length, width and
+height into a sum. For separable overhead functions the length, width and height
+only depend on the distinct counts of each direction and the weight only on the
+products of the counts of each level, so that the program selects one series and one
+parallel parameter and one entry of each of these tables, which is consistent with
+both parameters. The optimal parameter set is verified by the upper bound checks,
+excluded from the program and the program is solved again, until the lower bound of
+all remaining parameter sets exceeds the last kept system design.
+"""
+
+import heapq
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+from scipy import sparse
+from scipy.optimize import Bounds, LinearConstraint, milp
+
+from ..database.battery_cell import BatteryCell
+from ..requirements import Requirements
+from .direction_checks import stack_directions
+from .overhead_functions import OverheadFunctions
+from .parameter_set_arrays import (  # pylint: disable=duplicate-code
+    BJB_DIRECTIONS,
+    LAYOUT_FIELDS,
+    PARALLEL_COLUMNS,
+    SERIES_COLUMNS,
+    OverheadCache,
+    ParameterSetArrays,
+)
+from .search_statistics import SearchStatistics
+from .work_units import CELL_ROTATION, CellParameters, SystemDesignRecords
+
+#: tolerance of the logarithmic objective values, so that parameter sets with the
+#: same volume or weight as the last kept one are verified as well
+TOLERANCE = 1e-6
+#: tolerance of the binary variables of a solution of the relaxed program
+INTEGRALITY_TOLERANCE = 1e-6
+#: counts whose products determine the weight of each level for overhead functions
+#: with a separable weight, as columns of the series and parallel parameters
+WEIGHT_PRODUCTS = {
+    "series": (("module_x", "module_y"), ("string_x", "string_y", "string_z")),
+    "parallel": (("cell_block_x", "cell_block_y"), ("pack_x", "pack_y", "pack_z")),
+}
+
+
+def level_products(parameters: np.ndarray, connection: str) -> np.ndarray:
+    """returns the products of the counts of each level of the series or parallel
+    parameters
+
+    :param parameters: parameters of the series or parallel connection
+    :param connection: 'series' or 'parallel'
+    :return: one column with the product of the counts of each level
+    """
+    columns = SERIES_COLUMNS if connection == "series" else PARALLEL_COLUMNS
+    return np.column_stack(
+        [
+            np.prod(
+                parameters[:, [columns.index(LAYOUT_FIELDS.index(x)) for x in names]],
+                axis=1,
+            )
+            for names in WEIGHT_PRODUCTS[connection]
+        ]
+    )
+
+
+def stack_weight(  # pylint: disable=too-many-arguments
+    cell: BatteryCell,
+    requirements: Requirements,
+    overhead_functions: list[OverheadFunctions],
+    parameters: tuple[np.ndarray, np.ndarray, np.ndarray],
+    overhead_cache: OverheadCache | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """stacks the weight of the distinct products of the counts of each level for
+    overhead functions with a separable weight
+
+    :param cell: used cell for all parameter sets
+    :param requirements: requirements of the battery system
+    :param overhead_functions: overhead functions, one for each cooling type
+    :param parameters: parameters of the series connection, parameters of the
+        parallel connection and considered cell rotations
+    :param overhead_cache: cache of the overheads of each level
+    :return: the weight indexed by cooling, distinct series products, distinct
+        parallel products and rotation, the index of the distinct series products of
+        each series parameter and the index of the distinct parallel products of each
+        parallel parameter
+    """
+    series, parallel, rotation = parameters
+    # the first parameter with the products of each level represents all of them
+    _, series_first, series_index = np.unique(
+        level_products(series, "series"),
+        axis=0,
+        return_index=True,
+        return_inverse=True,
+    )
+    _, parallel_first, parallel_index = np.unique(
+        level_products(parallel, "parallel"),
+        axis=0,
+        return_index=True,
+        return_inverse=True,
+    )
+    partial = ParameterSetArrays.from_product(
+        cell,
+        requirements,
+        overhead_functions,
+        series[series_first],
+        parallel[parallel_first],
+        cell_rotation=tuple(np.asarray(rotation).tolist()),
+        overhead_cache=overhead_cache,
+    )
+    weight = partial.stack_weight()["pack"].reshape(
+        len(overhead_functions), len(series_first), len(parallel_first), -1
+    )
+    return weight, series_index.reshape(-1), parallel_index.reshape(-1)
+
+
+def electrical_fits(
+    cell: BatteryCell, requirements: Requirements, parameters_series: np.ndarray
+) -> np.ndarray:
+    """checks the module voltage and the slave utilization, which only depend on the
+    series parameters, in the same way as StackedParameterSets.check_upper_bounds
+
+    :param cell: used cell for all parameter sets
+    :param requirements: requirements of the battery system
+    :param parameters_series: parameters of the series connection
+    :return: True for each series parameter fulfilling both conditions
+    """
+    module = np.prod(
+        parameters_series[
+            :,
+            [
+                SERIES_COLUMNS.index(LAYOUT_FIELDS.index(x))
+                for x in ("module_x", "module_y")
+            ],
+        ],
+        axis=1,
+    )
+    fits = cell.electrics.voltage.maximum * module < requirements.max_module_voltage
+    number_of_slaves = np.ceil(module / requirements.slave_max)
+    return (
+        fits
+        & (np.floor(module / number_of_slaves) >= requirements.slave_min)
+        & (np.ceil(module / number_of_slaves) <= requirements.slave_max)
+    )
+
+
+@dataclass
+class MilpTable:
+    """Holds a table of the sizes in one direction or of the weight, indexed by the
+    distinct counts (or products) of the series and parallel parameters
+
+    :param series_index: index of the table row of each series parameter
+    :param parallel_index: index of the table column of each parallel parameter
+    :param fits_bjb: whether the requirement is fulfilled with the battery junction
+        box, all False for the weight
+    :param fits_min: whether the requirement is fulfilled without the battery
+        junction box
+    :param log_bjb: logarithm of the size with the battery junction box
+    :param log_min: logarithm of the size without the battery junction box, or of
+        the weight
+    """
+
+    series_index: np.ndarray = field(repr=False)
+    parallel_index: np.ndarray = field(repr=False)
+    fits_bjb: np.ndarray = field(repr=False)
+    fits_min: np.ndarray = field(repr=False)
+    log_bjb: np.ndarray = field(repr=False)
+    log_min: np.ndarray = field(repr=False)
+
+
+def consistent_parameters(
+    series: np.ndarray, parallel: np.ndarray, tables: dict[str, MilpTable]
+) -> tuple[np.ndarray, np.ndarray]:
+    """removes the series and parallel parameters that fulfill the requirements of a
+    table with none of the remaining parameters of the other connection, until all
+    remaining parameters are consistent
+
+    :param series: indices of the candidate series parameters
+    :param parallel: indices of the candidate parallel parameters
+    :param tables: the tables of the directions and of the weight
+    :return: the indices of the consistent series and parallel parameters
+    """
+    while len(series) > 0 and len(parallel) > 0:
+        number = len(series) + len(parallel)
+        for table in tables.values():
+            fits = table.fits_bjb | table.fits_min
+            columns = np.unique(table.parallel_index[parallel])
+            rows = fits[:, columns].any(axis=1)
+            series = series[rows[table.series_index[series]]]
+            rows = np.unique(table.series_index[series])
+            columns = fits[rows, :].any(axis=0)
+            parallel = parallel[columns[table.parallel_index[parallel]]]
+        if len(series) + len(parallel) == number:
+            break
+    return series, parallel
+
+
+class _Constraints:
+    """collects the rows of the sparse constraint matrix"""
+
+    def __init__(self) -> None:
+        self.rows, self.columns, self.data = [], [], []
+        self.lower, self.upper = [], []
+
+    def add(  # pylint: disable=too-many-arguments
+        self,
+        rows: np.ndarray,
+        columns: np.ndarray,
+        data: np.ndarray | float,
+        lower: np.ndarray | float,
+        upper: np.ndarray | float,
+        number: int,
+    ) -> None:
+        """adds constraint rows
+
+        :param rows: row of each entry, counted from the first added row
+        :param columns: variable of each entry
+        :param data: coefficient of each entry
+        :param lower: lower bound of each added row
+        :param upper: upper bound of each added row
+        :param number: number of added rows
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        self.rows.append(rows + len(self.lower))
+        self.columns.append(np.asarray(columns, dtype=np.int64))
+        self.data.append(np.broadcast_to(np.asarray(data, dtype=float), rows.shape))
+        self.lower.extend(np.broadcast_to(lower, (number,)).tolist())
+        self.upper.extend(np.broadcast_to(upper, (number,)).tolist())
+
+    def matrix(self, size: int) -> sparse.csr_array:
+        """returns the constraint matrix
+
+        :param size: number of variables
+        :return: the matrix with one row per constraint
+        """
+        return sparse.csr_array(
+            (
+                np.concatenate(self.data),
+                (np.concatenate(self.rows), np.concatenate(self.columns)),
+            ),
+            shape=(len(self.lower), size),
+        )
+
+
+@dataclass
+class MilpModel:  # pylint: disable=too-many-instance-attributes
+    """Holds the mixed-integer linear program of the parameter sets of one cell,
+    cooling type and cell rotation
+
+    The binary variables select one series and one parallel parameter. For each
+    table, continuous variables select the entry of the distinct counts of both
+    parameters, which only exist for the entries fulfilling the requirement. For the
+    directions, further variables mark the entry if the battery junction box is
+    placed in this direction, which is the first direction in which it fits.
+
+    :param cooling_index: index of the overhead functions of the cooling type
+    :param cell_rotation: the cell rotation
+    :param series: indices of the candidate series parameters
+    :param parallel: indices of the candidate parallel parameters
+    :param objective: coefficient of each variable
+    :param constraints: constraint matrix with the lower and upper bounds of each row
+    :param excluded: parameter sets that are excluded from the program as indices of
+        the candidate series and parallel parameters
+    """
+
+    cooling_index: int
+    cell_rotation: int
+    series: np.ndarray = field(repr=False)
+    parallel: np.ndarray = field(repr=False)
+    objective: np.ndarray = field(repr=False)
+    constraints: tuple[sparse.csr_array, np.ndarray, np.ndarray] = field(repr=False)
+    excluded: list[tuple[int, int]] = field(default_factory=list, repr=False)
+
+    @classmethod
+    def from_tables(  # pylint: disable=too-many-arguments,too-many-locals
+        cls,
+        cooling_index: int,
+        cell_rotation: int,
+        series: np.ndarray,
+        parallel: np.ndarray,
+        tables: dict[str, MilpTable],
+        optimized_by: str,
+    ) -> "MilpModel":
+        """formulates the program of the candidate parameters
+
+        :param cooling_index: index of the overhead functions of the cooling type
+        :param cell_rotation: the cell rotation
+        :param series: indices of the candidate series parameters
+        :param parallel: indices of the candidate parallel parameters
+        :param tables: the tables of the directions in BJB_DIRECTIONS and of the
+            weight
+        :param optimized_by: 'volume' or 'weight'
+        :return: the program
+        """
+        series, parallel = consistent_parameters(series, parallel, tables)
+        constraints = _Constraints()
+        objective = [np.zeros(len(series) + len(parallel))]
+        size = len(series) + len(parallel)
+        # exactly one series and one parallel parameter
+        constraints.add(np.zeros(len(series)), np.arange(len(series)), 1.0, 1, 1, 1)
+        constraints.add(
+            np.zeros(len(parallel)),
+            len(series) + np.arange(len(parallel)),
+            1.0,
+            1,
+            1,
+            1,
+        )
+        # the variables of the battery junction box and of the entries fitting with
+        # it in each direction
+        placed, fitting = [], []
+        for name, table in tables.items():
+            rows, row_index = np.unique(table.series_index[series], return_inverse=True)
+            columns, column_index = np.unique(
+                table.parallel_index[parallel], return_inverse=True
+            )
+            fits_bjb = table.fits_bjb[np.ix_(rows, columns)]
+            fits_min = table.fits_min[np.ix_(rows, columns)]
+            entry_row, entry_column = np.nonzero(fits_bjb | fits_min)
+            entries = size + np.arange(len(entry_row))
+            size += len(entries)
+            # the entry agrees with the counts of the selected parameters
+            constraints.add(
+                np.concatenate((entry_row, row_index.reshape(-1))),
+                np.concatenate((entries, np.arange(len(series)))),
+                np.concatenate((np.ones(len(entries)), -np.ones(len(series)))),
+                0,
+                0,
+                len(rows),
+            )
+            constraints.add(
+                np.concatenate((entry_column, column_index.reshape(-1))),
+                np.concatenate((entries, len(series) + np.arange(len(parallel)))),
+                np.concatenate((np.ones(len(entries)), -np.ones(len(parallel)))),
+                0,
+                0,
+                len(columns),
+            )
+            entry_bjb = fits_bjb[entry_row, entry_column]
+            entry_min = fits_min[entry_row, entry_column]
+            log_bjb = table.log_bjb[np.ix_(rows, columns)][entry_row, entry_column]
+            log_min = table.log_min[np.ix_(rows, columns)][entry_row, entry_column]
+            cost = name == "weight" if optimized_by == "weight" else name != "weight"
+            if name == "weight":
+                objective.append(log_min * cost)
+                continue
+            if not placed:
+                # the battery junction box is always placed in the first direction,
+                # if it fits there
+                objective.append(np.where(entry_bjb, log_bjb, log_min) * cost)
+                placed.append(entries[entry_bjb])
+                fitting.append(entries[entry_bjb])
+                continue
+            objective.append(np.where(entry_min, log_min, 0.0) * cost)
+            # the battery junction box can only be placed in a fitting entry, and
+            # must be placed there, if the entry does not fit without it
+            bjb = size + np.arange(np.count_nonzero(entry_bjb))
+            size += len(bjb)
+            constraints.add(
+                np.repeat(np.arange(len(bjb)), 2),
+                np.column_stack((bjb, entries[entry_bjb])).reshape(-1),
+                np.tile([1.0, -1.0], len(bjb)),
+                np.where(entry_min[entry_bjb], -np.inf, 0),
+                0,
+                len(bjb),
+            )
+            objective.append(
+                (log_bjb - np.where(entry_min, log_min, 0.0))[entry_bjb] * cost
+            )
+            # it is placed in this direction, if it fits here but not in the
+            # previous directions
+            previous = np.concatenate(fitting)
+            constraints.add(
+                np.zeros(2 * len(bjb) + len(previous)),
+                np.concatenate((bjb, entries[entry_bjb], previous)),
+                np.concatenate(
+                    (np.ones(len(bjb)), -np.ones(len(bjb)), np.ones(len(previous)))
+                ),
+                0,
+                np.inf,
+                1,
+            )
+            for other in fitting:
+                constraints.add(
+                    np.zeros(len(bjb) + len(other)),
+                    np.concatenate((bjb, other)),
+                    1.0,
+                    -np.inf,
+                    1,
+                    1,
+                )
+            placed.append(bjb)
+            fitting.append(entries[entry_bjb])
+        bjb = np.concatenate(placed).astype(np.int64)
+        constraints.add(np.zeros(len(bjb)), bjb, 1.0, 1, 1, 1)
+        return cls(
+            cooling_index,
+            cell_rotation,
+            series,
+            parallel,
+            np.concatenate(objective),
+            (
+                constraints.matrix(size),
+                np.asarray(constraints.lower),
+                np.asarray(constraints.upper),
+            ),
+        )
+
+    def solve(self) -> tuple[float, int, int] | None:
+        """solves the program without the excluded parameter sets
+
+        The relaxation of the program is solved first. Its optimum is a lower bound
+        of the program and also its optimum, if it selects one series and one
+        parallel parameter, which is usually the case.
+
+        :return: the lower bound of the objective of all remaining parameter sets and
+            the indices of the best series and parallel parameter, or None if no
+            parameter set is left
+        """
+        if len(self.series) == 0 or len(self.parallel) == 0:
+            return None
+        matrix, lower, upper = self.constraints
+        if self.excluded:
+            excluded = np.array(self.excluded, dtype=np.int64)
+            # x_series + z_parallel <= 1
+            cuts = sparse.csr_array(
+                (
+                    np.ones(2 * len(excluded)),
+                    (
+                        np.repeat(np.arange(len(excluded)), 2),
+                        np.column_stack(
+                            (excluded[:, 0], len(self.series) + excluded[:, 1])
+                        ).reshape(-1),
+                    ),
+                ),
+                shape=(len(excluded), matrix.shape[1]),
+            )
+            matrix = sparse.vstack((matrix, cuts), format="csr")
+            lower = np.concatenate((lower, np.full(len(excluded), -np.inf)))
+            upper = np.concatenate((upper, np.ones(len(excluded))))
+        selected = len(self.series) + len(self.parallel)
+        integrality = np.zeros(len(self.objective))
+        for relaxed in (True, False):
+            if not relaxed:
+                integrality[:selected] = 1
+            # the presolve of the solver takes longer than the solve itself
+            result = milp(
+                self.objective,
+                integrality=integrality,
+                bounds=Bounds(0, 1),
+                constraints=LinearConstraint(matrix, lower, upper),
+                options={"mip_rel_gap": 0.0, "presolve": False},
+            )
+            if result.status == 2:
+                # no parameter set is left
+                return None
+            if result.status != 0:
+                raise RuntimeError(f"The program could not be solved: {result.message}")
+            x = result.x[:selected]
+            if np.abs(x - np.round(x)).max() <= INTEGRALITY_TOLERANCE:
+                break
+        bound = getattr(result, "mip_dual_bound", None)
+        if relaxed or bound is None or not np.isfinite(bound):
+            bound = result.fun
+        return (
+            min(bound, result.fun),
+            int(np.argmax(x[: len(self.series)])),
+            int(np.argmax(x[len(self.series) :])),
+        )
+
+    def exclude(self, series: int, parallel: int) -> None:
+        """excludes a parameter set from the program
+
+        :param series: index of the candidate series parameter
+        :param parallel: index of the candidate parallel parameter
+        """
+        self.excluded.append((series, parallel))
+
+
+class MilpSearch:  # pylint: disable=too-many-instance-attributes
+    """MilpSearch determines the best parameter sets of the cells by solving the
+    mixed-integer linear programs of all cells, cooling types and cell rotations in
+    the order of their lower bounds
+
+    The optimal parameter set of the program with the smallest lower bound is
+    verified and excluded, and its program is solved again. The search of a cell
+    stops, if the lower bound of all its programs exceeds its last kept system
+    design, and the whole search stops, if it exceeds the last system design of all
+    cells that is reported. The result is the same as if all parameter sets were
+    checked.
+
+    :param requirements: the requirements of the battery system
+    :param overhead_functions: overhead functions, one for each cooling type, which
+        need to be separable and have a separable weight
+    :param cell_parameters: the parameters of the considered cells
+    :param max_number: maximal number of kept parameter sets per cell
+    :param max_number_of_solutions: number of reported parameter sets of all cells
+    :param deadline: time (as returned by time.time) after which no further programs
+        are solved, None solves all programs
+    :param max_candidates: maximal number of verified parameter sets, None verifies
+        all optimal parameter sets
+    :param overhead_tables: cached overheads of each level keyed by the indices of
+        the cell and the cooling type
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        requirements: Requirements,
+        overhead_functions: list[OverheadFunctions],
+        cell_parameters: list[CellParameters],
+        max_number: int,
+        max_number_of_solutions: int,
+        deadline: float | None = None,
+        max_candidates: int | None = None,
+        overhead_tables: dict[tuple[int, int], dict] | None = None,
+    ) -> None:
+        self.requirements = requirements
+        self.overhead_functions = overhead_functions
+        self.cell_parameters = cell_parameters
+        self.max_number = max_number
+        self.max_number_of_solutions = max_number_of_solutions
+        self.deadline = deadline
+        self.max_candidates = max_candidates
+        self.overhead_tables = {} if overhead_tables is None else overhead_tables
+
+    @staticmethod
+    def applicable(
+        requirements: Requirements, overhead_functions: list[OverheadFunctions]
+    ) -> bool:
+        """checks whether the search can determine the system designs
+
+        :param requirements: the requirements of the battery system
+        :param overhead_functions: overhead functions, one for each cooling type
+        :return: False for pareto fronts and for overhead functions that are not
+            separable or have no separable weight
+        """
+        return requirements.optimized_by in ("volume", "weight") and all(
+            getattr(x, "separable", False) and getattr(x, "separable_weight", False)
+            for x in overhead_functions
+        )
+
+    def tables(  # pylint: disable=too-many-locals
+        self, cell_index: int, cooling_index: int
+    ) -> list[dict[str, MilpTable]]:
+        """determines the tables of the directions and of the weight of a cell and
+        cooling type
+
+        :param cell_index: index of the cell in the considered cells
+        :param cooling_index: index of the overhead functions of the cooling type
+        :return: the tables of each cell rotation in CELL_ROTATION
+        """
+        cell_parameters = self.cell_parameters[cell_index]
+        overhead_functions = [self.overhead_functions[cooling_index]]
+        overhead_cache = None
+        if getattr(overhead_functions[0], "cache_overheads", False):
+            overhead_cache = OverheadCache(
+                self.overhead_tables.setdefault((cell_index, cooling_index), {})
+            )
+        parameters = (
+            cell_parameters.parameters_series,
+            cell_parameters.parameters_parallel,
+            np.asarray(CELL_ROTATION),
+        )
+        stacks = stack_directions(
+            cell_parameters.cell,
+            self.requirements,
+            overhead_functions,
+            parameters,
+            overhead_cache,
+        )
+        weight, series_index, parallel_index = stack_weight(
+            cell_parameters.cell,
+            self.requirements,
+            overhead_functions,
+            parameters,
+            overhead_cache,
+        )
+        tables = []
+        for rotation in range(len(CELL_ROTATION)):
+            rotation_tables = {}
+            for direction in BJB_DIRECTIONS:
+                stack, stack_series, stack_parallel = stacks[direction]
+                limit = getattr(self.requirements, direction)
+                with_bjb = (
+                    stack["pack"][0, :, :, rotation]
+                    + stack["pack_bjb"][0, :, :, rotation]
+                )
+                without_bjb = (
+                    stack["pack"][0, :, :, rotation]
+                    + stack["pack_min"][0, :, :, rotation]
+                )
+                rotation_tables[direction] = MilpTable(
+                    stack_series,
+                    stack_parallel,
+                    with_bjb < limit,
+                    without_bjb < limit,
+                    np.log(with_bjb),
+                    np.log(without_bjb),
+                )
+            rotation_weight = weight[0, :, :, rotation]
+            rotation_tables["weight"] = MilpTable(
+                series_index,
+                parallel_index,
+                np.zeros(rotation_weight.shape, dtype=bool),
+                rotation_weight < self.requirements.weight,
+                np.log(rotation_weight),
+                np.log(rotation_weight),
+            )
+            tables.append(rotation_tables)
+        return tables
+
+    def models(self, cell_index: int) -> list[MilpModel]:
+        """formulates the programs of a cell
+
+        :param cell_index: index of the cell in the considered cells
+        :return: the programs of each cooling type and cell rotation
+        """
+        cell_parameters = self.cell_parameters[cell_index]
+        series = np.flatnonzero(
+            electrical_fits(
+                cell_parameters.cell,
+                self.requirements,
+                cell_parameters.parameters_series,
+            )
+        )
+        parallel = np.arange(len(cell_parameters.parameters_parallel))
+        models = []
+        if len(series) == 0 or len(parallel) == 0:
+            return models
+        for cooling_index in range(len(self.overhead_functions)):
+            for rotation, tables in enumerate(self.tables(cell_index, cooling_index)):
+                models.append(
+                    MilpModel.from_tables(
+                        cooling_index,
+                        CELL_ROTATION[rotation],
+                        series,
+                        parallel,
+                        tables,
+                        self.requirements.optimized_by,
+                    )
+                )
+        return models
+
+    def lower_bound(self, cell_index: int) -> float:
+        """returns a lower bound of the objective of all parameter sets of a cell
+
+        :param cell_index: index of the cell in the considered cells
+        :return: the logarithm of the volume or weight of the bare cells for monotone
+            overhead functions, otherwise minus infinity
+        """
+        if not all(getattr(x, "monotone", False) for x in self.overhead_functions):
+            return -math.inf
+        cell_parameters = self.cell_parameters[cell_index]
+        electrical_configuration = cell_parameters.electrical_configuration
+        mechanics = cell_parameters.cell.mechanics
+        if self.requirements.optimized_by == "volume":
+            size = mechanics.height * mechanics.length * mechanics.width
+        else:
+            size = mechanics.weight
+        return math.log(
+            electrical_configuration.cells_in_series
+            * electrical_configuration.cells_in_parallel
+            * size
+        )
+
+    def verify(
+        self,
+        cell_index: int,
+        model: MilpModel,
+        candidate: tuple[int, int],
+        statistics: SearchStatistics,
+    ) -> tuple[float, np.ndarray] | None:
+        """checks a parameter set with the upper bound checks
+
+        :param cell_index: index of the cell in the considered cells
+        :param model: the program of the parameter set
+        :param candidate: indices of the candidate series and parallel parameter
+        :param statistics: counts the rejected and accepted parameter set
+        :return: the volume or weight and the counts of the parameter set, or None if
+            it violates an upper bound condition
+        """
+        cell_parameters = self.cell_parameters[cell_index]
+        counts = np.zeros((1, len(LAYOUT_FIELDS)), dtype=np.int64)
+        counts[0, list(SERIES_COLUMNS)] = cell_parameters.parameters_series[
+            model.series[candidate[0]]
+        ]
+        counts[0, list(PARALLEL_COLUMNS)] = cell_parameters.parameters_parallel[
+            model.parallel[candidate[1]]
+        ]
+        checks = ParameterSetArrays(
+            cell_parameters.cell,
+            self.requirements,
+            [self.overhead_functions[model.cooling_index]],
+            counts,
+            np.array([model.cell_rotation], dtype=np.int64),
+            np.zeros(1, dtype=np.int64),
+        ).check_upper_bounds(statistics)
+        if len(checks) == 0:
+            return None
+        if self.requirements.optimized_by == "volume":
+            return float(checks.volume[0]), counts[0]
+        return float(checks.dimensions["weight"][0]), counts[0]
+
+    def search(  # pylint: disable=too-many-locals
+        self, cell_indices: list[int]
+    ) -> tuple[list[SystemDesignRecords], set[int]]:
+        """determines the best parameter sets of the cells
+
+        :param cell_indices: indices of the cells to be checked
+        :return: the best parameter sets of each cell sorted by the objective, and
+            the indices of the cells whose best parameter sets are complete, i.e.,
+            not cut off by the reported system designs of the other cells
+        """
+        start = time.perf_counter()
+        statistics = {
+            x: SearchStatistics(
+                candidates=len(self.overhead_functions) * len(self.cell_parameters[x])
+            )
+            for x in cell_indices
+        }
+        seconds = dict.fromkeys(cell_indices, 0.0)
+        # the programs ordered by their lower bound, the order of the cells,
+        # cooling types and cell rotations breaks ties
+        queue = []
+
+        def push(order: tuple[int, int], cell_index: int, model: MilpModel) -> None:
+            solve_start = time.perf_counter()
+            solution = model.solve()
+            seconds[cell_index] += time.perf_counter() - solve_start
+            if solution is not None:
+                bound, *candidate = solution
+                heapq.heappush(queue, (bound, order, cell_index, model, candidate))
+
+        # the programs of a cell are only formulated, once the lower bound of its
+        # bare cells is reached
+        for cell_index in cell_indices:
+            queue.append((self.lower_bound(cell_index), (cell_index, -1), cell_index))
+        heapq.heapify(queue)
+        # the kept parameter sets of each cell as tuples of the objective value,
+        # the order of the enumeration, the counts, the cooling and the cell rotation
+        kept = {x: [] for x in cell_indices}
+        # the largest kept values of each cell and of all cells (negated)
+        cell_values = {x: [] for x in cell_indices}
+        reported_values = []
+        verified = 0
+        exhaustive = True
+        while queue:
+            bound, order, cell_index, *program = heapq.heappop(queue)
+            values = cell_values[cell_index]
+            if len(values) >= self.max_number and bound > math.log(-values[0]) + (
+                TOLERANCE
+            ):
+                # all remaining parameter sets of the program are worse than the
+                # kept ones of the cell
+                continue
+            if len(reported_values) >= self.max_number_of_solutions and bound > (
+                math.log(-reported_values[0]) + TOLERANCE
+            ):
+                # all remaining parameter sets are worse than the reported ones
+                heapq.heappush(queue, (bound, order, cell_index, *program))
+                break
+            if (self.deadline is not None and time.time() > self.deadline) or (
+                self.max_candidates is not None and verified >= self.max_candidates
+            ):
+                heapq.heappush(queue, (bound, order, cell_index, *program))
+                exhaustive = False
+                break
+            if not program:
+                solve_start = time.perf_counter()
+                models = self.models(cell_index)
+                seconds[cell_index] += time.perf_counter() - solve_start
+                for i, model in enumerate(models):
+                    push((cell_index, i), cell_index, model)
+                continue
+            model, candidate = program
+            verified += 1
+            result = self.verify(cell_index, model, candidate, statistics[cell_index])
+            if result is not None:
+                self._keep(
+                    result,
+                    (model.cooling_index, model.cell_rotation, *candidate),
+                    model,
+                    (kept[cell_index], values, reported_values),
+                )
+            else:
+                logging.debug(
+                    "The optimal parameter set of a program of %s violates the upper "
+                    "bounds",
+                    self.cell_parameters[cell_index].cell,
+                )
+            model.exclude(*candidate)
+            push(order, cell_index, model)
+        incomplete = {x[2] for x in queue}
+        records = [
+            self._records(x, kept[x], statistics[x], seconds[x], exhaustive)
+            for x in cell_indices
+        ]
+        logging.debug(
+            "Verified %s parameter sets of %s cells in %.3f s",
+            verified,
+            len(cell_indices),
+            time.perf_counter() - start,
+        )
+        return records, set(cell_indices) - incomplete
+
+    def _keep(
+        self,
+        result: tuple[float, np.ndarray],
+        candidate: tuple[int, int, int, int],
+        model: MilpModel,
+        values: tuple[list, list, list],
+    ) -> None:
+        """keeps a verified parameter set
+
+        :param result: the objective value and the counts of the parameter set
+        :param candidate: the cooling index, the cell rotation and the indices of the
+            series and the parallel row
+        :param model: the program of the parameter set
+        :param values: the kept parameter sets of the cell, the largest kept values of
+            the cell and the largest reported values of all cells (negated)
+        """
+        value, counts = result
+        cooling_index, cell_rotation, series, parallel = candidate
+        kept, cell_values, reported_values = values
+        order = (
+            cooling_index,
+            int(model.series[series]),
+            int(model.parallel[parallel]),
+            cell_rotation,
+        )
+        kept.append((value, order, counts))
+        if len(cell_values) < self.max_number:
+            # each cell contributes at most its kept parameter sets to the reported
+            # ones
+            heapq.heappush(reported_values, -value)
+            if len(reported_values) > self.max_number_of_solutions:
+                heapq.heappop(reported_values)
+        heapq.heappush(cell_values, -value)
+        if len(cell_values) > self.max_number:
+            heapq.heappop(cell_values)
+
+    def _records(  # pylint: disable=too-many-arguments
+        self,
+        cell_index: int,
+        kept: list[tuple],
+        statistics: SearchStatistics,
+        seconds: float,
+        exhaustive: bool,
+    ) -> SystemDesignRecords:
+        """returns the best kept parameter sets of a cell
+
+        :param cell_index: index of the cell
+        :param kept: the kept parameter sets of the cell
+        :param statistics: the search statistics of the cell
+        :param seconds: the time spent on the programs of the cell
+        :param exhaustive: whether the search was not stopped early
+        :return: the best parameter sets of the cell sorted by the objective
+        """
+        # parameter sets with the same objective value are ranked in the order in
+        # which they are enumerated
+        rows = sorted(kept, key=lambda x: (x[0], x[1]))[: self.max_number]
+        records = SystemDesignRecords(
+            cell_index,
+            np.array([x[0] for x in rows], dtype=float),
+            np.array([x[1][0] for x in rows], dtype=np.int64),
+            np.array([x[2] for x in rows], dtype=np.int64).reshape(
+                -1, len(LAYOUT_FIELDS)
+            ),
+            np.array([x[1][3] for x in rows], dtype=np.int64),
+            exhaustive,
+        )
+        checked = statistics.accepted + sum(statistics.rejected.values())
+        if exhaustive:
+            statistics.pruned = statistics.candidates - checked
+        else:
+            statistics.unchecked = statistics.candidates - checked
+        statistics.seconds = seconds
+        records.statistics = statistics
+        return records
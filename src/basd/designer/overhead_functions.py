@@ -35,6 +35,8 @@
 overhead caused by busbar, casing, etc.
 """
 
+import numpy as np
+
 from .basic_sets import BasicParameterSet
 from .cooling import Cooling
 from .overhead_functions_abc import AbcOverheadFunctions
@@ -53,12 +55,43 @@ class OverheadFunctions(AbcOverheadFunctions):
     :cvar min_length: minimal length of the battery system
     :cvar min_width: minimal width of the battery system
     :cvar min_height: minimal height of the battery system
+    :cvar monotone: whether the dimensions and the weight of a battery system can not
+        decrease if any count of its layout is increased, i.e., all overhead functions
+        are non-negative and the stacked sizes are non-decreasing in each count.
+        Parameter sets are only skipped early during the design, if this is declared.
+    :cvar separable: whether the length, width and height of a battery system only
+        depend on the cell, the requirements, the cooling, the cell rotation and the
+        counts of the direction as defined in direction_checks.DIRECTION_COUNTS,
+        e.g., the length on the y counts. The dimensions are then checked for the
+        distinct counts of each direction and only the parameter sets fitting in all
+        directions are checked.
+    :cvar separable_weight: whether the weight of a battery system only depends on
+        the cell, the requirements, the cooling, the cell rotation and the products of
+        the counts of each level, e.g., the number of cells of a cell block. The
+        system designs can then be searched by mixed-integer linear programs
+        (milp_search.MilpSearch), if the overhead functions are also separable.
+    :cvar cache_overheads: whether the overhead of each level only depends on the
+        cell, the requirements, the cooling, the cell rotation and the counts of this
+        and the lower levels. The overheads are then computed once per distinct
+        combination. Set this to False, if an overhead depends on the whole layout.
+    :cvar requirement_fields: names of the requirements the overheads depend on, or
+        None if they may depend on any requirement. Cached overheads are reused for
+        all requirements that agree in these fields, e.g., in batch runs.
 
     """
 
+    # pylint: disable=too-many-public-methods
     min_height: float = 0.1
     min_length: float = 0.1
     min_width: float = 0.1
+    monotone: bool = True
+    separable: bool = True
+    separable_weight: bool = True
+    cache_overheads: bool = True
+    requirement_fields: tuple[str, ...] | None = (
+        "cont_max_charge_power",
+        "cont_max_discharge_power",
+    )
 
     # pylint: disable=R0801
     def __init__(self, cooling: Cooling):
@@ -106,6 +139,21 @@ class OverheadFunctions(AbcOverheadFunctions):
             max_power = layout.requirements.cont_max_discharge_power
         return 0.10 + max((0, (max_power - 1e5) * 0.0003))
 
+    def pack_height_batch(
+        self,
+        layouts: BasicParameterSet,
+        base_height: np.ndarray,
+    ) -> np.ndarray | float:
+        """overhead for the pack height of many layouts
+
+        :param layouts: layout parameter with arrays of counts and cell rotations
+        :param base_height: absolute heights caused by the number of strings
+
+        :return: overhead of each layout
+
+        """
+        return self.pack_height(layouts, base_height)
+
     def pack_length(
         self,
         layout: BasicParameterSet,  # pylint: disable=unused-argument
@@ -128,6 +176,21 @@ class OverheadFunctions(AbcOverheadFunctions):
             max_power = layout.requirements.cont_max_discharge_power
         return 0.10 + max((0, (max_power - 1e5) * 0.0005))
 
+    def pack_length_batch(
+        self,
+        layouts: BasicParameterSet,
+        base_length: np.ndarray,
+    ) -> np.ndarray | float:
+        """overhead for the pack length of many layouts
+
+        :param layouts: layout parameter with arrays of counts and cell rotations
+        :param base_length: absolute lengths caused by the number of strings
+
+        :return: overhead of each layout
+
+        """
+        return self.pack_length(layouts, base_length)
+
     def pack_width(
         self,
         layout: BasicParameterSet,  # pylint: disable=unused-argument
@@ -150,6 +213,21 @@ class OverheadFunctions(AbcOverheadFunctions):
             max_power = layout.requirements.cont_max_discharge_power
         return 0.10 + max((0, (max_power - 1e5) * 0.0008))
 
+    def pack_width_batch(
+        self,
+        layouts: BasicParameterSet,
+        base_width: np.ndarray,
+    ) -> np.ndarray | float:
+        """overhead for the pack width of many layouts
+
+        :param layouts: layout parameter with arrays of counts and cell rotations
+        :param base_width: absolute widths caused by the number of strings
+
+        :return: overhead of each layout
+
+        """
+        return self.pack_width(layouts, base_width)
+
     def string_height(
         self,
         layout: BasicParameterSet,  # pylint: disable=unused-argument
@@ -165,6 +243,21 @@ class OverheadFunctions(AbcOverheadFunctions):
         """
         return 0.02
 
+    def string_height_batch(
+        self,
+        layouts: BasicParameterSet,
+        base_height: np.ndarray,
+    ) -> np.ndarray | float:
+        """overhead for the string height of many layouts
+
+        :param layouts: layout parameter with arrays of counts and cell rotations
+        :param base_height: absolute heights caused by the number of modules
+
+        :return: overhead of each layout
+
+        """
+        return self.string_height(layouts, base_height)
+
     def string_length(
         self,
         layout: BasicParameterSet,  # pylint: disable=unused-argument
@@ -180,6 +273,21 @@ class OverheadFunctions(AbcOverheadFunctions):
         """
         return 0.03
 
+    def string_length_batch(
+        self,
+        layouts: BasicParameterSet,
+        base_length: np.ndarray,
+    ) -> np.ndarray | float:
+        """overhead for the string length of many layouts
+
+        :param layouts: layout parameter with arrays of counts and cell rotations
+        :param base_length: absolute lengths caused by the number of modules
+
+        :return: overhead of each layout
+
+        """
+        return self.string_length(layouts, base_length)
+
     def string_width(
         self,
         layout: BasicParameterSet,  # pylint: disable=unused-argument
@@ -195,6 +303,21 @@ class OverheadFunctions(AbcOverheadFunctions):
         """
         return 0.05
 
+    def string_width_batch(
+        self,
+        layouts: BasicParameterSet,
+        base_width: np.ndarray,
+    ) -> np.ndarray | float:
+        """overhead for the string width of many layouts
+
+        :param layouts: layout parameter with arrays of counts and cell rotations
+        :param base_width: absolute widths caused by the number of modules
+
+        :return: overhead of each layout
+
+        """
+        return self.string_width(layouts, base_width)
+
     def module_height(
         self,
         layout: BasicParameterSet,  # pylint: disable=unused-argument
@@ -210,6 +333,21 @@ class OverheadFunctions(AbcOverheadFunctions):
         """
         return 0.025
 
+    def module_height_batch(
+        self,
+        layouts: BasicParameterSet,
+        base_height: np.ndarray,
+    ) -> np.ndarray | float:
+        """overhead for the module height of many layouts
+
+        :param layouts: layout parameter with arrays of counts and cell rotations
+        :param base_height: absolute heights caused by the number of cell blocks
+
+        :return: overhead of each layout
+
+        """
+        return self.module_height(layouts, base_height)
+
     def module_length(
         self,
         layout: BasicParameterSet,  # pylint: disable=unused-argument
@@ -227,6 +365,21 @@ class OverheadFunctions(AbcOverheadFunctions):
             return 0.019
         return 0.029
 
+    def module_length_batch(
+        self,
+        layouts: BasicParameterSet,
+        base_length: np.ndarray,  # pylint: disable=unused-argument
+    ) -> np.ndarray | float:
+        """overhead for the module length of many layouts
+
+        :param layouts: layout parameter with arrays of counts and cell rotations
+        :param base_length: absolute lengths caused by the number of cell blocks
+
+        :return: overhead of each layout
+
+        """
+        return np.where(layouts.cell_rotation == 1, 0.019, 0.029)
+
     def module_width(
         self,
         layout: BasicParameterSet,  # pylint: disable=unused-argument
@@ -244,6 +397,21 @@ class OverheadFunctions(AbcOverheadFunctions):
             return 0.029
         return 0.019
 
+    def module_width_batch(
+        self,
+        layouts: BasicParameterSet,
+        base_width: np.ndarray,  # pylint: disable=unused-argument
+    ) -> np.ndarray | float:
+        """overhead for the module width of many layouts
+
+        :param layouts: layout parameter with arrays of counts and cell rotations
+        :param base_width: absolute widths caused by the number of cell blocks
+
+        :return: overhead of each layout
+
+        """
+        return np.where(layouts.cell_rotation == 1, 0.029, 0.019)
+
     def cell_block_height(self, layout: BasicParameterSet, base_height: float) -> float:
         """overhead for the cell block height
 
@@ -263,6 +431,30 @@ class OverheadFunctions(AbcOverheadFunctions):
             overhead_percentage = OverheadFunctions.linear(layout.cell_block.y, 0.09, 3)
         return base_height * (overhead_percentage / 100 + self.cooling_height)
 
+    def cell_block_height_batch(
+        self,
+        layouts: BasicParameterSet,
+        base_height: np.ndarray,
+    ) -> np.ndarray | float:
+        """overhead for the cell block height of many layouts
+
+        :param layouts: layout parameter with arrays of counts and cell rotations
+        :param base_height: absolute heights caused by the number of cells
+
+        :return: overhead of each layout
+
+        """
+        cell_block = layouts.cell_block
+        if layouts.cell.mechanics.format == "prismatic":
+            overhead_percentage = OverheadFunctions.linear(
+                cell_block.y * cell_block.x, 0.24, 2
+            )
+        if layouts.cell.mechanics.format == "cylindrical":
+            overhead_percentage = 1
+        if layouts.cell.mechanics.format == "pouch":
+            overhead_percentage = OverheadFunctions.linear(cell_block.y, 0.09, 3)
+        return base_height * (overhead_percentage / 100 + self.cooling_height)
+
     def cell_block_length(self, layout: BasicParameterSet, base_length: float) -> float:
         """overhead for the cell block length
 
@@ -292,6 +484,39 @@ class OverheadFunctions(AbcOverheadFunctions):
                 )
         return base_length * (overhead_percentage / 100 + self.cooling_length)
 
+    def cell_block_length_batch(
+        self,
+        layouts: BasicParameterSet,
+        base_length: np.ndarray,
+    ) -> np.ndarray | float:
+        """overhead for the cell block length of many layouts
+
+        :param layouts: layout parameter with arrays of counts and cell rotations
+        :param base_length: absolute lengths caused by the number of cells
+
+        :return: overhead of each layout
+
+        """
+        cell_block_y = layouts.cell_block.y
+        rotated = (cell_block_y > 1) & (layouts.cell_rotation == 1)
+        if layouts.cell.mechanics.format == "prismatic":
+            overhead_percentage = np.where(
+                rotated,
+                10000000,
+                OverheadFunctions.sigmoid(cell_block_y, 2, 8.37, 3, 2),
+            )
+        if layouts.cell.mechanics.format == "cylindrical":
+            overhead_percentage = OverheadFunctions.sigmoid(
+                cell_block_y, 2.26, 9.82, 4, 3
+            )
+        if layouts.cell.mechanics.format == "pouch":
+            overhead_percentage = np.where(
+                rotated,
+                10000000,
+                OverheadFunctions.sigmoid(cell_block_y, 2.29, 9.98, 5, 4),
+            )
+        return base_length * (overhead_percentage / 100 + self.cooling_length)
+
     def cell_block_width(self, layout: BasicParameterSet, base_width: float) -> float:
         """overhead for the cell block width
 
@@ -319,6 +544,35 @@ class OverheadFunctions(AbcOverheadFunctions):
                 overhead_percentage = 5
         return base_width * (overhead_percentage / 100 + self.cooling_width)
 
+    def cell_block_width_batch(
+        self,
+        layouts: BasicParameterSet,
+        base_width: np.ndarray,
+    ) -> np.ndarray | float:
+        """overhead for the cell block width of many layouts
+
+        :param layouts: layout parameter with arrays of counts and cell rotations
+        :param base_width: absolute widths caused by the number of cells
+
+        :return: overhead of each layout
+
+        """
+        cell_block_x = layouts.cell_block.x
+        not_rotated = (cell_block_x > 1) & (layouts.cell_rotation == 0)
+        if layouts.cell.mechanics.format == "prismatic":
+            overhead_percentage = np.where(
+                not_rotated,
+                10000000,
+                OverheadFunctions.sigmoid(cell_block_x, 2, 8.25, 3, 2),
+            )
+        if layouts.cell.mechanics.format == "cylindrical":
+            overhead_percentage = OverheadFunctions.sigmoid(
+                cell_block_x, 2.26, 9.82, 4, 3
+            )
+        if layouts.cell.mechanics.format == "pouch":
+            overhead_percentage = np.where(not_rotated, 10000000, 5)
+        return base_width * (overhead_percentage / 100 + self.cooling_width)
+
     def pack_gravimetric(
         self,
         layout: BasicParameterSet,  # pylint: disable=unused-argument
@@ -333,6 +587,21 @@ class OverheadFunctions(AbcOverheadFunctions):
         """
         return 4.24
 
+    def pack_gravimetric_batch(
+        self,
+        layouts: BasicParameterSet,
+        base_weight: np.ndarray,
+    ) -> np.ndarray | float:
+        """gravimetric overhead for the pack of many layouts
+
+        :param layouts: layout parameter with arrays of counts and cell rotations
+        :param base_weight: absolute weights caused by the number of strings
+
+        :return: overhead of each layout
+
+        """
+        return self.pack_gravimetric(layouts, base_weight)
+
     def string_gravimetric(
         self,
         layout: BasicParameterSet,  # pylint: disable=unused-argument
@@ -347,6 +616,21 @@ class OverheadFunctions(AbcOverheadFunctions):
         """
         return 0.57
 
+    def string_gravimetric_batch(
+        self,
+        layouts: BasicParameterSet,
+        base_weight: np.ndarray,
+    ) -> np.ndarray | float:
+        """gravimetric overhead for the string of many layouts
+
+        :param layouts: layout parameter with arrays of counts and cell rotations
+        :param base_weight: absolute weights caused by the number of modules
+
+        :return: overhead of each layout
+
+        """
+        return self.string_gravimetric(layouts, base_weight)
+
     def module_gravimetric(
         self,
         layout: BasicParameterSet,  # pylint: disable=unused-argument
@@ -361,6 +645,21 @@ class OverheadFunctions(AbcOverheadFunctions):
         """
         return 0.29
 
+    def module_gravimetric_batch(
+        self,
+        layouts: BasicParameterSet,
+        base_weight: np.ndarray,
+    ) -> np.ndarray | float:
+        """gravimetric overhead for the module of many layouts
+
+        :param layouts: layout parameter with arrays of counts and cell rotations
+        :param base_weight: absolute weights caused by the number of cell blocks
+
+        :return: overhead of each layout
+
+        """
+        return self.module_gravimetric(layouts, base_weight)
+
     def cell_block_gravimetric(
         self, layout: BasicParameterSet, base_weight: float
     ) -> float:
@@ -384,3 +683,29 @@ class OverheadFunctions(AbcOverheadFunctions):
                 layout.cell_block.y * layout.cell_block.x, 3.6, 15.3, 24, 12
             )
         return base_weight * (overhead_percentage / 100 + self.cooling_weight)
+
+    def cell_block_gravimetric_batch(
+        self,
+        layouts: BasicParameterSet,
+        base_weight: np.ndarray,
+    ) -> np.ndarray | float:
+        """gravimetric overhead for the cell blocks of many layouts
+
+        :param layouts: layout parameter with arrays of counts and cell rotations
+        :param base_weight: absolute weights caused by the number of cells
+
+        :return: overhead of each layout
+
+        """
+        number_of_cells = layouts.cell_block.y * layouts.cell_block.x
+        if layouts.cell.mechanics.format == "prismatic":
+            overhead_percentage = OverheadFunctions.linear(number_of_cells, 0.21, 6.36)
+        if layouts.cell.mechanics.format == "cylindrical":
+            overhead_percentage = OverheadFunctions.sigmoid(
+                number_of_cells, 3.8, 17.9, 27, 23
+            )
+        if layouts.cell.mechanics.format == "pouch":
+            overhead_percentage = OverheadFunctions.sigmoid(
+                number_of_cells, 3.6, 15.3, 24, 12
+            )
+        return base_weight * (overhead_percentage / 100 + self.cooling_weight)
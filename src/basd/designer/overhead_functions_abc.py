@@ -34,11 +34,13 @@
 """overhead functions defines for each element in the battery system the expected
 overhead caused by busbar, casing, etc.
 """
+import copy
 from abc import ABC, abstractmethod
+from typing import Callable
 
 import numpy as np
 
-from .basic_sets import BasicParameterSet
+from .basic_sets import BasicParameterSet, CellBlock, Module, Pack, String
 from .cooling import Cooling
 
 
@@ -55,12 +57,47 @@ class AbcOverheadFunctions(ABC):
     :cvar min_length: minimal length of the battery system
     :cvar min_width: minimal width of the battery system
     :cvar min_height: minimal height of the battery system
+    :cvar monotone: whether the dimensions and the weight of a battery system can not
+        decrease if any count of its layout is increased, i.e., all overhead functions
+        are non-negative and the stacked sizes are non-decreasing in each count.
+        Parameter sets are only skipped early during the design, if this is declared.
+    :cvar separable: whether the length, width and height of a battery system only
+        depend on the cell, the requirements, the cooling, the cell rotation and the
+        counts of the direction as defined in direction_checks.DIRECTION_COUNTS,
+        e.g., the length on the y counts. The dimensions are then checked for the
+        distinct counts of each direction and only the parameter sets fitting in all
+        directions are checked.
+    :cvar separable_weight: whether the weight of a battery system only depends on
+        the cell, the requirements, the cooling, the cell rotation and the products of
+        the counts of each level, e.g., the number of cells of a cell block. The
+        system designs can then be searched by mixed-integer linear programs
+        (milp_search.MilpSearch), if the overhead functions are also separable.
+    :cvar cache_overheads: whether the overhead of each level only depends on the
+        cell, the requirements, the cooling, the cell rotation and the counts of this
+        and the lower levels. The overheads are then computed once per distinct
+        combination. Set this to False, if an overhead depends on the whole layout.
+    :cvar requirement_fields: names of the requirements the overheads depend on, or
+        None if they may depend on any requirement. Cached overheads are reused for
+        all requirements that agree in these fields, e.g., in batch runs.
+
+    Each overhead function, e.g., ``cell_block_length(layout, base_length)``, may be
+    accompanied by a batch variant with the suffix ``_batch``, e.g.,
+    ``cell_block_length_batch(layouts, base_length)``. It receives the layouts of
+    many parameter sets, whose counts and cell rotation are arrays, and an array of
+    base values, and returns an array of overheads (or a scalar for a constant
+    overhead). Overhead functions without a batch variant are called for each
+    parameter set.
 
     """
 
     min_length: float = 0.1
     min_width: float = 0.1
     min_height: float = 0.1
+    monotone: bool = False
+    separable: bool = False
+    separable_weight: bool = False
+    cache_overheads: bool = True
+    requirement_fields: tuple[str, ...] | None = None
 
     @abstractmethod
     def __init__(self, cooling: Cooling):
@@ -111,6 +148,25 @@ class AbcOverheadFunctions(ABC):
         """
         return m * x + c
 
+    def overheads(
+        self, name: str, layouts: BasicParameterSet, base: np.ndarray
+    ) -> np.ndarray:
+        """evaluates an overhead function for many layouts at once
+
+        :param name: name of the overhead function, e.g., cell_block_length
+        :param layouts: layout parameter whose counts and cell rotation are arrays
+            with one entry per layout
+        :param base: the base value of each layout
+
+        :return: overhead of each layout
+        """
+        batch = getattr(self, f"{name}_batch", None)
+        if batch is None:
+            return scalar_overheads(getattr(self, name), layouts, base)
+        return np.broadcast_to(
+            np.asarray(batch(layouts, base), dtype=float), np.shape(base)
+        )
+
     @abstractmethod
     def pack_height(
         self,
@@ -332,3 +388,59 @@ class AbcOverheadFunctions(ABC):
 
         :return: overhead
         """
+
+
+def scalar_overheads(
+    function: Callable[[BasicParameterSet, float], float],
+    layouts: BasicParameterSet,
+    base: np.ndarray,
+) -> np.ndarray:
+    """adapts an overhead function of a single layout to many layouts by calling it
+    for each layout
+
+    :param function: the overhead function of a single layout
+    :param layouts: layout parameter whose counts and cell rotation are arrays with
+        one entry per layout
+    :param base: the base value of each layout
+
+    :return: overhead of each layout
+    """
+    # the layout passed to the overhead function is reused for all layouts
+    layout = copy.copy(layouts)
+    layout.cell_block, layout.module = CellBlock(), Module()
+    layout.string, layout.pack = String(), Pack()
+    counts = zip(
+        *(
+            np.asarray(x).tolist()
+            for x in (
+                layouts.cell_block.x,
+                layouts.cell_block.y,
+                layouts.module.x,
+                layouts.module.y,
+                layouts.string.x,
+                layouts.string.y,
+                layouts.string.z,
+                layouts.pack.x,
+                layouts.pack.y,
+                layouts.pack.z,
+                layouts.cell_rotation,
+            )
+        )
+    )
+    overheads = np.empty(len(base))
+    for i, (row, value) in enumerate(zip(counts, np.asarray(base).tolist())):
+        (
+            layout.cell_block.x,
+            layout.cell_block.y,
+            layout.module.x,
+            layout.module.y,
+            layout.string.x,
+            layout.string.y,
+            layout.string.z,
+            layout.pack.x,
+            layout.pack.y,
+            layout.pack.z,
+            layout.cell_rotation,
+        ) = row
+        overheads[i] = function(layout, value)
+    return overheads
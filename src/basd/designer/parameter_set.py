@@ -44,7 +44,7 @@ from .basic_sets import BasicParameterSet, Overhead, SlaveUtilization
 from .overhead_functions import OverheadFunctions
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class ParameterSet(BasicParameterSet):  # pylint: disable=too-many-instance-attributes
     """Defines the parameter set for the battery system layout
 
@@ -0,0 +1,941 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2010 - 2024, Fraunhofer-Gesellschaft zur Foerderung der angewandten Forschung e.V.
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""parameter_set_arrays provides the ParameterSetArrays class which holds many parameter
+sets of one cell as integer arrays, so that the upper bound conditions of all of them
+can be checked at once
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Iterator
+
+import numpy as np
+
+from ..database.battery_cell import BatteryCell
+from ..requirements import Requirements
+from .basic_sets import (
+    CellBlock,
+    ElectricalConfiguration,
+    ElectricalProperties,
+    MechanicalProperties,
+    Module,
+    Overhead,
+    Pack,
+    SlaveUtilization,
+    String,
+)
+from .overhead_functions import OverheadFunctions
+from .parameter_set import ParameterSet
+from .search_statistics import SearchStatistics
+from .system_design import SystemDesign
+
+#: layout counts held by ParameterSetArrays, in the order of the count columns
+LAYOUT_FIELDS = (
+    "cell_block_x",
+    "cell_block_y",
+    "module_x",
+    "module_y",
+    "string_x",
+    "string_y",
+    "string_z",
+    "pack_x",
+    "pack_y",
+    "pack_z",
+)
+#: directions in which the battery junction box is tried to be placed, in this order
+BJB_DIRECTIONS = ("length", "width", "height")
+#: columns of the series and parallel parameters in LAYOUT_FIELDS
+SERIES_COLUMNS = (2, 3, 4, 5, 6)
+PARALLEL_COLUMNS = (0, 1, 7, 8, 9)
+#: levels of the battery system, in the order of the overhead columns
+LEVELS = ("cell_block", "module", "string", "pack")
+#: number of leading count columns belonging to a level and all levels below
+LEVEL_COUNTS = {"cell_block": 2, "module": 4, "string": 7, "pack": 10}
+
+
+@dataclass
+class OverheadCache:
+    """Caches the overheads of each level of the parameter sets of one cell
+
+    :param values: overheads keyed by the names of the evaluated overhead functions
+        and then by the cooling, cell rotation and counts of the level and the levels
+        below
+    :param hits: number of overheads taken from the cache
+    :param misses: number of overheads computed by the overhead functions
+    """
+
+    values: dict[tuple, dict[tuple, tuple]] = field(default_factory=dict, repr=False)
+    hits: int = 0
+    misses: int = 0
+
+
+@dataclass
+class ParameterSetArrays:
+    """Defines many parameter sets of one cell as struct of arrays
+
+    :param cell: used cell for all parameter sets
+    :param requirements: requirements of the battery system
+    :param overhead_functions: overhead functions, indexed by the cooling array
+    :param counts: layout counts with one row per parameter set and the columns
+        defined by LAYOUT_FIELDS
+    :param cell_rotation: cell rotation of each parameter set
+    :param cooling: index of the used overhead functions of each parameter set
+    :param overhead_cache: cache of the overheads of each level, None evaluates the
+        overhead functions for every parameter set
+    """
+
+    cell: BatteryCell
+    requirements: Requirements
+    overhead_functions: list[OverheadFunctions]
+    counts: np.ndarray = field(repr=False)
+    cell_rotation: np.ndarray = field(repr=False)
+    cooling: np.ndarray = field(repr=False)
+    overhead_cache: "OverheadCache | None" = field(default=None, repr=False)
+
+    @classmethod
+    def from_product(  # pylint: disable=too-many-arguments
+        cls,
+        cell: BatteryCell,
+        requirements: Requirements,
+        overhead_functions: list[OverheadFunctions],
+        parameters_series: np.ndarray,
+        parameters_parallel: np.ndarray,
+        cell_rotation: tuple[int, ...] = (0, 1),
+        overhead_cache: "OverheadCache | None" = None,
+    ) -> "ParameterSetArrays":
+        """creates the cartesian product of overhead functions, series parameters,
+        parallel parameters and cell rotations in the same order as
+        ``itertools.product``
+
+        :param cell: used cell for all parameter sets
+        :param requirements: requirements of the battery system
+        :param overhead_functions: overhead functions, one for each cooling type
+        :param parameters_series: parameters of the series connection, with the
+            columns module x/y and string x/y/z
+        :param parameters_parallel: parameters of the parallel connection, with the
+            columns cell block x/y and pack x/y/z
+        :param cell_rotation: considered cell rotations
+        :param overhead_cache: cache of the overheads of each level
+        :return: the parameter sets of the cartesian product
+        """
+        chunks = cls.iter_product(
+            cell,
+            requirements,
+            overhead_functions,
+            parameters_series,
+            parameters_parallel,
+            cell_rotation,
+            chunk_size=None,
+            overhead_cache=overhead_cache,
+        )
+        return next(chunks)
+
+    @classmethod
+    def iter_product(  # pylint: disable=too-many-arguments,too-many-locals
+        cls,
+        cell: BatteryCell,
+        requirements: Requirements,
+        overhead_functions: list[OverheadFunctions],
+        parameters_series: np.ndarray,
+        parameters_parallel: np.ndarray,
+        cell_rotation: tuple[int, ...] = (0, 1),
+        chunk_size: int | None = None,
+        prune: bool = False,
+        overhead_cache: "OverheadCache | None" = None,
+        exceeded: np.ndarray | None = None,
+    ) -> Iterator["ParameterSetArrays"]:
+        """yields the cartesian product of from_product in chunks, without creating
+        the whole product at once
+
+        :param cell: used cell for all parameter sets
+        :param requirements: requirements of the battery system
+        :param overhead_functions: overhead functions, one for each cooling type
+        :param parameters_series: parameters of the series connection
+        :param parameters_parallel: parameters of the parallel connection
+        :param cell_rotation: considered cell rotations
+        :param chunk_size: maximal number of parameter sets per chunk, None yields
+            the whole product as one chunk
+        :param prune: skip all parameter sets whose series or parallel parameters
+            alone already exceed the dimension or weight requirements, only valid for
+            monotone overhead functions
+        :param overhead_cache: cache of the overheads of each level, shared by all
+            chunks
+        :param exceeded: skip the parameter sets known to exceed the requirements,
+            indexed by cooling, series parameters, parallel parameters and rotation,
+            e.g., as joined by DirectionChecks
+        :return: the parameter sets of the cartesian product in chunks, the chunks
+            only contain the parameter sets that are not skipped
+        """
+        series = np.asarray(parameters_series, dtype=np.int64).reshape(-1, 5)
+        parallel = np.asarray(parameters_parallel, dtype=np.int64).reshape(-1, 5)
+        rotation = np.asarray(cell_rotation, dtype=np.int64)
+        shape = (len(overhead_functions), len(series), len(parallel), len(rotation))
+        size = int(np.prod(shape))
+        # skipped parameter sets indexed by cooling, series and parallel parameters
+        # and rotation
+        skipped = cls.skipped(
+            cell,
+            requirements,
+            overhead_functions,
+            (series, parallel, rotation),
+            prune,
+            overhead_cache,
+            exceeded,
+        )
+        if skipped is None:
+            remaining = np.arange(size)
+        else:
+            remaining = np.flatnonzero(~skipped.reshape(-1))
+        if chunk_size is None:
+            chunk_size = max(len(remaining), 1)
+        for start in range(0, max(len(remaining), 1), chunk_size):
+            flat_index = remaining[start : start + chunk_size]
+            if skipped is not None and len(flat_index) == 0:
+                continue
+            # pylint: disable-next=unbalanced-tuple-unpacking
+            cooling_idx, series_idx, parallel_idx, rotation_idx = np.unravel_index(
+                flat_index, shape
+            )
+            counts = np.empty((len(flat_index), len(LAYOUT_FIELDS)), dtype=np.int64)
+            counts[:, SERIES_COLUMNS] = series[series_idx]
+            counts[:, PARALLEL_COLUMNS] = parallel[parallel_idx]
+            yield cls(
+                cell,
+                requirements,
+                list(overhead_functions),
+                counts,
+                rotation[rotation_idx],
+                cooling_idx.astype(np.int64),
+                overhead_cache,
+            )
+
+    @classmethod
+    def skipped(  # pylint: disable=too-many-arguments
+        cls,
+        cell: BatteryCell,
+        requirements: Requirements,
+        overhead_functions: list[OverheadFunctions],
+        parameters: tuple[np.ndarray, np.ndarray, np.ndarray],
+        prune: bool = False,
+        overhead_cache: "OverheadCache | None" = None,
+        exceeded: np.ndarray | None = None,
+    ) -> np.ndarray | None:
+        """determines the parameter sets of the cartesian product of the parameters
+        that are skipped by iter_product
+
+        :param cell: used cell for all parameter sets
+        :param requirements: requirements of the battery system
+        :param overhead_functions: overhead functions, one for each cooling type
+        :param parameters: parameters of the series connection, parameters of the
+            parallel connection and considered cell rotations
+        :param prune: see iter_product
+        :param overhead_cache: cache of the overheads of each level
+        :param exceeded: see iter_product
+        :return: whether the parameter sets are skipped, indexed by cooling, series
+            parameters, parallel parameters and rotation, None if none is skipped
+        """
+        series, parallel, rotation = parameters
+        if len(overhead_functions) * len(series) * len(parallel) * len(rotation) == 0:
+            return None
+        skipped = None
+        if prune:
+            series_exceeded, parallel_exceeded = cls._exceeded_partial_assignments(
+                cell, requirements, overhead_functions, parameters, overhead_cache
+            )
+            skipped = series_exceeded[:, :, None, :] | parallel_exceeded[:, None, :, :]
+        if exceeded is not None:
+            skipped = exceeded if skipped is None else skipped | exceeded
+        return skipped
+
+    @classmethod
+    def _exceeded_partial_assignments(  # pylint: disable=too-many-arguments
+        cls,
+        cell: BatteryCell,
+        requirements: Requirements,
+        overhead_functions: list[OverheadFunctions],
+        parameters: tuple[np.ndarray, np.ndarray, np.ndarray],
+        overhead_cache: "OverheadCache | None" = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """checks the series and the parallel parameters on their own against the
+        dimension and weight requirements
+
+        The counts of the other connection are set to one. For monotone overhead
+        functions the resulting parameter set is a lower bound of all parameter sets
+        sharing the series (or parallel) parameters, cooling type and cell rotation.
+
+        :param cell: used cell for all parameter sets
+        :param requirements: requirements of the battery system
+        :param overhead_functions: overhead functions, one for each cooling type
+        :param parameters: parameters of the series connection, parameters of the
+            parallel connection and considered cell rotations
+        :param overhead_cache: cache of the overheads of each level
+        :return: whether the requirements are exceeded, indexed by cooling, series
+            parameters and rotation, and by cooling, parallel parameters and rotation
+        """
+        series, parallel, rotation = parameters
+        ones = np.ones((1, 5), dtype=np.int64)
+        exceeded = []
+        for series_part, parallel_part in ((series, ones), (ones, parallel)):
+            partial = cls.from_product(
+                cell,
+                requirements,
+                overhead_functions,
+                series_part,
+                parallel_part,
+                tuple(rotation.tolist()),
+                overhead_cache,
+            )
+            exceeded.append(
+                partial.exceeds_upper_bounds().reshape(
+                    len(overhead_functions), -1, len(rotation)
+                )
+            )
+        return exceeded[0], exceeded[1]
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def column(self, name: str) -> np.ndarray:
+        """returns the layout count of all parameter sets
+
+        :param name: name of the count as defined in LAYOUT_FIELDS
+        :return: the count of each parameter set
+        """
+        return self.counts[:, LAYOUT_FIELDS.index(name)]
+
+    def subset(self, index: np.ndarray) -> "ParameterSetArrays":
+        """returns the parameter sets selected by an index or boolean mask
+
+        :param index: integer index or boolean mask of the selected parameter sets
+        :return: the selected parameter sets
+        """
+        return ParameterSetArrays(
+            self.cell,
+            self.requirements,
+            self.overhead_functions,
+            self.counts[index],
+            self.cell_rotation[index],
+            self.cooling[index],
+            self.overhead_cache,
+        )
+
+    def parameter_set(self, i: int) -> ParameterSet:
+        """creates the ParameterSet instance of one row
+
+        :param i: row of the parameter set
+        :return: the parameter set
+        """
+        counts = self.counts[i].tolist()
+        parameter_set = ParameterSet(
+            cell=self.cell,
+            overhead=self.overhead_functions[int(self.cooling[i])],
+            requirements=self.requirements,
+            cell_block=CellBlock(*counts[0:2]),
+            module=Module(*counts[2:4]),
+            string=String(*counts[4:7]),
+            pack=Pack(*counts[7:10]),
+            cell_rotation=int(self.cell_rotation[i]),
+        )
+        return parameter_set
+
+    def layout_arrays(self, cooling: int) -> ParameterSet:
+        """returns all parameter sets as one layout to be passed to the batch
+        overhead functions
+
+        :param cooling: index of the overhead functions of the layout
+        :return: a parameter set, whose counts and cell rotation are arrays with one
+            entry per parameter set
+        """
+        column = self.column
+        return ParameterSet(
+            cell=self.cell,
+            overhead=self.overhead_functions[cooling],
+            requirements=self.requirements,
+            cell_block=CellBlock(column("cell_block_x"), column("cell_block_y")),
+            module=Module(column("module_x"), column("module_y")),
+            string=String(column("string_x"), column("string_y"), column("string_z")),
+            pack=Pack(column("pack_x"), column("pack_y"), column("pack_z")),
+            cell_rotation=self.cell_rotation,
+        )
+
+    def _overheads(
+        self, level: str, bases: dict[str, np.ndarray]
+    ) -> dict[str, np.ndarray]:
+        """evaluates overhead functions of one level for all parameter sets
+
+        With an overhead cache the overhead functions are only evaluated once for
+        each distinct cooling, cell rotation and counts of the level and the levels
+        below, as the base values are fully determined by them.
+
+        :param level: the level of the overhead functions as defined in LEVELS
+        :param bases: the base value passed to each overhead function, keyed by the
+            name of the overhead function
+        :return: the overhead of each parameter set, keyed by the name of the overhead
+            function
+        """
+        # the pack overheads depend on all counts, so there is nothing to reuse
+        if self.overhead_cache is None or level == "pack" or len(self) == 0:
+            return self._evaluate_overheads(bases)
+        # the count columns are ordered by level, the key of a level consists of the
+        # counts of the level and all levels below
+        number_of_counts = LEVEL_COUNTS[level]
+        keys = np.column_stack(
+            (self.cooling, self.cell_rotation, self.counts[:, :number_of_counts])
+        )
+        # unique rows are found faster on a single integer per row
+        dims = keys.max(axis=0) + 1
+        if np.prod(dims.astype(float)) < np.iinfo(np.int64).max:
+            _, first_index, inverse = np.unique(
+                np.ravel_multi_index(keys.T, dims),
+                return_index=True,
+                return_inverse=True,
+            )
+        else:
+            _, first_index, inverse = np.unique(
+                keys, axis=0, return_index=True, return_inverse=True
+            )
+        unique_keys = keys[first_index]
+        values = self.overhead_cache.values.setdefault(tuple(bases), {})
+        unique_keys = list(map(tuple, unique_keys.tolist()))
+        missing = [i for i, key in enumerate(unique_keys) if key not in values]
+        if missing:
+            # pylint: disable-next=protected-access
+            overheads = self.subset(first_index[missing])._evaluate_overheads(
+                {name: base[first_index[missing]] for name, base in bases.items()}
+            )
+            for i, key in enumerate(unique_keys[j] for j in missing):
+                values[key] = tuple(overheads[name][i] for name in bases)
+        self.overhead_cache.misses += len(missing)
+        self.overhead_cache.hits += len(self) - len(missing)
+        unique_overheads = np.array([values[key] for key in unique_keys]).reshape(
+            len(unique_keys), len(bases)
+        )
+        return {
+            name: unique_overheads[inverse.reshape(-1), i]
+            for i, name in enumerate(bases)
+        }
+
+    def _evaluate_overheads(
+        self, bases: dict[str, np.ndarray]
+    ) -> dict[str, np.ndarray]:
+        """evaluates overhead functions for each parameter set
+
+        :param bases: the base value passed to each overhead function, keyed by the
+            name of the overhead function
+        :return: the overhead of each parameter set, keyed by the name of the overhead
+            function
+        """
+        overheads = {name: np.empty(len(self)) for name in bases}
+        for cooling, overhead_functions in enumerate(self.overhead_functions):
+            index = np.flatnonzero(self.cooling == cooling)
+            if len(index) == 0:
+                continue
+            candidates = self if len(index) == len(self) else self.subset(index)
+            layouts = candidates.layout_arrays(cooling)
+            for name, base in bases.items():
+                overheads[name][index] = overhead_functions.overheads(
+                    name, layouts, base[index]
+                )
+        return overheads
+
+    def stack_directions(self) -> dict[str, dict[str, np.ndarray]]:
+        """stacks cell blocks, modules, strings and the pack in length, width and
+        height direction in the same way as ParameterSet.get_length/width/height
+
+        :return: for each direction the sizes and overheads of each level, the pack
+            overhead if the battery junction box is placed in this direction
+            ('pack_bjb') and otherwise ('pack_min')
+        """
+        mechanics = self.cell.mechanics
+        rotated = self.cell_rotation == 1  # 1 = 90° cell rotation
+        cell_size = {
+            "length": np.where(rotated, mechanics.width, mechanics.length),
+            "width": np.where(rotated, mechanics.length, mechanics.width),
+            "height": np.full(len(self), mechanics.height),
+        }
+        level_counts = {
+            "length": ("cell_block_y", "module_y", "string_y", "pack_y"),
+            "width": ("cell_block_x", "module_x", "string_x", "pack_x"),
+            "height": (None, None, "string_z", "pack_z"),
+        }
+        stacks = {x: {} for x in BJB_DIRECTIONS}
+        size = cell_size
+        for level_index, level in enumerate(LEVELS):
+            for direction in BJB_DIRECTIONS:
+                count = level_counts[direction][level_index]
+                if count is not None:
+                    size[direction] = size[direction] * self.column(count)
+            if level == "pack":
+                break
+            overheads = self._overheads(
+                level, {f"{level}_{x}": size[x] for x in BJB_DIRECTIONS}
+            )
+            for direction in BJB_DIRECTIONS:
+                overhead = overheads[f"{level}_{direction}"]
+                size[direction] = size[direction] + overhead
+                stacks[direction][level] = size[direction]
+                stacks[direction][f"{level}_overhead"] = overhead
+        overheads = self._overheads(
+            "pack", {f"pack_{x}": size[x] for x in BJB_DIRECTIONS}
+        )
+        for direction in BJB_DIRECTIONS:
+            stacks[direction]["pack"] = size[direction]
+            stacks[direction]["pack_bjb"] = overheads[f"pack_{direction}"]
+            minimum = getattr(self.overhead_functions[0], f"min_{direction}")
+            below_minimum = size[direction] < minimum
+            if direction == "width":
+                # ParameterSet.get_width does not fill up to the minimal width
+                stacks[direction]["pack_min"] = np.zeros(len(self))
+            else:
+                stacks[direction]["pack_min"] = np.where(
+                    below_minimum, minimum - size[direction], 0.0
+                )
+            stacks[direction]["below_minimum"] = below_minimum
+        return stacks
+
+    def stack_weight(self) -> dict[str, np.ndarray]:
+        """stacks the weight of cell blocks, modules, strings and the pack in the same
+        way as ParameterSet.get_weight
+
+        :return: the weights and overheads of each level
+        """
+        level_counts = {
+            "cell_block": ("cell_block_y", "cell_block_x"),
+            "module": ("module_y", "module_x"),
+            "string": ("string_y", "string_x", "string_z"),
+            "pack": ("pack_y", "pack_x", "pack_z"),
+        }
+        stack = {}
+        weight = np.full(len(self), self.cell.mechanics.weight)
+        for level in LEVELS:
+            for count in level_counts[level]:
+                weight = weight * self.column(count)
+            name = f"{level}_gravimetric"
+            overhead = self._overheads(level, {name: weight})[name]
+            weight = weight + overhead
+            stack[level] = weight
+            stack[f"{level}_overhead"] = overhead
+        return stack
+
+    def exceeds_upper_bounds(self) -> np.ndarray:
+        """checks whether the module voltage, length, width, height or weight of the
+        parameter sets exceed the requirements, regardless of the placement of the
+        battery junction box and the other upper bound conditions
+
+        :return: True for each parameter set that can not fulfill the requirements
+        """
+        return self.stack().exceeds_upper_bounds(self.requirements)
+
+    def module_voltage(self) -> np.ndarray:
+        """returns the maximum module voltage of all parameter sets
+
+        :return: the maximum module voltage of each parameter set
+        """
+        return (
+            self.cell.electrics.voltage.maximum
+            * self.column("module_y")
+            * self.column("module_x")
+        )
+
+    def stack(self) -> "StackedParameterSets":
+        """stacks the sizes and weights of all parameter sets, which do not depend on
+        the mechanical requirements
+
+        :return: the parameter sets with their stacked sizes and weights
+        """
+        return StackedParameterSets(
+            self, self.module_voltage(), self.stack_directions(), self.stack_weight()
+        )
+
+    def check_upper_bounds(
+        self, statistics: SearchStatistics | None = None
+    ) -> "UpperBoundChecks":
+        """checks all parameter sets for the upper bound conditions of the
+        requirements
+
+        :param statistics: counts the rejected and accepted parameter sets, if passed
+        :return: the validated parameter sets and their properties
+        """
+        module_voltage = self.module_voltage()
+        # only the parameter sets with a valid module voltage are stacked
+        index = np.flatnonzero(module_voltage < self.requirements.max_module_voltage)
+        if statistics is not None:
+            statistics.reject("module_voltage", len(self) - len(index))
+        candidates = self.subset(index)
+        return StackedParameterSets(
+            candidates, module_voltage[index], candidates.stack_directions()
+        ).check_upper_bounds(self.requirements, statistics)
+
+
+@dataclass
+class StackedParameterSets:
+    """Holds parameter sets with their stacked sizes and weights, so that they can be
+    checked against requirements that only differ in the upper bounds
+
+    :param parameter_sets: the parameter sets
+    :param module_voltage: the maximum module voltage of each parameter set
+    :param stacks: sizes and overheads of each level in each direction as returned by
+        ParameterSetArrays.stack_directions
+    :param weight_stack: weights and overheads of each level, None stacks them only
+        for the parameter sets that fit in all directions
+    """
+
+    parameter_sets: ParameterSetArrays
+    module_voltage: np.ndarray = field(repr=False)
+    stacks: dict[str, dict[str, np.ndarray]] = field(repr=False)
+    weight_stack: dict[str, np.ndarray] | None = field(default=None, repr=False)
+
+    @classmethod
+    def concatenate(
+        cls, stacked: list["StackedParameterSets"]
+    ) -> "StackedParameterSets":
+        """concatenates stacked parameter sets of the same cell and cooling type
+
+        :param stacked: the stacked parameter sets with weight stacks
+        :return: the stacked parameter sets in the passed order
+        """
+        first = stacked[0].parameter_sets
+        return cls(
+            ParameterSetArrays(
+                first.cell,
+                first.requirements,
+                first.overhead_functions,
+                np.concatenate([x.parameter_sets.counts for x in stacked]),
+                np.concatenate([x.parameter_sets.cell_rotation for x in stacked]),
+                np.concatenate([x.parameter_sets.cooling for x in stacked]),
+                first.overhead_cache,
+            ),
+            np.concatenate([x.module_voltage for x in stacked]),
+            {
+                direction: {
+                    key: np.concatenate([x.stacks[direction][key] for x in stacked])
+                    for key in stack
+                }
+                for direction, stack in stacked[0].stacks.items()
+            },
+            {
+                key: np.concatenate([x.weight_stack[key] for x in stacked])
+                for key in stacked[0].weight_stack
+            },
+        )
+
+    def __len__(self) -> int:
+        return len(self.parameter_sets)
+
+    def subset(self, index: np.ndarray) -> "StackedParameterSets":
+        """returns the stacked parameter sets selected by an index or boolean mask
+
+        :param index: integer index or boolean mask of the selected parameter sets
+        :return: the selected stacked parameter sets
+        """
+        return StackedParameterSets(
+            self.parameter_sets.subset(index),
+            self.module_voltage[index],
+            {
+                direction: {key: value[index] for key, value in stack.items()}
+                for direction, stack in self.stacks.items()
+            },
+            (
+                None
+                if self.weight_stack is None
+                else {key: value[index] for key, value in self.weight_stack.items()}
+            ),
+        )
+
+    def exceeds_upper_bounds(self, requirements: Requirements) -> np.ndarray:
+        """checks whether the module voltage, length, width, height or weight of the
+        parameter sets exceed the requirements, regardless of the placement of the
+        battery junction box and the other upper bound conditions
+
+        :param requirements: requirements of the battery system
+        :return: True for each parameter set that can not fulfill the requirements
+        """
+        exceeded = self.module_voltage >= requirements.max_module_voltage
+        for direction in BJB_DIRECTIONS:
+            stack = self.stacks[direction]
+            smallest = stack["pack"] + np.minimum(stack["pack_bjb"], stack["pack_min"])
+            exceeded |= smallest >= getattr(requirements, direction)
+        exceeded |= self.weight_stack["pack"] >= requirements.weight
+        return exceeded
+
+    def check_upper_bounds(  # pylint: disable=too-many-locals
+        self, requirements: Requirements, statistics: SearchStatistics | None = None
+    ) -> "UpperBoundChecks":
+        """checks all parameter sets for the upper bound conditions of the
+        requirements
+
+        :param requirements: requirements of the battery system
+        :param statistics: counts the rejected and accepted parameter sets, if passed
+        :return: the validated parameter sets and their properties
+        """
+        if statistics is None:
+            # the counters are discarded
+            statistics = SearchStatistics()
+        # check module voltage
+        valid = self.module_voltage < requirements.max_module_voltage
+        statistics.reject("module_voltage", len(valid) - np.count_nonzero(valid))
+        candidates = self if valid.all() else self.subset(valid)
+        stacks = candidates.stacks
+        # first it is tried to place the bjb in length direction, then in width
+        # direction and last in height direction
+        valid = np.ones(len(candidates), dtype=bool)
+        bjb_direction = np.full(len(candidates), -1)
+        for i, direction in enumerate(BJB_DIRECTIONS):
+            stack = stacks[direction]
+            limit = getattr(requirements, direction)
+            place_bjb = (bjb_direction < 0) & (
+                stack["pack"] + stack["pack_bjb"] < limit
+            )
+            fits = place_bjb | (stack["pack"] + stack["pack_min"] < limit)
+            statistics.reject(direction, np.count_nonzero(valid & ~fits))
+            valid &= fits
+            bjb_direction[place_bjb] = i
+        missing_bjb = valid & (bjb_direction < 0)
+        statistics.reject("battery_junction_box", np.count_nonzero(missing_bjb))
+        if missing_bjb.any():
+            logging.warning(
+                "Overhead Functions: Battery junction box not consider in any "
+                "direction for %s parameter sets",
+                np.count_nonzero(missing_bjb),
+            )
+        valid &= bjb_direction >= 0
+        candidates = candidates.subset(valid)
+        bjb_direction = bjb_direction[valid]
+        # check weight
+        weight_stack = candidates.weight_stack
+        if weight_stack is None:
+            weight_stack = candidates.parameter_sets.stack_weight()
+        valid = weight_stack["pack"] < requirements.weight
+        statistics.reject("weight", len(valid) - np.count_nonzero(valid))
+        # check slave requirement
+        column = candidates.parameter_sets.column
+        number_of_cell_blocks = column("module_x") * column("module_y")
+        number_of_slaves = np.ceil(number_of_cell_blocks / requirements.slave_max)
+        slave_min = np.floor(number_of_cell_blocks / number_of_slaves)
+        slave_max = np.ceil(number_of_cell_blocks / number_of_slaves)
+        fits = (slave_min >= requirements.slave_min) & (
+            slave_max <= requirements.slave_max
+        )
+        statistics.reject("slave_utilization", np.count_nonzero(valid & ~fits))
+        valid &= fits
+        statistics.accepted += int(np.count_nonzero(valid))
+        return UpperBoundChecks.from_stacks(
+            candidates.parameter_sets.subset(valid),
+            candidates.module_voltage[valid],
+            {
+                direction: {key: value[valid] for key, value in stack.items()}
+                for direction, stack in candidates.stacks.items()
+            },
+            {key: value[valid] for key, value in weight_stack.items()},
+            bjb_direction[valid],
+            np.stack(
+                [slave_min[valid], slave_max[valid], number_of_slaves[valid]], axis=1
+            ),
+        )
+
+
+@dataclass
+class UpperBoundChecks:  # pylint: disable=too-many-instance-attributes
+    """Holds the parameter sets fulfilling the upper bound conditions and their
+    properties as arrays
+
+    :param parameter_sets: the validated parameter sets
+    :param module_voltage: the maximum module voltage of each parameter set
+    :param dimensions: height, length, width and weight of each parameter set
+    :param overhead: for height, length, width and weight the absolute overhead of
+        each level with the columns defined by LEVELS
+    :param overhead_percentage: the overhead relative to the size of each level
+    :param without_overhead: height, length, width and weight without overhead
+    :param bjb_direction: index of the direction in BJB_DIRECTIONS, in which the
+        battery junction box is placed
+    :param pack_minimum_applied: for each direction whether the pack was filled up to
+        the minimal size of the overhead functions
+    :param slave_utilization: minimal and maximal workload and number of slaves
+    """
+
+    parameter_sets: ParameterSetArrays
+    module_voltage: np.ndarray
+    dimensions: dict[str, np.ndarray]
+    overhead: dict[str, np.ndarray]
+    overhead_percentage: dict[str, np.ndarray]
+    without_overhead: dict[str, np.ndarray]
+    bjb_direction: np.ndarray
+    pack_minimum_applied: dict[str, np.ndarray]
+    slave_utilization: np.ndarray
+
+    @classmethod
+    def from_stacks(  # pylint: disable=too-many-arguments, too-many-locals
+        cls,
+        parameter_sets: ParameterSetArrays,
+        module_voltage: np.ndarray,
+        stacks: dict[str, dict[str, np.ndarray]],
+        weight_stack: dict[str, np.ndarray],
+        bjb_direction: np.ndarray,
+        slave_utilization: np.ndarray,
+    ) -> "UpperBoundChecks":
+        """derives the system properties from the stacked levels
+
+        :param parameter_sets: the validated parameter sets
+        :param module_voltage: the maximum module voltage of each parameter set
+        :param stacks: sizes and overheads of each level in each direction
+        :param weight_stack: weights and overheads of each level
+        :param bjb_direction: direction of the battery junction box
+        :param slave_utilization: minimal and maximal workload and number of slaves
+        :return: the validated parameter sets and their properties
+        """
+        dimensions, overhead, overhead_percentage = {}, {}, {}
+        for i, direction in enumerate(BJB_DIRECTIONS):
+            stack = stacks[direction]
+            pack_overhead = np.where(
+                bjb_direction == i, stack["pack_bjb"], stack["pack_min"]
+            )
+            sizes = [stack[x] for x in LEVELS[:-1]] + [stack["pack"] + pack_overhead]
+            overheads = [stack[f"{x}_overhead"] for x in LEVELS[:-1]] + [pack_overhead]
+            dimensions[direction] = sizes[-1]
+            overhead[direction] = np.stack(overheads, axis=1)
+            overhead_percentage[direction] = np.round(
+                100 * overhead[direction] / np.stack(sizes, axis=1)
+            )
+        dimensions["weight"] = weight_stack["pack"]
+        overhead["weight"] = np.stack(
+            [weight_stack[f"{x}_overhead"] for x in LEVELS], axis=1
+        )
+        overhead_percentage["weight"] = np.round(
+            100 * overhead["weight"] / np.stack([weight_stack[x] for x in LEVELS], 1)
+        )
+        mechanics = parameter_sets.cell.mechanics
+        column = parameter_sets.column
+        without_overhead = {
+            "height": mechanics.height * column("string_z") * column("pack_z"),
+            "length": mechanics.length
+            * column("pack_y")
+            * column("string_y")
+            * column("module_y")
+            * column("cell_block_y"),
+            "width": mechanics.width
+            * column("pack_x")
+            * column("string_x")
+            * column("module_x")
+            * column("cell_block_x"),
+            "weight": mechanics.weight
+            * column("pack_x")
+            * column("pack_y")
+            * column("pack_z")
+            * column("string_x")
+            * column("string_y")
+            * column("string_z")
+            * column("module_x")
+            * column("module_y")
+            * column("cell_block_x")
+            * column("cell_block_y"),
+        }
+        return cls(
+            parameter_sets,
+            module_voltage,
+            dimensions,
+            overhead,
+            overhead_percentage,
+            without_overhead,
+            bjb_direction,
+            {x: stacks[x]["below_minimum"] for x in BJB_DIRECTIONS},
+            slave_utilization,
+        )
+
+    def __len__(self) -> int:
+        return len(self.parameter_sets)
+
+    @property
+    def volume(self) -> np.ndarray:
+        """the volume of each validated parameter set"""
+        return (
+            self.dimensions["height"]
+            * self.dimensions["length"]
+            * self.dimensions["width"]
+        )
+
+    def _overhead(self, dimension: str, i: int) -> Overhead:
+        """creates the Overhead instance of one row in one dimension"""
+        values = list(
+            zip(self.overhead[dimension][i], self.overhead_percentage[dimension][i])
+        )
+        if (
+            dimension in BJB_DIRECTIONS
+            and self.bjb_direction[i] != BJB_DIRECTIONS.index(dimension)
+            and not self.pack_minimum_applied[dimension][i]
+        ):
+            # ParameterSet.get_* set the pack overhead to the integer 0 in this case
+            values[-1] = (0, values[-1][1])
+        return Overhead(*values)
+
+    def mechanical_properties(self, i: int) -> MechanicalProperties:
+        """creates the MechanicalProperties instance of one row
+
+        :param i: row of the validated parameter set
+        :return: the mechanical properties of the parameter set
+        """
+        dimensions = ("height", "length", "width", "weight")
+        return MechanicalProperties(
+            *(self.dimensions[x][i] for x in dimensions),
+            *(self._overhead(x, i) for x in dimensions),
+            *(self.without_overhead[x][i] for x in dimensions),
+        )
+
+    def slave_utilization_of(self, i: int) -> SlaveUtilization:
+        """creates the SlaveUtilization instance of one row
+
+        :param i: row of the validated parameter set
+        :return: the slave utilization of the parameter set
+        """
+        slave_min, slave_max, number_of_slaves = self.slave_utilization[i]
+        return SlaveUtilization(slave_min, slave_max, int(number_of_slaves))
+
+    def system_design(
+        self, i: int, electrical_configuration: ElectricalConfiguration
+    ) -> SystemDesign:
+        """creates the SystemDesign instance of one row
+
+        :param i: row of the validated parameter set
+        :param electrical_configuration: the electrical configuration of the cell
+        :return: the system design of the parameter set
+        """
+        parameter_set = self.parameter_sets.parameter_set(i)
+        electrical_property = ElectricalProperties(
+            parameter_set,
+            electrical_configuration,
+            max_module_voltage=self.module_voltage[i],
+            workload=self.slave_utilization_of(i),
+        )
+        return SystemDesign(
+            parameter_set, self.mechanical_properties(i), electrical_property
+        )
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2010 - 2024, Fraunhofer-Gesellschaft zur Foerderung der angewandten Forschung e.V.
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""pareto_system_designs provides the ParetoSystemDesigns class which keeps only the
+non-dominated system designs while they are found
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Any
+
+import numpy as np
+
+
+def pareto_front(values: np.ndarray) -> np.ndarray:
+    """determines the rows that are not dominated by any other row, i.e., no other
+    row is less or equal in all objectives and less in at least one objective
+
+    The rows are sorted lexicographically and swept once (skyline algorithm), so
+    that the runtime is O(N log N) for two and three objectives. Rows with equal
+    objective values do not dominate each other.
+
+    :param values: objective values with one row per system design and two or three
+        columns
+    :return: indices of the non-dominated rows, sorted lexicographically by their
+        objective values and rows with equal values in the order of the index
+    """
+    if values.ndim != 2 or values.shape[1] not in (2, 3):
+        raise ValueError("Pareto fronts are determined for two or three objectives.")
+    if len(values) == 0:
+        return np.zeros(0, dtype=np.int64)
+    # np.lexsort uses the last key as primary key and is stable
+    order = np.lexsort(values.T[::-1])
+    ordered = values[order]
+    # rows with equal objective values share the result of the first of them
+    first = np.ones(len(ordered), dtype=bool)
+    first[1:] = np.any(ordered[1:] != ordered[:-1], axis=1)
+    group = np.cumsum(first) - 1
+    starts = np.flatnonzero(first)
+    if values.shape[1] == 2:
+        # a row is dominated by a previous row, if the smallest second objective of
+        # all previous rows is less or equal, as the previous rows differ
+        weight = ordered[starts, 1]
+        previous_minimum = np.minimum.accumulate(np.concatenate(([np.inf], weight)))
+        non_dominated = weight < previous_minimum[:-1]
+    else:
+        non_dominated = _non_dominated_3d(ordered[starts])
+    return order[non_dominated[group]]
+
+
+def _non_dominated_3d(values: np.ndarray) -> np.ndarray:
+    """sweeps distinct rows sorted lexicographically by three objectives
+
+    The non-dominated rows of the second and third objective seen so far are kept as
+    a staircase with ascending second and descending third objective.
+
+    :param values: distinct objective values sorted lexicographically
+    :return: mask of the non-dominated rows
+    """
+    non_dominated = np.zeros(len(values), dtype=bool)
+    stair_x: list[float] = []
+    stair_y: list[float] = []
+    for i, (_, x, y) in enumerate(values.tolist()):
+        # the smallest third objective of all rows with a less or equal second one
+        j = bisect_right(stair_x, x)
+        if j > 0 and stair_y[j - 1] <= y:
+            continue
+        non_dominated[i] = True
+        start = bisect_left(stair_x, x)
+        stop = start
+        while stop < len(stair_x) and stair_y[stop] >= y:
+            stop += 1
+        stair_x[start:stop] = [x]
+        stair_y[start:stop] = [y]
+    return non_dominated
+
+
+class ParetoSystemDesigns:
+    """ParetoSystemDesigns collects the system designs which are not dominated by any
+    other added system design. The candidates of each batch are compared to the
+    kept system designs, so that only the current front is held in memory.
+    """
+
+    def __init__(self) -> None:
+        self._values: np.ndarray | None = None
+        self._system_designs: list[Any] = []
+
+    def __len__(self) -> int:
+        return len(self._system_designs)
+
+    def candidates(self, values: np.ndarray) -> np.ndarray:
+        """selects the indices of the values that are not dominated by the kept
+        system designs or the other values, and removes the kept system designs that
+        are dominated by the values
+
+        :param values: objective values of system designs with one row per design
+        :return: indices of the non-dominated values in ascending order
+        """
+        if self._values is None:
+            self._values = np.zeros((0, values.shape[1]))
+        number_kept = len(self._values)
+        front = pareto_front(np.concatenate((self._values, values)))
+        kept = np.sort(front[front < number_kept])
+        self._values = self._values[kept]
+        self._system_designs = [self._system_designs[i] for i in kept.tolist()]
+        return np.sort(front[front >= number_kept]) - number_kept
+
+    def add(self, values: np.ndarray, system_design: Any) -> None:
+        """adds a system design selected by the candidates method
+
+        :param values: objective values of the system design
+        :param system_design: the system design
+        """
+        self._values = np.concatenate((self._values, values[np.newaxis]))
+        self._system_designs.append(system_design)
+
+    def sorted(self) -> list:
+        """returns the kept system designs
+
+        :return: the system designs sorted lexicographically by their objective
+            values and in the order they have been added for equal values
+        """
+        if self._values is None:
+            return []
+        order = np.lexsort(self._values.T[::-1])
+        return [self._system_designs[i] for i in order.tolist()]
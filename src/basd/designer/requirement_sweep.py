@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2010 - 2024, Fraunhofer-Gesellschaft zur Foerderung der angewandten Forschung e.V.
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""requirement_sweep provides the RequirementSweep class which designs the battery
+systems for a range of values of one requirement
+"""
+
+import json
+import logging
+import multiprocessing
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from joblib import effective_n_jobs
+
+from ..database import CellDatabase  # pylint: disable=duplicate-code
+from ..database.battery_cell import BatteryCell
+from ..requirements import Requirements
+from . import DEFAULT_CHUNK_SIZE, BatterySystemDesigns
+from .basic_sets import ElectricalConfiguration
+from .count_caps import CountCaps
+from .direction_checks import DirectionChecks
+from .overhead_functions import OverheadFunctions
+from .parameter_set_arrays import (
+    OverheadCache,
+    ParameterSetArrays,
+    StackedParameterSets,
+)
+from .shared_precomputation import (
+    ELECTRICAL_REQUIREMENT_FIELDS,
+    SharedPrecomputation,
+    requirement_fields,
+)
+from .work_units import (  # pylint: disable=duplicate-code
+    CELL_ROTATION,
+    CellParameters,
+    SystemDesignRecords,
+    WorkUnit,
+    WorkUnitChecker,
+)
+
+#: requirements that only bound the size, weight or module voltage of the battery
+#: system, so that a sweep re-filters the stacked parameter sets
+UPPER_BOUND_FIELDS = ("length", "width", "height", "weight", "max_module_voltage")
+#: requirements that can be swept
+SWEEP_FIELDS = UPPER_BOUND_FIELDS + ELECTRICAL_REQUIREMENT_FIELDS
+
+
+@dataclass
+class SweepSpecification:
+    """Defines the values of a swept requirement
+
+    :param name: name of the requirement attribute, e.g., energy or length
+    :param values: values of the requirement in the order they are designed
+    """
+
+    name: str
+    values: list[float]
+
+    def __post_init__(self) -> None:
+        if self.name not in SWEEP_FIELDS:
+            raise ValueError(
+                f"Requirement '{self.name}' can not be swept, use one of "
+                f"{', '.join(SWEEP_FIELDS)}."
+            )
+        if not self.values:
+            raise ValueError(f"No values of requirement '{self.name}' to sweep.")
+
+    @classmethod
+    def parse(cls, specification: str) -> "SweepSpecification":
+        """parses a specification NAME=START:STOP:STEP, whose values range from START
+        to STOP, or NAME=VALUE,VALUE,... with explicit values
+
+        :param specification: the specification, e.g., energy=40000:120000:10000
+        :raises ValueError: the specification can not be parsed
+        :return: the sweep specification
+        """
+        name, separator, values = specification.partition("=")
+        if not separator or values.count(":") not in (0, 2):
+            raise ValueError(
+                f"Sweep '{specification}' is not of the form NAME=START:STOP:STEP."
+            )
+        if ":" not in values:
+            return cls(name.strip(), [float(x) for x in values.split(",")])
+        start, stop, step = (float(x) for x in values.split(":"))
+        if step <= 0 or stop < start:
+            raise ValueError(
+                f"Sweep '{specification}' needs a positive step and a stop value not "
+                "below the start value."
+            )
+        # the stop value is included, if it is reached by the steps
+        number_of_values = int((stop - start) / step + 1e-9) + 1
+        return cls(
+            name.strip(),
+            [round(start + i * step, 12) for i in range(number_of_values)],
+        )
+
+    def requirements(self, requirements: Requirements) -> list[Requirements]:
+        """returns the requirements of all values of the sweep
+
+        :param requirements: the requirements of the battery system
+        :return: the requirements with the swept values in the order of the values
+        """
+        return [requirements.replaced(self.name, x) for x in self.values]
+
+
+def stack_parameter_sets(  # pylint: disable=too-many-arguments
+    cell: BatteryCell,
+    requirements: Requirements,
+    overhead_functions: OverheadFunctions,
+    parameters_series,
+    parameters_parallel,
+    chunk_size: int,
+    overhead_table: dict | None = None,
+) -> StackedParameterSets | None:
+    """stacks the parameter sets of a cell and cooling type, which do not exceed the
+    limits of the requirements regardless of the placement of the battery junction
+    box
+
+    :param cell: the cell used in the system designs
+    :param requirements: the loosest requirements of the sweep
+    :param overhead_functions: the overhead functions of the cooling type
+    :param parameters_series: parameters of the series connection
+    :param parameters_parallel: parameters of the parallel connection
+    :param chunk_size: number of parameter sets that are stacked at once
+    :param overhead_table: cached overheads of each level as stored in an
+        OverheadCache, None evaluates the overhead functions for each parameter set
+    :return: the stacked parameter sets in the order of the product, None if no
+        parameter set may fulfill the requirements
+    """
+    overhead_cache = None
+    if overhead_table is not None and getattr(
+        overhead_functions, "cache_overheads", False
+    ):
+        overhead_cache = OverheadCache(overhead_table)
+    # the dimensions of separable overhead functions are checked per direction
+    exceeded = None
+    if getattr(overhead_functions, "separable", False) and len(parameters_series):
+        exceeded = DirectionChecks.from_parameters(
+            cell,
+            requirements,
+            [overhead_functions],
+            (parameters_series, parameters_parallel, np.asarray(CELL_ROTATION)),
+            overhead_cache,
+        ).join()
+    stacked = []
+    for parameter_sets in ParameterSetArrays.iter_product(
+        cell,
+        requirements,
+        [overhead_functions],
+        parameters_series,
+        parameters_parallel,
+        CELL_ROTATION,
+        chunk_size=chunk_size,
+        prune=getattr(overhead_functions, "monotone", False),
+        overhead_cache=overhead_cache,
+        exceeded=exceeded,
+    ):
+        chunk = parameter_sets.stack()
+        stacked.append(chunk.subset(~chunk.exceeds_upper_bounds(requirements)))
+    stacked = [x for x in stacked if len(x)]
+    if not stacked:
+        return None
+    result = StackedParameterSets.concatenate(stacked)
+    # the weights are stacked, so that the overheads are not needed anymore
+    result.parameter_sets.overhead_cache = None
+    return result
+
+
+class RequirementSweep:
+    """RequirementSweep designs the battery systems for each value of a swept
+    requirement
+
+    The parameter sets of a cell and cooling type are stacked once for all values,
+    that share the electrical configuration of the cell and the requirements the
+    overhead functions depend on. Sweeping a length, width, height, weight or module
+    voltage stacks the parameter sets for the loosest value and re-filters them for
+    each value. Sweeping an electrical requirement stacks them again only for the
+    cells whose electrical configuration changes.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        requirements: Requirements,
+        cell_database: CellDatabase,
+        specification: SweepSpecification,
+        max_number_of_solutions: int,
+        overhead_plugin: str,
+        cores: int,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        shared: SharedPrecomputation | None = None,
+    ) -> None:
+        """The constructor of the RequirementSweep
+
+        :param requirements: the requirements of the battery system
+        :param cell_database: database with the cell information
+        :param specification: the swept requirement and its values
+        :param max_number_of_solutions: the maximal number of solutions of each value
+        :param overhead_plugin: the plugin with the overhead functions
+        :param cores: number of cpu cores used for the calculations
+        :param chunk_size: number of parameter sets of a cell that are stacked at once
+        :param shared: intermediate results shared with the designs of other
+            requirements, e.g., in a batch run
+        """
+        self.specification = specification
+        self.cores = cores
+        self.chunk_size = chunk_size
+        self.shared = shared or SharedPrecomputation()
+        #: requirements with the loosest value of a swept upper bound
+        self.envelope = None
+        if specification.name in UPPER_BOUND_FIELDS:
+            self.envelope = requirements.replaced(
+                specification.name, max(specification.values)
+            )
+        #: stacked parameter sets keyed by the cell, the cooling type, the electrical
+        #: configuration and the requirements of the overhead functions
+        self.stacked_parameter_sets: dict[tuple, StackedParameterSets | None] = {}
+        self.designs = [
+            SweptSystemDesigns(
+                self,
+                x,
+                cell_database,
+                max_number_of_solutions,
+                overhead_plugin,
+                cores=cores,
+                chunk_size=chunk_size,
+            )
+            for x in specification.requirements(requirements)
+        ]
+
+    def stack(
+        self, designs: BatterySystemDesigns, cell_parameters: list[CellParameters]
+    ) -> list[list[StackedParameterSets | None]]:
+        """returns the stacked parameter sets of the considered cells, which are
+        stacked only if no other value of the sweep has stacked them
+
+        :param designs: the designs of one value of the sweep
+        :param cell_parameters: the parameters of the considered cells
+        :return: the stacked parameter sets of each cell and cooling type
+        """
+        keys, tasks = [], {}
+        for parameters in cell_parameters:
+            keys.append([])
+            for overhead_functions in designs.overhead_functions:
+                requirements = designs.requirements
+                if self.envelope is not None and self.specification.name not in (
+                    requirement_fields(overhead_functions)
+                ):
+                    requirements = self.envelope
+                key = self.shared.overhead_key(
+                    parameters.cell, requirements, overhead_functions
+                ) + (
+                    parameters.electrical_configuration.cells_in_series,
+                    parameters.electrical_configuration.cells_in_parallel,
+                )
+                keys[-1].append(key)
+                if key not in self.stacked_parameter_sets and key not in tasks:
+                    tasks[key] = (
+                        parameters.cell,
+                        requirements,
+                        overhead_functions,
+                        parameters.parameters_series,
+                        parameters.parameters_parallel,
+                        self.chunk_size,
+                        self.shared.overhead_table(
+                            parameters.cell, requirements, overhead_functions
+                        ),
+                    )
+        logging.debug(
+            "Stack the parameter sets of %s cells and cooling types, reuse %s",
+            len(tasks),
+            sum(len(x) for x in keys) - len(tasks),
+        )
+        processes = min(effective_n_jobs(self.cores), len(tasks))
+        if processes > 1:
+            with multiprocessing.Pool(processes) as pool:
+                stacked = pool.starmap(stack_parameter_sets, tasks.values())
+        else:
+            stacked = [stack_parameter_sets(*x) for x in tasks.values()]
+        self.stacked_parameter_sets.update(zip(tasks, stacked))
+        return [[self.stacked_parameter_sets[x] for x in y] for y in keys]
+
+    def create_report(self, report_file_name: Path) -> None:
+        """creates a csv and a json file with the best system designs of all values of
+        the sweep as one table, whose first columns are the swept value and the rank
+        of the system design
+
+        :param report_file_name: path of the report without suffix
+        """
+        frames = []
+        for value, designs in zip(self.specification.values, self.designs):
+            if not designs.system_designs:
+                logging.warning(
+                    "No fitting system found for %s %s", self.specification.name, value
+                )
+                continue
+            df = designs.report_data_frame()
+            df.insert(0, "Rank", df.index)
+            df.insert(0, self.specification.name, value)
+            frames.append(df)
+        if not frames:
+            sys.exit("No fitting system found. Please check requirements and settings.")
+        df = pd.concat(frames, ignore_index=True)
+        df.to_csv(
+            Path(f"{report_file_name}.csv"), sep=",", float_format="%.2f", index=False
+        )
+        with open(Path(f"{report_file_name}.json"), mode="w", encoding="utf-8") as f:
+            json.dump(df.to_dict("records"), f, indent=4, ensure_ascii=False)
+
+
+class SweptSystemDesigns(BatterySystemDesigns):
+    """SweptSystemDesigns determines the battery system designs of one value of a
+    requirement sweep by re-filtering the stacked parameter sets of the sweep"""
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        sweep: RequirementSweep,
+        requirements: Requirements,
+        cell_database: CellDatabase,
+        max_number_of_solutions: int,
+        overhead_plugin: str,
+        cores: int,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        """The constructor of the SweptSystemDesigns
+
+        :param sweep: the sweep holding the stacked parameter sets
+        :param requirements: the requirements of the value of the sweep
+        :param cell_database: database with the cell information
+        :param max_number_of_solutions: the maximal number of solutions
+        :param overhead_plugin: the plugin with the overhead functions
+        :param cores: number of cpu cores used for the calculations
+        :param chunk_size: number of parameter sets of a cell that are stacked at once
+        """
+        self.sweep = sweep
+        super().__init__(
+            requirements,
+            cell_database,
+            max_number_of_solutions,
+            overhead_plugin,
+            cores=cores,
+            chunk_size=chunk_size,
+            shared=sweep.shared,
+        )
+
+    def _count_caps(
+        self, cell: BatteryCell, electrical_configuration: ElectricalConfiguration
+    ) -> CountCaps:
+        """derives the caps of the counts of a cell from the loosest value of a swept
+        upper bound, as the stacked parameter sets are shared by all values
+
+        :param cell: the considered cell
+        :param electrical_configuration: the electrical configuration of the cell
+        :return: the caps of the series and parallel connection
+        """
+        return CountCaps.from_requirements(
+            cell,
+            self.sweep.envelope or self.requirements,
+            electrical_configuration,
+            self.overhead_functions,
+        )
+
+    def _precomputed_records(
+        self, cell_parameters: list[CellParameters], max_number: int
+    ) -> list[SystemDesignRecords | None]:
+        """checks the stacked parameter sets of the sweep for the requirements, so
+        that no parameter set is checked in work units
+
+        :param cell_parameters: the parameters of the considered cells
+        :param max_number: number of requested parameter sets per cell
+        :return: the best parameter sets of each cell
+        """
+        checker = WorkUnitChecker(
+            self.requirements,
+            self.overhead_functions,
+            cell_parameters,
+            max_number,
+            self.chunk_size,
+        )
+        records_per_cell = []
+        for cell_index, stacked_per_cooling in enumerate(
+            self.sweep.stack(self, cell_parameters)
+        ):
+            results = []
+            for cooling_index, stacked in enumerate(stacked_per_cooling):
+                best = checker.best_system_designs()
+                if stacked is not None:
+                    checker.keep(best, stacked.check_upper_bounds(self.requirements))
+                work_unit = WorkUnit(
+                    cell_index,
+                    cooling_index,
+                    0,
+                    len(cell_parameters[cell_index].parameters_series),
+                )
+                results.append(checker.records(work_unit, best, True))
+            records_per_cell.append(
+                self._merge_work_units(cell_index, results, max_number)
+            )
+        return records_per_cell
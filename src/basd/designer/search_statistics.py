@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2010 - 2024, Fraunhofer-Gesellschaft zur Foerderung der angewandten Forschung e.V.
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""search_statistics provides the classes that record the wall time of the stages of
+a design run and count the checked parameter sets by their outcome
+"""
+
+import json
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+#: upper bound conditions in the order they are checked, a rejected parameter set
+#: is counted for the first condition it violates
+REJECTION_REASONS = (
+    "module_voltage",
+    "length",
+    "width",
+    "height",
+    "battery_junction_box",
+    "weight",
+    "slave_utilization",
+)
+
+
+@dataclass
+class SearchStatistics:
+    """Counts the parameter sets of one or several work units by their outcome
+
+    The candidates are the parameter sets of the work units, each of them is either
+    pruned, unchecked, rejected or accepted.
+
+    :param seconds: wall time of the checks in the worker processes
+    :param candidates: number of parameter sets of the work units
+    :param pruned: parameter sets that were skipped, as their series or parallel
+        parameters alone or their counts in one direction exceed the requirements
+    :param unchecked: parameter sets that were not checked within the time or
+        candidate budget, including the pruned ones of the interrupted work units
+    :param rejected: parameter sets violating an upper bound condition by the first
+        violated condition in REJECTION_REASONS
+    :param accepted: parameter sets fulfilling all upper bound conditions
+    """
+
+    seconds: float = 0.0
+    candidates: int = 0
+    pruned: int = 0
+    unchecked: int = 0
+    rejected: dict[str, int] = field(
+        default_factory=lambda: dict.fromkeys(REJECTION_REASONS, 0)
+    )
+    accepted: int = 0
+
+    def reject(self, reason: str, number: int) -> None:
+        """counts rejected parameter sets
+
+        :param reason: the violated condition in REJECTION_REASONS
+        :param number: number of rejected parameter sets
+        """
+        self.rejected[reason] += int(number)
+
+    def add(self, other: "SearchStatistics") -> None:
+        """adds the counters of other work units
+
+        :param other: the statistics of the other work units
+        """
+        self.seconds += other.seconds
+        self.candidates += other.candidates
+        self.pruned += other.pruned
+        self.unchecked += other.unchecked
+        for reason, number in other.rejected.items():
+            self.reject(reason, number)
+        self.accepted += other.accepted
+
+
+@dataclass
+class DesignStatistics:
+    """Records the wall time of the stages of a design run and the search statistics
+    of each cell
+
+    :param stages: wall time in seconds of each stage in the order of the stages
+    :param cells: the search statistics of each checked cell by its identifier
+    """
+
+    stages: dict[str, float] = field(default_factory=dict)
+    cells: dict[str, SearchStatistics] = field(default_factory=dict)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """measures the wall time of a stage, which is added up if the stage is
+        entered several times
+
+        :param name: name of the stage
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def add(self, cell: str, statistics: SearchStatistics) -> None:
+        """adds the search statistics of work units of a cell
+
+        :param cell: identifier of the cell
+        :param statistics: the search statistics of the work units
+        """
+        self.cells.setdefault(cell, SearchStatistics()).add(statistics)
+
+    def total(self) -> SearchStatistics:
+        """returns the search statistics of all cells
+
+        :return: the sum of the search statistics of all cells
+        """
+        total = SearchStatistics()
+        for statistics in self.cells.values():
+            total.add(statistics)
+        return total
+
+    def to_dict(self) -> dict:
+        """returns the statistics as a dictionary that can be serialized to json
+
+        :return: the wall time of the stages, the total and the per cell search
+            statistics
+        """
+        return {
+            "stages": dict(self.stages),
+            "total": asdict(self.total()),
+            "cells": {cell: asdict(x) for cell, x in self.cells.items()},
+        }
+
+    def write(self, file_name: Path) -> None:
+        """writes the statistics to a json file
+
+        :param file_name: the json file
+        """
+        with open(file_name, mode="w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=4)
+
+    def log_summary(self) -> None:
+        """logs the wall time of the stages and the total search statistics"""
+        logging.info(
+            "Wall time of the stages: %s",
+            ", ".join(f"{name} {x:.3f} s" for name, x in self.stages.items()),
+        )
+        total = self.total()
+        logging.info(
+            "Checked %s cells in %.3f s (summed over the worker processes): "
+            "%s candidates, %s pruned, %s unchecked, %s accepted, rejected by %s",
+            len(self.cells),
+            total.seconds,
+            total.candidates,
+            total.pruned,
+            total.unchecked,
+            total.accepted,
+            ", ".join(f"{reason} {x}" for reason, x in total.rejected.items()),
+        )
@@ -0,0 +1,478 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2010 - 2024, Fraunhofer-Gesellschaft zur Foerderung der angewandten Forschung e.V.
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""search_strategies provides the AbcSearchStrategy class which searches the
+validated parameter sets of one cell and cooling type, and the built-in strategies
+that check all, the not pruned or a sample of the parameter sets
+"""
+
+import logging
+import math
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+
+import numpy as np
+
+from ..database.battery_cell import BatteryCell
+from ..requirements import Requirements
+from ..utils import load_plugin_class
+from .basic_sets import ElectricalConfiguration
+from .best_system_designs import BestSystemDesigns
+from .direction_checks import DirectionChecks
+from .overhead_functions import OverheadFunctions
+from .parameter_set_arrays import (  # pylint: disable=duplicate-code
+    LAYOUT_FIELDS,
+    PARALLEL_COLUMNS,
+    SERIES_COLUMNS,
+    OverheadCache,
+    ParameterSetArrays,
+    UpperBoundChecks,
+)
+from .pareto_system_designs import ParetoSystemDesigns
+from .search_statistics import SearchStatistics
+
+
+class AbcSearchStrategy(ABC):
+    """AbcSearchStrategy searches the parameter sets of one cell and cooling type and
+    yields the ones fulfilling the upper bound conditions of the requirements. The
+    designer keeps the best of them, so that a strategy only decides which parameter
+    sets are checked.
+
+    :param cell: the cell used in the system designs
+    :param electrical_configuration: the electrical configuration of the cell
+    :param parameters: parameters of the series and parallel connection and the
+        considered cell rotations
+    :param overhead_functions: the overhead functions of the cooling type
+    :param requirements: the requirements of the battery system
+    :param chunk_size: number of parameter sets that are checked at once
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        cell: BatteryCell,
+        electrical_configuration: ElectricalConfiguration,
+        parameters: tuple[np.ndarray, np.ndarray, np.ndarray],
+        overhead_functions: OverheadFunctions,
+        requirements: Requirements,
+        chunk_size: int,
+    ) -> None:
+        self.cell = cell
+        self.electrical_configuration = electrical_configuration
+        self.parameters = parameters
+        self.overhead_functions = overhead_functions
+        self.requirements = requirements
+        self.chunk_size = chunk_size
+
+    @abstractmethod
+    def search(
+        self,
+        series: slice,
+        best: BestSystemDesigns | ParetoSystemDesigns,
+        statistics: SearchStatistics,
+        overhead_cache: OverheadCache | None = None,
+    ) -> Iterator[UpperBoundChecks]:
+        """yields the validated parameter sets of a part of the series parameters with
+        all parallel parameters and cell rotations
+
+        :param series: the searched series parameters
+        :param best: the best validated parameter sets kept so far, which include the
+            previously yielded ones
+        :param statistics: counts the rejected and accepted parameter sets, all
+            checked parameter sets have to be counted. The parameter sets that are
+            neither checked nor known to exceed the requirements have to be counted
+            as unchecked, the system designs are then reported as not exhaustive and
+            are not stored in the design cache.
+        :param overhead_cache: cache of the overheads of each level
+        :return: the validated parameter sets
+        """
+
+    def product(
+        self, series: slice, overhead_cache: OverheadCache | None = None, **kwargs
+    ) -> Iterator[ParameterSetArrays]:
+        """yields the cartesian product of a part of the series parameters with all
+        parallel parameters and cell rotations in chunks
+
+        :param series: the series parameters of the product
+        :param overhead_cache: cache of the overheads of each level
+        :param kwargs: options of ParameterSetArrays.iter_product, e.g., prune
+        :return: the parameter sets in chunks
+        """
+        parameters_series, parameters_parallel, cell_rotation = self.parameters
+        return ParameterSetArrays.iter_product(
+            self.cell,
+            self.requirements,
+            [self.overhead_functions],
+            parameters_series[series],
+            parameters_parallel,
+            tuple(cell_rotation.tolist()),
+            chunk_size=self.chunk_size,
+            overhead_cache=overhead_cache,
+            **kwargs,
+        )
+
+    @staticmethod
+    def check(
+        parameter_sets: ParameterSetArrays, statistics: SearchStatistics | None = None
+    ) -> UpperBoundChecks:
+        """checks the parameter sets for upper bound conditions
+
+        :param parameter_sets: the parameter sets fulfilling the lower bound condition
+            from the electrical configuration
+        :param statistics: counts the rejected and accepted parameter sets, if passed
+        :return: the validated parameter sets and their properties
+        """
+        logging.debug("Check %s parameter sets", len(parameter_sets))
+        checks = parameter_sets.check_upper_bounds(statistics)
+        logging.debug("%s parameter sets fulfill the upper bounds", len(checks))
+        return checks
+
+
+class ExhaustiveSearch(AbcSearchStrategy):
+    """ExhaustiveSearch checks every parameter set"""
+
+    def search(
+        self,
+        series: slice,
+        best: BestSystemDesigns | ParetoSystemDesigns,
+        statistics: SearchStatistics,
+        overhead_cache: OverheadCache | None = None,
+    ) -> Iterator[UpperBoundChecks]:
+        for parameter_sets in self.product(series, overhead_cache):
+            yield self.check(parameter_sets, statistics)
+
+
+class BranchAndBoundSearch(AbcSearchStrategy):
+    """BranchAndBoundSearch skips all parameter sets whose series or parallel
+    parameters alone already exceed the requirements, if the overhead functions are
+    monotone, and all parameter sets exceeding the dimensions in any direction, if
+    the overhead functions are separable. The remaining parameter sets are checked.
+    """
+
+    # the checks of each direction, which are computed once for all searched parts
+    _direction_checks: DirectionChecks | None = None
+
+    def search(
+        self,
+        series: slice,
+        best: BestSystemDesigns | ParetoSystemDesigns,
+        statistics: SearchStatistics,
+        overhead_cache: OverheadCache | None = None,
+    ) -> Iterator[UpperBoundChecks]:
+        for parameter_sets in self.product(
+            series,
+            overhead_cache,
+            prune=self.prune,
+            exceeded=self.exceeded(series, overhead_cache),
+        ):
+            yield self.check(parameter_sets, statistics)
+
+    @property
+    def prune(self) -> bool:
+        """whether the parameter sets are pruned by their series or parallel
+        parameters alone, i.e., whether the overhead functions are monotone"""
+        return getattr(self.overhead_functions, "monotone", False)
+
+    def exceeded(
+        self, series: slice, overhead_cache: OverheadCache | None = None
+    ) -> np.ndarray | None:
+        """returns the parameter sets exceeding the dimensions in any direction
+
+        :param series: the searched series parameters
+        :param overhead_cache: cache of the overheads of each level
+        :return: whether the dimensions are exceeded as joined by DirectionChecks,
+            None if the overhead functions are not separable
+        """
+        searched = range(*series.indices(len(self.parameters[0])))
+        if not getattr(self.overhead_functions, "separable", False) or (
+            len(searched) == 0
+        ):
+            return None
+        return self.direction_checks(overhead_cache).join(series)
+
+    def direction_checks(
+        self, overhead_cache: OverheadCache | None = None
+    ) -> DirectionChecks:
+        """returns the checks of the distinct counts of each direction of all
+        parameter sets
+
+        :param overhead_cache: cache of the overheads of each level
+        :return: the direction checks, which are computed once
+        """
+        if self._direction_checks is None:
+            self._direction_checks = DirectionChecks.from_parameters(
+                self.cell,
+                self.requirements,
+                [self.overhead_functions],
+                self.parameters,
+                overhead_cache,
+            )
+        return self._direction_checks
+
+
+class SamplingSearch(BranchAndBoundSearch):
+    """SamplingSearch checks a share of the parameter sets that are not skipped by the
+    branch-and-bound search. The sample evolves in generations from random parameter
+    sets towards the neighbours of the best validated ones, which differ in the
+    series or parallel parameters by a few rows or in the cell rotation. Parts with
+    few remaining parameter sets are checked completely. The sample of each part is
+    reproducible, but depends on the split of the parameter sets into parts.
+
+    :cvar share: share of the remaining parameter sets of each part that is checked
+    :cvar minimum: minimal number of checked parameter sets of each part
+    :cvar generations: number of generations of the sample
+    :cvar parents: number of the best validated parameter sets of a generation whose
+        neighbours are checked in the next generation
+    :cvar immigrants: share of random parameter sets in each generation
+    :cvar seed: seed of the random numbers
+    """
+
+    share: float = 0.1
+    minimum: int = 1000
+    generations: int = 5
+    parents: int = 20
+    immigrants: float = 0.2
+    seed: int = 0
+
+    def search(  # pylint: disable=too-many-locals
+        self,
+        series: slice,
+        best: BestSystemDesigns | ParetoSystemDesigns,
+        statistics: SearchStatistics,
+        overhead_cache: OverheadCache | None = None,
+    ) -> Iterator[UpperBoundChecks]:
+        rows = np.arange(len(self.parameters[0]))[series]
+        shape = (len(rows), len(self.parameters[1]), len(self.parameters[2]))
+        skipped = ParameterSetArrays.skipped(
+            self.cell,
+            self.requirements,
+            [self.overhead_functions],
+            (self.parameters[0][series], self.parameters[1], self.parameters[2]),
+            self.prune,
+            overhead_cache,
+            self.exceeded(series, overhead_cache),
+        )
+        # the flat indices of the remaining parameter sets, None if all remain
+        remaining = None if skipped is None else np.flatnonzero(~skipped.reshape(-1))
+        size = int(np.prod(shape)) if remaining is None else len(remaining)
+        samples = max(self.minimum, math.ceil(self.share * size))
+        if size <= samples:
+            for parameter_sets in self.product(
+                series, overhead_cache, exceeded=skipped
+            ):
+                yield self.check(parameter_sets, statistics)
+            return
+        rng = np.random.default_rng([self.seed, int(rows[0])])
+        population = math.ceil(samples / self.generations)
+        visited = np.empty(0, dtype=np.int64)
+        generation = np.unique(self.immigrants_of(rng, shape, remaining, population))
+        while len(generation) > 0:
+            visited = np.concatenate((visited, generation))
+            parameter_sets = self.parameter_sets(
+                rows, generation, shape, overhead_cache
+            )
+            checks = self.check(parameter_sets, statistics)
+            yield checks
+            generation = self.offspring(
+                rng,
+                self.fittest(generation, parameter_sets, checks),
+                (shape, remaining, visited),
+                min(population, samples - len(visited)),
+            )
+        statistics.unchecked += size - len(visited)
+
+    def parameter_sets(
+        self,
+        rows: np.ndarray,
+        generation: np.ndarray,
+        shape: tuple[int, int, int],
+        overhead_cache: OverheadCache | None = None,
+    ) -> ParameterSetArrays:
+        """returns the parameter sets of a generation
+
+        :param rows: the rows of the searched series parameters
+        :param generation: the flat indices of the parameter sets in the searched part
+            indexed by series parameters, parallel parameters and cell rotation
+        :param shape: shape of the searched part
+        :param overhead_cache: cache of the overheads of each level
+        :return: the parameter sets in the order of the generation
+        """
+        parameters_series, parameters_parallel, cell_rotation = self.parameters
+        # pylint: disable-next=unbalanced-tuple-unpacking
+        series_idx, parallel_idx, rotation_idx = np.unravel_index(generation, shape)
+        counts = np.empty((len(generation), len(LAYOUT_FIELDS)), dtype=np.int64)
+        counts[:, SERIES_COLUMNS] = parameters_series[rows[series_idx]]
+        counts[:, PARALLEL_COLUMNS] = parameters_parallel[parallel_idx]
+        return ParameterSetArrays(
+            self.cell,
+            self.requirements,
+            [self.overhead_functions],
+            counts,
+            np.asarray(cell_rotation, dtype=np.int64)[rotation_idx],
+            np.zeros(len(generation), dtype=np.int64),
+            overhead_cache,
+        )
+
+    def fittest(
+        self,
+        generation: np.ndarray,
+        parameter_sets: ParameterSetArrays,
+        checks: UpperBoundChecks,
+    ) -> np.ndarray:
+        """selects the best validated parameter sets of a generation
+
+        :param generation: the flat indices of the parameter sets
+        :param parameter_sets: the parameter sets of the generation
+        :param checks: the validated parameter sets of the generation
+        :return: the flat indices of the best validated parameter sets, ranked by
+            volume and weight, or by weight and volume if optimized by weight
+        """
+        volume, weight = checks.volume, checks.dimensions["weight"]
+        if self.requirements.optimized_by == "weight":
+            order = np.lexsort((volume, weight))
+        else:
+            order = np.lexsort((weight, volume))
+        index = {
+            (counts.tobytes(), rotation): x
+            for counts, rotation, x in zip(
+                parameter_sets.counts,
+                parameter_sets.cell_rotation.tolist(),
+                generation.tolist(),
+            )
+        }
+        validated = checks.parameter_sets
+        return np.array(
+            [
+                index[(validated.counts[i].tobytes(), int(validated.cell_rotation[i]))]
+                for i in order[: self.parents]
+            ],
+            dtype=np.int64,
+        )
+
+    def offspring(  # pylint: disable=too-many-locals
+        self,
+        rng: np.random.Generator,
+        parents: np.ndarray,
+        part: tuple[tuple[int, int, int], np.ndarray | None, np.ndarray],
+        number: int,
+    ) -> np.ndarray:
+        """returns the next generation of not yet checked parameter sets, i.e., the
+        neighbours of the parents and random parameter sets. A neighbour steps from a
+        random parent in the series parameters, the parallel parameters or the cell
+        rotation.
+
+        :param rng: the random number generator
+        :param parents: the flat indices of the parents
+        :param part: the shape of the searched part, the flat indices of the
+            parameter sets that are not skipped (None if none is skipped) and of the
+            checked ones
+        :param number: maximal size of the generation
+        :return: the flat indices of the next generation
+        """
+        shape, remaining, visited = part
+        if number <= 0:
+            return np.empty(0, dtype=np.int64)
+        size = int(number * (1 - self.immigrants)) if len(parents) > 0 else 0
+        pick = rng.integers(max(len(parents), 1), size=size)
+        direction = rng.integers(3, size=size)
+        step = rng.geometric(0.5, size=size) * rng.choice((-1, 1), size=size)
+        series_idx, parallel_idx, rotation_idx = (
+            np.asarray(x)[pick] for x in np.unravel_index(parents, shape)
+        )
+        series_idx = series_idx + step * (direction == 0)
+        parallel_idx = parallel_idx + step * (direction == 1)
+        rotation_idx = np.where(
+            direction == 2, (rotation_idx + 1) % shape[2], rotation_idx
+        )
+        inside = (
+            (series_idx >= 0)
+            & (series_idx < shape[0])
+            & (parallel_idx >= 0)
+            & (parallel_idx < shape[1])
+        )
+        children = np.ravel_multi_index(
+            (series_idx[inside], parallel_idx[inside], rotation_idx[inside]), shape
+        )
+        if remaining is not None:
+            children = children[np.isin(children, remaining)]
+        children = np.concatenate(
+            (children, self.immigrants_of(rng, shape, remaining, number))
+        )
+        # the first occurrence of each not yet checked parameter set is kept
+        _, first = np.unique(children, return_index=True)
+        children = children[np.sort(first)]
+        return children[~np.isin(children, visited)][:number]
+
+    @staticmethod
+    def immigrants_of(
+        rng: np.random.Generator,
+        shape: tuple[int, int, int],
+        remaining: np.ndarray | None,
+        number: int,
+    ) -> np.ndarray:
+        """returns random parameter sets
+
+        :param rng: the random number generator
+        :param shape: shape of the searched part
+        :param remaining: the flat indices of the parameter sets that are not
+            skipped, None if none is skipped
+        :param number: number of random parameter sets
+        :return: the flat indices of the random parameter sets, which may contain
+            duplicates
+        """
+        if remaining is None:
+            return rng.integers(int(np.prod(shape)), size=number)
+        return rng.choice(remaining, size=number)
+
+
+#: the built-in strategies by their name
+SEARCH_STRATEGIES: dict[str, type[AbcSearchStrategy]] = {
+    "exhaustive": ExhaustiveSearch,
+    "branch-and-bound": BranchAndBoundSearch,
+    "sampling": SamplingSearch,
+}
+
+
+def get_search_strategy(
+    strategy: str = "branch-and-bound", strategy_plugin: str = ""
+) -> type[AbcSearchStrategy]:
+    """returns the class of a built-in search strategy or of a plugin
+
+    :param strategy: name of the built-in strategy in SEARCH_STRATEGIES
+    :param strategy_plugin: name of an installed module, which implements a class
+        called 'SearchStrategy', overrides the built-in strategy
+    :return: the class of the search strategy
+    """
+    if strategy_plugin:
+        return load_plugin_class(strategy_plugin, "SearchStrategy")
+    return SEARCH_STRATEGIES[strategy]
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2010 - 2024, Fraunhofer-Gesellschaft zur Foerderung der angewandten Forschung e.V.
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""shared_precomputation provides the SharedPrecomputation class which holds the
+intermediate results that the designs of several requirements can share
+"""
+
+from dataclasses import dataclass, field
+
+from ..database.battery_cell import BatteryCell
+from ..requirements import Requirements
+from .basic_sets import ElectricalConfiguration
+from .design_cache import REQUIREMENT_FIELDS, DesignCache
+from .find_parameter_sets import ParameterSetsMemo
+from .overhead_functions import OverheadFunctions
+
+#: requirements that determine the electrical configuration of a cell
+ELECTRICAL_REQUIREMENT_FIELDS = (
+    "nominal_voltage",
+    "minimum_voltage",
+    "maximum_voltage",
+    "energy",
+    "cont_max_discharge_power",
+    "cont_max_charge_power",
+)
+
+
+@dataclass
+class SharedPrecomputation:
+    """Holds the intermediate results of the designs that do not depend on all
+    requirements, so that a batch of requirement variants computes them once
+
+    :param parameter_sets: memo of the parameter sets of the series and parallel
+        connection
+    :param electrical_configurations: electrical configurations keyed by the cell and
+        the electrical requirements
+    :param overhead_tables: cached overheads of each level as stored in an
+        OverheadCache, keyed by the cell, the overhead functions, the cooling and the
+        requirements the overheads depend on
+    """
+
+    parameter_sets: ParameterSetsMemo = field(default_factory=ParameterSetsMemo)
+    electrical_configurations: dict[tuple, ElectricalConfiguration] = field(
+        default_factory=dict, repr=False
+    )
+    overhead_tables: dict[tuple, dict] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_design_cache(
+        cls, design_cache: DesignCache | None
+    ) -> "SharedPrecomputation":
+        """creates the shared intermediate results of designs using a design cache
+
+        :param design_cache: cache of the best parameter sets of each cell, None
+            keeps the parameter sets in memory only
+        :return: the shared intermediate results, whose parameter sets are persisted
+            along the design cache
+        """
+        return cls(
+            ParameterSetsMemo(
+                None if design_cache is None else design_cache.parameter_sets_dir
+            )
+        )
+
+    @staticmethod
+    def electrical_key(cell: BatteryCell, requirements: Requirements) -> tuple:
+        """returns the key of the electrical configuration of a cell
+
+        :param cell: the cell used in the system designs
+        :param requirements: the requirements of the battery system
+        :return: the cell checksum and the electrical requirements
+        """
+        return (cell.checksum,) + tuple(
+            getattr(requirements, x) for x in ELECTRICAL_REQUIREMENT_FIELDS
+        )
+
+    @staticmethod
+    def overhead_key(
+        cell: BatteryCell,
+        requirements: Requirements,
+        overhead_functions: OverheadFunctions,
+    ) -> tuple:
+        """returns the key of the overheads of a cell and cooling type
+
+        :param cell: the cell used in the system designs
+        :param requirements: the requirements of the battery system
+        :param overhead_functions: the overhead functions of the cooling type
+        :return: the cell checksum, the overhead functions, the cooling and the
+            values of the requirement fields of the overhead functions
+        """
+        return (
+            cell.checksum,
+            type(overhead_functions).__module__,
+            type(overhead_functions).__qualname__,
+            overhead_functions.cooling.name,
+        ) + tuple(
+            (x, getattr(requirements, x))
+            for x in requirement_fields(overhead_functions)
+        )
+
+    def overhead_table(
+        self,
+        cell: BatteryCell,
+        requirements: Requirements,
+        overhead_functions: OverheadFunctions,
+    ) -> dict:
+        """returns the cached overheads of a cell and cooling type
+
+        :param cell: the cell used in the system designs
+        :param requirements: the requirements of the battery system
+        :param overhead_functions: the overhead functions of the cooling type
+        :return: the cached overheads, which are shared with all requirements that
+            agree in the requirement fields of the overhead functions
+        """
+        return self.overhead_tables.setdefault(
+            self.overhead_key(cell, requirements, overhead_functions), {}
+        )
+
+
+def requirement_fields(overhead_functions: OverheadFunctions) -> tuple[str, ...]:
+    """returns the requirements the overhead functions depend on
+
+    :param overhead_functions: the overhead functions of a cooling type
+    :return: the requirement fields of the overhead functions, or all requirement
+        fields, if the overhead functions do not declare them
+    """
+    fields = getattr(overhead_functions, "requirement_fields", None)
+    if fields is None:
+        return REQUIREMENT_FIELDS
+    return tuple(fields)
@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2010 - 2024, Fraunhofer-Gesellschaft zur Foerderung der angewandten Forschung e.V.
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""work_units provides the classes to check the parameter sets of the battery system
+designs in worker processes
+
+The read-only data of all work units is passed once to each worker process, the
+tasks only consist of indices and the results are compact numeric records.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+
+import numpy as np
+
+from ..database.battery_cell import BatteryCell
+from ..requirements import Requirements
+from ..utils import get_peak_memory_usage
+from .basic_sets import ElectricalConfiguration
+from .best_system_designs import BestSystemDesigns
+from .overhead_functions import OverheadFunctions
+from .parameter_set_arrays import LAYOUT_FIELDS, OverheadCache, UpperBoundChecks
+from .pareto_system_designs import ParetoSystemDesigns
+from .search_statistics import SearchStatistics
+from .search_strategies import AbcSearchStrategy, BranchAndBoundSearch
+
+#: considered cell rotations, 0=0° or 1=90° cell rotation
+CELL_ROTATION = (0, 1)
+
+
+@dataclass
+class CellParameters:
+    """Defines the electrical configuration and the parameters of the series and
+    parallel connection of one cell
+
+    :param cell: the cell used in the system designs
+    :param electrical_configuration: the electrical configuration of the cell
+    :param parameters_series: parameters of the series connection
+    :param parameters_parallel: parameters of the parallel connection
+    """
+
+    cell: BatteryCell
+    electrical_configuration: ElectricalConfiguration
+    parameters_series: np.ndarray = field(repr=False)
+    parameters_parallel: np.ndarray = field(repr=False)
+
+    def __len__(self) -> int:
+        """number of parameter sets of one cooling type"""
+        return (
+            len(self.parameters_series)
+            * len(self.parameters_parallel)
+            * len(CELL_ROTATION)
+        )
+
+
+@dataclass(frozen=True, order=True)
+class WorkUnit:
+    """Defines the parameter sets of one cell and cooling type which are checked by
+    one task, i.e., a slice of the series parameters with all parallel parameters and
+    cell rotations
+
+    :param cell_index: index of the cell in the considered cells
+    :param cooling_index: index of the overhead functions of the cooling type
+    :param series_start: first series parameter of the work unit
+    :param series_stop: series parameter after the last one of the work unit
+    """
+
+    cell_index: int
+    cooling_index: int
+    series_start: int
+    series_stop: int
+
+
+@dataclass
+class SystemDesignRecords:
+    """Holds the best validated parameter sets of one cell as numeric records
+
+    :param cell_index: index of the cell in the considered cells
+    :param values: objective value of each parameter set in ascending order, or
+        volume and weight of each parameter set in lexicographic order, if the
+        system designs are optimized for the pareto front
+    :param cooling_index: index of the overhead functions of each parameter set
+    :param counts: layout counts with the columns defined by LAYOUT_FIELDS
+    :param cell_rotation: cell rotation of each parameter set
+    :param exhaustive: True if all parameter sets of the records have been checked
+    :param statistics: the search statistics of the checked work unit, None for
+        merged or cached records
+    """
+
+    cell_index: int
+    values: np.ndarray = field(repr=False)
+    cooling_index: np.ndarray = field(repr=False)
+    counts: np.ndarray = field(repr=False)
+    cell_rotation: np.ndarray = field(repr=False)
+    exhaustive: bool = True
+    statistics: SearchStatistics | None = field(default=None, repr=False)
+
+    @classmethod
+    def from_rows(
+        cls, cell_index: int, rows: list[tuple[float, "SystemDesignRecords", int]]
+    ) -> "SystemDesignRecords":
+        """collects the rows of several records of the same cell
+
+        :param cell_index: index of the cell in the considered cells
+        :param rows: the rows as returned by the rows method
+        :return: the records of the rows in the passed order
+        """
+        return cls(
+            cell_index,
+            np.array([x[0] for x in rows], dtype=float),
+            np.array([x[1].cooling_index[x[2]] for x in rows], dtype=np.int64),
+            np.array([x[1].counts[x[2]] for x in rows], dtype=np.int64).reshape(
+                -1, len(LAYOUT_FIELDS)
+            ),
+            np.array([x[1].cell_rotation[x[2]] for x in rows], dtype=np.int64),
+        )
+
+    @classmethod
+    def concatenate(
+        cls, cell_index: int, records: list["SystemDesignRecords"]
+    ) -> "SystemDesignRecords":
+        """concatenates several records of the same cell
+
+        :param cell_index: index of the cell in the considered cells
+        :param records: the records of the cell
+        :return: the records in the passed order
+        """
+        return cls(
+            cell_index,
+            np.concatenate([x.values for x in records]),
+            np.concatenate([x.cooling_index for x in records]),
+            np.concatenate([x.counts for x in records]),
+            np.concatenate([x.cell_rotation for x in records]),
+            all(x.exhaustive for x in records),
+        )
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def take(self, index: np.ndarray) -> "SystemDesignRecords":
+        """selects rows of the records
+
+        :param index: indices of the selected rows
+        :return: the selected rows in the order of the indices
+        """
+        return SystemDesignRecords(
+            self.cell_index,
+            self.values[index],
+            self.cooling_index[index],
+            self.counts[index],
+            self.cell_rotation[index],
+            self.exhaustive,
+        )
+
+    def rows(self) -> list[tuple[float, "SystemDesignRecords", int]]:
+        """returns the records as tuples of objective value, records and row
+
+        :return: the records sorted by the objective value, which is a list of the
+            objective values for pareto fronts
+        """
+        return [(value, self, i) for i, value in enumerate(self.values.tolist())]
+
+
+class WorkUnitChecker:  # pylint: disable=too-many-instance-attributes
+    """WorkUnitChecker checks the parameter sets of work units and keeps the best
+    validated ones
+
+    :param requirements: the requirements of the battery system
+    :param overhead_functions: overhead functions, one for each cooling type
+    :param cell_parameters: the parameters of the considered cells
+    :param max_number: maximal number of kept parameter sets per work unit, which
+        is ignored for pareto fronts
+    :param chunk_size: number of parameter sets that are checked at once
+    :param deadline: time (as returned by time.time) after which no further chunks
+        are checked, None checks all parameter sets
+    :param overhead_tables: cached overheads of each level keyed by the indices of
+        the cell and the cooling type, which are extended by the checked work units
+    :param strategy: the strategy which searches the parameter sets of a work unit
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        requirements: Requirements,
+        overhead_functions: list[OverheadFunctions],
+        cell_parameters: list[CellParameters],
+        max_number: int,
+        chunk_size: int,
+        deadline: float | None = None,
+        overhead_tables: dict[tuple[int, int], dict] | None = None,
+        strategy: type[AbcSearchStrategy] = BranchAndBoundSearch,
+    ) -> None:
+        self.requirements = requirements
+        self.overhead_functions = overhead_functions
+        self.cell_parameters = cell_parameters
+        self.max_number = max_number
+        self.chunk_size = chunk_size
+        self.deadline = deadline
+        self.overhead_tables = {} if overhead_tables is None else overhead_tables
+        self.strategy = strategy
+        # the search strategy of each cell and cooling type, which is created in the
+        # process checking the work units
+        self._strategies: dict[tuple[int, int], AbcSearchStrategy] = {}
+
+    def describe(self, work_unit: WorkUnit) -> str:
+        """returns a description of the work unit for the log
+
+        :param work_unit: the work unit
+        :return: the description
+        """
+        return (
+            f"{self.cell_parameters[work_unit.cell_index].cell} "
+            f"({self.overhead_functions[work_unit.cooling_index].cooling.name}, "
+            f"series parameters {work_unit.series_start} to {work_unit.series_stop})"
+        )
+
+    def check(  # pylint: disable=too-many-locals
+        self, work_unit: WorkUnit
+    ) -> SystemDesignRecords:
+        """determines the best validated parameter sets of one work unit
+
+        :param work_unit: the work unit
+        :return: the best parameter sets of the work unit sorted by the objective, or
+            the pareto front of the work unit, with the search statistics
+        """
+        start = time.perf_counter()
+        cell_parameters = self.cell_parameters[work_unit.cell_index]
+        overhead_functions = self.overhead_functions[work_unit.cooling_index]
+        strategy = self.search_strategy(work_unit)
+        # the validated parameter sets are yielded chunk by chunk, so that only the
+        # best validated parameter sets are kept
+        best = self.best_system_designs()
+        number_of_parameter_sets = (
+            (work_unit.series_stop - work_unit.series_start)
+            * len(cell_parameters.parameters_parallel)
+            * len(CELL_ROTATION)
+        )
+        statistics = SearchStatistics(candidates=number_of_parameter_sets)
+        # the overheads of each level are reused by all parameter sets sharing the
+        # counts of this and the lower levels, if the overhead functions allow it
+        overhead_cache = None
+        if getattr(overhead_functions, "cache_overheads", False):
+            overhead_cache = OverheadCache(self.overhead_table(work_unit))
+        checks = strategy.search(
+            slice(work_unit.series_start, work_unit.series_stop),
+            best,
+            statistics,
+            overhead_cache,
+        )
+        stopped = False
+        while not stopped:
+            # the next parameter sets are only searched within the time budget
+            stopped = self.deadline is not None and time.time() > self.deadline
+            validated = None if stopped else next(checks, None)
+            if validated is None:
+                break
+            self.keep(best, validated)
+        skipped = (
+            number_of_parameter_sets
+            - statistics.accepted
+            - sum(statistics.rejected.values())
+        )
+        if stopped:
+            statistics.unchecked = skipped
+            logging.debug(
+                "Time budget expired while checking %s", self.describe(work_unit)
+            )
+        else:
+            # the parameter sets that are not left unchecked by the strategy are
+            # skipped by pruning and joining
+            statistics.pruned = skipped - statistics.unchecked
+            logging.debug(
+                "Pruned %s and left %s unchecked of %s parameter sets of %s",
+                statistics.pruned,
+                statistics.unchecked,
+                number_of_parameter_sets,
+                self.describe(work_unit),
+            )
+        exhaustive = not stopped and statistics.unchecked == 0
+        if overhead_cache is not None:
+            logging.debug(
+                "Overhead cache of %s: %s hits, %s misses",
+                self.describe(work_unit),
+                overhead_cache.hits,
+                overhead_cache.misses,
+            )
+        peak_memory_usage = get_peak_memory_usage()
+        if peak_memory_usage is not None:
+            logging.debug(
+                "Peak memory usage after processing %s: %.1f MiB",
+                self.describe(work_unit),
+                peak_memory_usage,
+            )
+        records = self.records(work_unit, best, exhaustive)
+        statistics.seconds = time.perf_counter() - start
+        records.statistics = statistics
+        return records
+
+    def best_system_designs(self) -> BestSystemDesigns | ParetoSystemDesigns:
+        """returns an empty collection of the best validated parameter sets
+
+        :return: the collection of the kept parameter sets
+        """
+        if self.requirements.optimized_by == "pareto":
+            return ParetoSystemDesigns()
+        return BestSystemDesigns(self.max_number)
+
+    def keep(
+        self,
+        best: BestSystemDesigns | ParetoSystemDesigns,
+        checks: UpperBoundChecks,
+    ) -> None:
+        """adds the validated parameter sets to the best parameter sets
+
+        :param best: the collection of the kept parameter sets
+        :param checks: the validated parameter sets
+        """
+        values = self.objective(checks)
+        for i in best.candidates(values):
+            best.add(
+                values[i],
+                (
+                    values[i],
+                    checks.parameter_sets.counts[i],
+                    checks.parameter_sets.cell_rotation[i],
+                ),
+            )
+
+    def records(
+        self,
+        work_unit: WorkUnit,
+        best: BestSystemDesigns | ParetoSystemDesigns,
+        exhaustive: bool,
+    ) -> SystemDesignRecords:
+        """returns the kept parameter sets of a work unit as numeric records
+
+        :param work_unit: the work unit
+        :param best: the collection of the kept parameter sets
+        :param exhaustive: whether all parameter sets of the work unit were checked
+        :return: the best parameter sets sorted by the objective, or the pareto front
+        """
+        kept = best.sorted()
+        return SystemDesignRecords(
+            work_unit.cell_index,
+            np.array([x[0] for x in kept], dtype=float).reshape(
+                (-1,) + self.objective_shape()
+            ),
+            np.full(len(kept), work_unit.cooling_index, dtype=np.int64),
+            np.array([x[1] for x in kept], dtype=np.int64).reshape(
+                -1, len(LAYOUT_FIELDS)
+            ),
+            np.array([x[2] for x in kept], dtype=np.int64),
+            exhaustive,
+        )
+
+    def search_strategy(self, work_unit: WorkUnit) -> AbcSearchStrategy:
+        """returns the search strategy of the cell and cooling type of a work unit
+
+        :param work_unit: the work unit
+        :return: the search strategy, which is created once per cell and cooling type
+        """
+        key = (work_unit.cell_index, work_unit.cooling_index)
+        if key not in self._strategies:
+            cell_parameters = self.cell_parameters[work_unit.cell_index]
+            self._strategies[key] = self.strategy(
+                cell_parameters.cell,
+                cell_parameters.electrical_configuration,
+                (
+                    cell_parameters.parameters_series,
+                    cell_parameters.parameters_parallel,
+                    np.asarray(CELL_ROTATION),
+                ),
+                self.overhead_functions[work_unit.cooling_index],
+                self.requirements,
+                self.chunk_size,
+            )
+        return self._strategies[key]
+
+    def overhead_table(self, work_unit: WorkUnit) -> dict:
+        """returns the cached overheads of the cell and cooling type of a work unit
+
+        :param work_unit: the work unit
+        :return: the cached overheads as stored in an OverheadCache
+        """
+        return self.overhead_tables.setdefault(
+            (work_unit.cell_index, work_unit.cooling_index), {}
+        )
+
+    def objective(self, checks: UpperBoundChecks) -> np.ndarray:
+        """returns the values by which the validated parameter sets are ranked
+
+        :param checks: the validated parameter sets
+        :return: the volume or weight of each parameter set, or both as columns for
+            pareto fronts
+        """
+        if self.requirements.optimized_by == "pareto":
+            return np.column_stack((checks.volume, checks.dimensions["weight"]))
+        if self.requirements.optimized_by == "volume":
+            return checks.volume
+        return checks.dimensions["weight"]
+
+    def objective_shape(self) -> tuple[int, ...]:
+        """returns the shape of the objective value of one parameter set
+
+        :return: the shape, i.e., two objective values for pareto fronts
+        """
+        if self.requirements.optimized_by == "pareto":
+            return (2,)
+        return ()
+
+
+#: the checker of the work units in a worker process
+_work_unit_checker: WorkUnitChecker | None = None
+
+
+def initialize_worker(checker: WorkUnitChecker, log_level: int) -> None:
+    """initializes a worker process with the data shared by all work units
+
+    :param checker: the checker of the work units
+    :param log_level: logging level of the worker process
+    """
+    global _work_unit_checker  # pylint: disable=global-statement
+    _work_unit_checker = checker
+    logging.getLogger().setLevel(log_level)
+
+
+def check_work_unit(
+    work_unit: WorkUnit,
+) -> tuple[WorkUnit, SystemDesignRecords, dict]:
+    """checks a work unit in a worker process initialized by initialize_worker
+
+    :param work_unit: the work unit
+    :return: the work unit, its best parameter sets sorted by the objective and the
+        overheads that have been added to the cached overheads of the work unit
+    """
+    overhead_table = _work_unit_checker.overhead_table(work_unit)
+    # the cached overheads are dictionaries, which keep the insertion order
+    sizes = {names: len(values) for names, values in overhead_table.items()}
+    records = _work_unit_checker.check(work_unit)
+    added = {
+        names: dict(islice(values.items(), sizes.get(names, 0), None))
+        for names, values in overhead_table.items()
+    }
+    return work_unit, records, added
@@ -32,6 +32,7 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 """Defines the requirements that can be specified to a battery system."""
+import copy
 import logging
 from pathlib import Path
 
@@ -65,6 +66,7 @@ class Requirements:  # pylint: disable=too-many-instance-attributes,too-few-publ
         else:
             self.optimized_by = opt_by
         self.only_best = system_requirements.get("only_best", False)
+        self.pareto_energy = system_requirements.get("pareto_energy", False)
         default_cell_settings = {"manufacturer": None, "model": None, "format": None}
         cell_settings = system_requirements.get("cell", default_cell_settings)
         self.manufacturer = cell_settings.get("manufacturer", None)
@@ -97,7 +99,7 @@ class Requirements:  # pylint: disable=too-many-instance-attributes,too-few-publ
 
         :raises [UnsatisfiableRequirement]: a requirement that is physically not satisfiable.
         """
-        if self.optimized_by not in ("volume", "weight"):
+        if self.optimized_by not in ("volume", "weight", "pareto"):
             raise UnsatisfiableRequirement("Optimization by unknown criteria.")
         if self.minimum_voltage >= self.maximum_voltage:
             raise UnsatisfiableRequirement(
@@ -108,12 +110,31 @@ class Requirements:  # pylint: disable=too-many-instance-attributes,too-few-publ
                 "Nominal voltage must be between minimum and maximum voltage."
             )
 
+    def replaced(self, name: str, value: float) -> "Requirements":
+        """Returns a copy of the requirements, in which one requirement is replaced.
+
+        :param name: name of the requirement attribute, e.g., energy or length
+        :param value: the new value of the requirement
+        :raises [UnsatisfiableRequirement]: the new value is physically not meaningful.
+        :return: the requirements with the replaced value
+        """
+        if not hasattr(self, name):
+            raise AttributeError(f"Unknown requirement '{name}'.")
+        requirements = copy.copy(self)
+        setattr(requirements, name, type(getattr(self, name))(value))
+        requirements.volume = (
+            requirements.width * requirements.height * requirements.length
+        )
+        requirements.validate()
+        return requirements
+
     def __str__(self) -> str:
         """String representation of the requirement."""
         _str = (
             "System Requirements:\n"
             f" Optimized by {self.optimized_by}\n"
             f" only_best {self.only_best}\n"
+            f" pareto_energy {self.pareto_energy}\n"
             f" Cell manufacturer: {self.manufacturer}\n"
             f" Cell model: {self.model}\n"
             f" Cell format: {self.format}\n"
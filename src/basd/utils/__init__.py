@@ -167,6 +167,73 @@ def set_logging_level(verbosity: int = 0) -> None:
     )
 
 
+def get_peak_memory_usage() -> float | None:
+    """returns the peak resident set size of the current process
+
+    :return: peak resident set size in MiB or None if it can not be determined
+    """
+    if sys.platform.lower().startswith("win32"):
+        import ctypes  # pylint: disable=import-outside-toplevel
+        from ctypes import wintypes  # pylint: disable=import-outside-toplevel
+
+        class ProcessMemoryCounters(ctypes.Structure):  # pylint: disable=R0903
+            """PROCESS_MEMORY_COUNTERS structure of the Windows API"""
+
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = ProcessMemoryCounters(cb=ctypes.sizeof(ProcessMemoryCounters))
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(
+            process, ctypes.byref(counters), ctypes.sizeof(counters)
+        ):
+            return None
+        return counters.PeakWorkingSetSize / 2**20
+    try:
+        import resource  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is given in bytes on macOS and in kilobytes otherwise
+    if sys.platform.lower().startswith("darwin"):
+        return peak / 2**20
+    return peak / 2**10
+
+
+def load_plugin_class(plugin_name: str, class_name: str) -> type:
+    """returns a class of an installed plugin module, exits if the module or the class
+    can not be found
+
+    :param plugin_name: name of the plugin module
+    :param class_name: name of the class the plugin has to implement
+
+    :return: the class of the plugin
+    """
+    import importlib  # pylint: disable=import-outside-toplevel
+
+    try:
+        plugin = importlib.import_module(plugin_name)
+        logging.debug("Using plugin '%s'", plugin)
+    except ModuleNotFoundError:
+        sys.exit(f"Could not find {plugin_name}")
+    if not hasattr(plugin, class_name):
+        sys.exit(
+            f"Plugin {plugin_name} does not implement a class called "
+            f"'{class_name}'.\nPlease check the documentation."
+        )
+    return getattr(plugin, class_name)
+
+
 def get_program_config() -> dict:
     """Returns the installation directories of the program
 
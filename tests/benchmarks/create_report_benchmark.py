@@ -0,0 +1,69 @@
+"""Measures the runtime of BatterySystemDesigns.create_report for growing numbers of
+system designs, the time per system design should stay roughly constant"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent.parent
+sys.path.append(str((ROOT / "src").resolve()))
+
+# pylint: disable=wrong-import-position
+from basd.database import CellDatabase
+from basd.designer import BatterySystemDesigns
+from basd.requirements import Requirements
+
+# pylint: enable=wrong-import-position
+
+TEST_CELL_EXAMPLE_CELL = ROOT / "tests/cells/Example_Cell.json"
+TEST_REQUIREMENTS_EXAMPLE = ROOT / "tests/requirements/Example-Requirements.json"
+
+
+def benchmark(
+    designs: BatterySystemDesigns, size: int, number: int, report_dir: Path
+) -> float:
+    """Times the report of the system designs repeated up to the passed size"""
+    system_designs = designs.system_designs
+    designs.system_designs = (system_designs * (size // len(system_designs) + 1))[:size]
+    try:
+        runtime = timeit.timeit(
+            lambda: designs.create_report(report_dir / f"report_{size}"),
+            number=number,
+        )
+    finally:
+        designs.system_designs = system_designs
+    return runtime / number
+
+
+def main():
+    """Times the report for the passed numbers of system designs"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "sizes",
+        nargs="*",
+        type=int,
+        default=[1000, 2000, 5000, 10000, 20000, 50000],
+        help="number of system designs in the report",
+    )
+    parser.add_argument("-n", "--number", type=int, default=1, help="repetitions")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.CRITICAL)
+    designs = BatterySystemDesigns(
+        Requirements(TEST_REQUIREMENTS_EXAMPLE),
+        CellDatabase(TEST_CELL_EXAMPLE_CELL),
+        max_number_of_solutions=1000,
+        overhead_plugin="",
+        cores=1,
+    )
+    print(f"{'designs':>8} {'report (s)':>12} {'per design (ms)':>16}")
+    with tempfile.TemporaryDirectory() as report_dir:
+        for size in args.sizes:
+            runtime = benchmark(designs, size, args.number, Path(report_dir))
+            print(f"{size:>8} {runtime:>12.3f} {runtime / size * 1000:>16.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+"""Times the stages of the designer on synthetic cell databases and requirements and
+writes the results to a JSON file, so that the runtimes of different versions can be
+compared
+
+The synthetic databases consist of cylindrical, pouch and prismatic cells with
+different chemistries and sizes, the synthetic requirements range from 48 V to
+1000 V systems. The designs are determined on one core, so that the runtime of each
+stage is measured in this process:
+
+- enumerate_parameter_sets: enumeration of the series and parallel parameter sets
+- _cell_parameters: electrical configurations and parameter sets of all cells
+- WorkUnitChecker.check: search of the best system designs of each cell
+- ParameterSetArrays.check_upper_bounds: upper bound checks of the parameter sets
+- create_report: report of the system designs
+"""
+
+import argparse
+import json
+import logging
+import platform
+import sys
+import tempfile
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).parent.parent.parent
+sys.path.append(str((ROOT / "src").resolve()))
+
+# pylint: disable=wrong-import-position
+from basd.database import CellDatabase
+from basd.designer import BatterySystemDesigns, find_parameter_sets
+from basd.designer.parameter_set_arrays import ParameterSetArrays
+from basd.designer.work_units import WorkUnitChecker
+from basd.requirements import Requirements
+from basd.utils.basd_version import __version__
+
+# pylint: enable=wrong-import-position
+
+#: dimensions (height, length, width) in m, weight in kg and capacity in Ah of the
+#: smallest cell of each format, larger cells are scaled from them
+CELL_FORMATS = {
+    "Cylindrical": ((0.065, 0.018, 0.018), 0.045, 2.5),
+    "Pouch": ((0.1, 0.01, 0.2), 0.4, 15.0),
+    "Prismatic": ((0.09, 0.013, 0.06), 0.17, 14.0),
+}
+#: nominal, minimum and maximum voltage of the cell chemistries in V
+CHEMISTRIES = {"NMC": (3.65, 2.8, 4.2), "LFP": (3.2, 2.5, 3.65)}
+#: the stages of the designer that are timed, as owner and name of the function
+STAGES = (
+    (find_parameter_sets, "enumerate_parameter_sets"),
+    (BatterySystemDesigns, "_cell_parameters"),
+    (WorkUnitChecker, "check"),
+    (ParameterSetArrays, "check_upper_bounds"),
+    (BatterySystemDesigns, "create_report"),
+)
+
+
+def create_cell_database(  # pylint: disable=too-many-locals
+    directory: Path, size: int, seed: int = 0
+) -> Path:
+    """Writes a synthetic cell database with cells of all formats and chemistries
+
+    :param directory: directory in which the database is created
+    :param size: number of cells
+    :param seed: seed of the random cell sizes
+    :return: the directory of the cell database
+    """
+    rng = np.random.default_rng(seed)
+    database = directory / f"cells_{size}"
+    database.mkdir()
+    formats = list(CELL_FORMATS)
+    chemistries = list(CHEMISTRIES)
+    for i in range(size):
+        cell_format = formats[i % len(formats)]
+        chemistry = chemistries[(i // len(formats)) % len(chemistries)]
+        (height, length, width), weight, capacity = CELL_FORMATS[cell_format]
+        nominal, minimum, maximum = CHEMISTRIES[chemistry]
+        scale = rng.uniform(1.0, 3.0)
+        if cell_format == "Cylindrical":
+            # the diameter grows with the square root of the capacity
+            length = width = length * np.sqrt(scale)
+        else:
+            width *= scale
+        capacity *= scale
+        # a monotonic discharge curve from 100 % to 0 % state of charge
+        discharge_curve = minimum + (maximum - minimum) * np.linspace(1, 0, 101) ** 0.7
+        cell = {
+            "identification": {"manufacturer": "Synthetic", "model": f"{i:05d}"},
+            "basics": {
+                "mechanics": {
+                    "weight": weight * scale,
+                    "format": cell_format,
+                    "standard": "",
+                    "dimensions": {"height": height, "length": length, "width": width},
+                },
+                "electrics": {
+                    "energy": {
+                        "nominal": capacity * nominal,
+                        "minimum": capacity * nominal,
+                    },
+                    "voltage": {
+                        "nominal": nominal,
+                        "maximum": maximum,
+                        "minimum": minimum,
+                    },
+                    "current": {"charge": capacity, "discharge": 2 * capacity},
+                    "capacity": {"initial": capacity},
+                    "discharge curve": discharge_curve.tolist(),
+                },
+            },
+        }
+        (database / f"{chemistry}_{cell_format}_{i:05d}.json").write_text(
+            json.dumps(cell, indent=4), encoding="utf-8"
+        )
+    return database
+
+
+def create_requirements(directory: Path, nominal_voltage: float) -> Path:
+    """Writes synthetic requirements of a battery system with a capacity of 200 Ah
+
+    :param directory: directory in which the requirements file is created
+    :param nominal_voltage: nominal voltage of the battery system in V
+    :return: the requirements file
+    """
+    energy = nominal_voltage * 200
+    requirements = {
+        "system": {"optimized_by": "volume", "only_best": False, "cooling": "AIR"},
+        "electrical": {
+            "energy": energy,
+            "voltage": {
+                "minimum": 0.75 * nominal_voltage,
+                "nominal": nominal_voltage,
+                "maximum": 1.2 * nominal_voltage,
+            },
+            "continuous maximum": {
+                "charge": {"power": energy / 2},
+                "discharge": {"power": energy},
+            },
+            "maximum module voltage": 60,
+            "slave": {"minimum": 1, "maximum": 100, "equal utilization": True},
+        },
+        "mechanical": {
+            "weight": energy / 50,
+            # the cells in series are stacked in length, the space is loose enough
+            # that designs are found for all voltages
+            "width": 3.0,
+            "height": 2.0,
+            "length": max(6.0, nominal_voltage / 8),
+        },
+    }
+    requirements_file = directory / f"requirements_{nominal_voltage:g}V.json"
+    requirements_file.write_text(json.dumps(requirements, indent=4), encoding="utf-8")
+    return requirements_file
+
+
+@contextmanager
+def timed_stages() -> Iterator[dict[str, dict]]:
+    """Replaces the functions of the timed stages by wrappers that accumulate their
+    runtime and number of calls
+
+    :return: the runtime in seconds and the calls of each stage by its name
+    """
+    stages = {}
+    originals = []
+
+    def wrap(name, function):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                stages[name]["seconds"] += time.perf_counter() - start
+                stages[name]["calls"] += 1
+
+        return wrapper
+
+    for owner, attribute in STAGES:
+        name = (
+            attribute
+            if owner is find_parameter_sets
+            else f"{owner.__name__}.{attribute}"
+        )
+        stages[name] = {"seconds": 0.0, "calls": 0}
+        function = getattr(owner, attribute)
+        originals.append((owner, attribute, function))
+        setattr(owner, attribute, wrap(name, function))
+    try:
+        yield stages
+    finally:
+        for owner, attribute, function in originals:
+            setattr(owner, attribute, function)
+
+
+def benchmark(
+    database: Path, requirements_file: Path, max_number_of_solutions: int, report: Path
+) -> dict:
+    """Determines and reports the system designs and times the stages
+
+    :param database: directory of the cell database
+    :param requirements_file: the requirements of the battery system
+    :param max_number_of_solutions: the maximal number of reported system designs
+    :param report: file name of the report
+    :return: the runtime of the stages, the total runtime and the number of system
+        designs
+    """
+    cell_database = CellDatabase(database)
+    requirements = Requirements(requirements_file)
+    with timed_stages() as stages:
+        start = time.perf_counter()
+        designs = BatterySystemDesigns(
+            requirements,
+            cell_database,
+            max_number_of_solutions=max_number_of_solutions,
+            overhead_plugin="",
+            cores=1,
+        )
+        if designs.system_designs:
+            designs.create_report(report)
+        total = time.perf_counter() - start
+    return {
+        "cells": len(cell_database.cells),
+        "nominal_voltage": requirements.nominal_voltage,
+        "system_designs": len(designs.system_designs),
+        "seconds": total,
+        "stages": stages,
+    }
+
+
+def compare(results: list[dict], baseline_file: Path) -> None:
+    """Prints the runtime of the stages relative to a previous benchmark
+
+    :param results: the results of this benchmark
+    :param baseline_file: the JSON file of a previous benchmark
+    """
+    baseline = json.loads(baseline_file.read_text(encoding="utf-8"))
+    previous = {(x["cells"], x["nominal_voltage"]): x for x in baseline["results"]}
+    print(f"\nCompared to version {baseline['version']} (ratio of the runtimes)")
+    for result in results:
+        reference = previous.get((result["cells"], result["nominal_voltage"]))
+        if reference is None:
+            continue
+        ratios = {
+            name: stage["seconds"] / reference["stages"][name]["seconds"]
+            for name, stage in result["stages"].items()
+            if reference["stages"].get(name, {}).get("seconds")
+        }
+        ratios["total"] = result["seconds"] / reference["seconds"]
+        print(
+            f"{result['cells']:>6} cells {result['nominal_voltage']:>7g} V: "
+            + ", ".join(f"{name} {ratio:.2f}" for name, ratio in ratios.items())
+        )
+
+
+def main():
+    """Times the designer for the passed numbers of cells and system voltages"""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--cells",
+        nargs="+",
+        type=int,
+        default=[10, 100],
+        help="number of cells in the synthetic cell databases",
+    )
+    parser.add_argument(
+        "--voltages",
+        nargs="+",
+        type=float,
+        default=[48, 400, 1000],
+        help="nominal voltages of the synthetic battery systems in V",
+    )
+    parser.add_argument(
+        "-m",
+        "--max-number-of-solutions",
+        type=int,
+        default=1000,
+        help="maximal number of reported system designs",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        default=Path(f"designer_benchmark_{__version__}.json"),
+        help="JSON file to which the results are written",
+    )
+    parser.add_argument(
+        "--compare", type=Path, help="JSON file of a previous benchmark"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.CRITICAL)
+    results = []
+    print(
+        f"{'cells':>6} {'voltage (V)':>12} {'designs':>8} {'total (s)':>10}  stages (s)"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        for size in args.cells:
+            database = create_cell_database(directory, size)
+            for voltage in args.voltages:
+                result = benchmark(
+                    database,
+                    create_requirements(directory, voltage),
+                    args.max_number_of_solutions,
+                    directory / f"report_{size}_{voltage:g}",
+                )
+                results.append(result)
+                print(
+                    f"{size:>6} {voltage:>12g} {result['system_designs']:>8} "
+                    f"{result['seconds']:>10.3f}  "
+                    + ", ".join(
+                        f"{name} {stage['seconds']:.3f}"
+                        for name, stage in result["stages"].items()
+                    )
+                )
+    args.output.write_text(
+        json.dumps(
+            {
+                "version": __version__,
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "date": datetime.now().isoformat(timespec="seconds"),
+                "results": results,
+            },
+            indent=4,
+        ),
+        encoding="utf-8",
+    )
+    if args.compare is not None:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
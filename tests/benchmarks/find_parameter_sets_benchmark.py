@@ -0,0 +1,56 @@
+"""Compares the runtime of find_parameter_sets and enumerate_parameter_sets"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).parent.parent.parent
+sys.path.append(str((ROOT / "src").resolve()))
+
+# pylint: disable-next=wrong-import-position
+from basd.designer.find_parameter_sets import (
+    enumerate_parameter_sets,
+    find_parameter_sets,
+)
+
+
+def benchmark(target: int, number: int) -> tuple[int, float, float]:
+    """Checks that both enumerators find the same parameter sets and times them"""
+
+    def validation_func(parameter: list) -> bool:
+        return np.prod(parameter) >= target
+
+    expected = find_parameter_sets([1] * 5, validation_func)
+    parameter_sets = enumerate_parameter_sets(target)
+    if set(expected) != set(map(tuple, parameter_sets.tolist())):
+        sys.exit(f"Different parameter sets for target {target}")
+    backtracking = timeit.timeit(
+        lambda: find_parameter_sets([1] * 5, validation_func), number=number
+    )
+    direct = timeit.timeit(lambda: enumerate_parameter_sets(target), number=number)
+    return len(parameter_sets), backtracking / number, direct / number
+
+
+def main():
+    """Times both enumerators for the passed targets"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "targets",
+        nargs="*",
+        type=int,
+        default=[10, 50, 100, 500, 1000, 2000, 5000],
+        help="number of cells in series or in parallel",
+    )
+    parser.add_argument("-n", "--number", type=int, default=3, help="repetitions")
+    args = parser.parse_args()
+    print(f"{'target':>8} {'sets':>8} {'backtracking (s)':>18} {'direct (s)':>12}")
+    for target in args.targets:
+        sets, backtracking, direct = benchmark(target, args.number)
+        print(f"{target:>8} {sets:>8} {backtracking:>18.5f} {direct:>12.5f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Measures the memory and the allocation time per candidate of the layout
+representations: ParameterSet objects and the packed integer rows of
+ParameterSetArrays, which are used by the search"""
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent.parent
+sys.path.append(str((ROOT / "src").resolve()))
+
+# pylint: disable=wrong-import-position
+from basd.database.battery_cell import BatteryCell
+from basd.designer.basic_sets import CellBlock, Module, Pack, String
+from basd.designer.cooling import Cooling
+from basd.designer.find_parameter_sets import enumerate_parameter_sets
+from basd.designer.overhead_functions import OverheadFunctions
+from basd.designer.parameter_set import ParameterSet
+from basd.designer.parameter_set_arrays import ParameterSetArrays
+from basd.requirements import Requirements
+
+# pylint: enable=wrong-import-position
+
+TEST_CELL_EXAMPLE_CELL = ROOT / "tests/cells/Example_Cell.json"
+TEST_REQUIREMENTS_EXAMPLE = ROOT / "tests/requirements/Example-Requirements.json"
+
+
+def measure(create) -> tuple[object, float, int]:
+    """Returns the created object, the runtime and the allocated memory, which is
+    traced in a second run, as tracing slows down the allocations"""
+    gc.collect()
+    start = time.perf_counter()
+    create()
+    runtime = time.perf_counter() - start
+    gc.collect()
+    tracemalloc.start()
+    result = create()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, runtime, memory
+
+
+def benchmark(target: int) -> dict[str, tuple[int, float, float]]:
+    """Creates all candidates of a number of cells in series and in parallel in both
+    representations"""
+    cell = BatteryCell(json.loads(TEST_CELL_EXAMPLE_CELL.read_text(encoding="utf-8")))
+    requirements = Requirements(TEST_REQUIREMENTS_EXAMPLE)
+    overhead_functions = [OverheadFunctions(Cooling.AIR)]
+    series = enumerate_parameter_sets(target)
+    parallel = enumerate_parameter_sets(4)
+    parameter_sets, packed_runtime, packed_memory = measure(
+        lambda: ParameterSetArrays.from_product(
+            cell, requirements, overhead_functions, series, parallel
+        )
+    )
+    rows = list(zip(parameter_sets.counts.tolist(), parameter_sets.cell_rotation))
+
+    def create_objects() -> list[ParameterSet]:
+        return [
+            ParameterSet(
+                cell=cell,
+                overhead=overhead_functions[0],
+                requirements=requirements,
+                cell_block=CellBlock(counts[0], counts[1]),
+                module=Module(counts[2], counts[3]),
+                string=String(counts[4], counts[5], counts[6]),
+                pack=Pack(counts[7], counts[8], counts[9]),
+                cell_rotation=int(rotation),
+            )
+            for counts, rotation in rows
+        ]
+
+    # the counts are already converted to integers, so that only the objects are
+    # measured
+    _, objects_runtime, objects_memory = measure(create_objects)
+    number = len(parameter_sets)
+    return {
+        "objects": (number, objects_memory / number, objects_runtime / number),
+        "packed": (number, packed_memory / number, packed_runtime / number),
+    }
+
+
+def main():
+    """Measures both representations for the passed numbers of cells in series"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "targets",
+        nargs="*",
+        type=int,
+        default=[100, 500, 2000],
+        help="number of cells in series, with 4 cells in parallel",
+    )
+    args = parser.parse_args()
+    print(
+        f"{'target':>8} {'representation':>15} {'candidates':>11} "
+        f"{'bytes/candidate':>16} {'us/candidate':>13}"
+    )
+    for target in args.targets:
+        for name, (number, memory, runtime) in benchmark(target).items():
+            print(
+                f"{target:>8} {name:>15} {number:>11} {memory:>16.1f} "
+                f"{runtime * 1e6:>13.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
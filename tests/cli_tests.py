@@ -1,6 +1,8 @@
 import argparse
+import json
 import logging
 import sys
+import tempfile
 import unittest
 from pathlib import Path
 
@@ -14,6 +16,7 @@ from basd import main  # pylint: disable=wrong-import-position
 TEST_CELL_DIR = ROOT / "tests/cells"
 TEST_CELL_EXAMPLE_CELL = ROOT / "tests/cells/Example_Cell.json"
 TEST_CELL_DUMMY_CELL = ROOT / "tests/cells/Dummy_Cell.json"
+TEST_REQUIREMENTS_EXAMPLE = ROOT / "tests/requirements/Example-Requirements.json"
 
 
 def make_test_cmd(cmd_args, cli=main) -> tuple:
@@ -43,6 +46,12 @@ class TestMainCommandsHelp(unittest.TestCase):
         result = runner.invoke(*make_test_cmd(["cad", "--help"]))
         self.assertEqual(result.exit_code, 0)
 
+    def test_basd_cache_main_help(self):
+        """Check the BaSD main cache help works"""
+        runner = CliRunner()
+        result = runner.invoke(*make_test_cmd(["cache", "--help"]))
+        self.assertEqual(result.exit_code, 0)
+
     def test_basd_db_main_help(self):
         """Check the BaSD main db help works"""
         runner = CliRunner()
@@ -78,6 +87,126 @@ class TestMainOptions(unittest.TestCase):
         self.assertEqual(result.exit_code, 0)
 
 
+class TestDesign(unittest.TestCase):
+    """Tests the design command"""
+
+    def test_basd_design_batch(self):
+        """Checks that a directory of requirement files creates one report each"""
+        requirements = json.loads(TEST_REQUIREMENTS_EXAMPLE.read_text(encoding="utf-8"))
+        runner = CliRunner()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            requirements_dir = Path(tmp_dir) / "requirements"
+            requirements_dir.mkdir()
+            for name, energy in (("a", 1.0), ("b", 1.5)):
+                requirements["electrical"]["energy"] *= energy
+                (requirements_dir / f"{name}.json").write_text(
+                    json.dumps(requirements), encoding="utf-8"
+                )
+            options = [
+                "-d",
+                str(TEST_CELL_EXAMPLE_CELL),
+                "--cores",
+                "1",
+                "--no-cache",
+                "--max-number-of-solutions",
+                "5",
+                "--stream",
+            ]
+            result = runner.invoke(
+                *make_test_cmd(
+                    ["design", "-r", str(requirements_dir), "--report"]
+                    + [str(Path(tmp_dir) / "report")]
+                    + options
+                )
+            )
+            self.assertEqual(result.exit_code, 0)
+            result = runner.invoke(
+                *make_test_cmd(
+                    ["design", "-r", str(requirements_dir / "b.json"), "--report"]
+                    + [str(Path(tmp_dir) / "single")]
+                    + options
+                )
+            )
+            self.assertEqual(result.exit_code, 0)
+            self.assertTrue((Path(tmp_dir) / "report_a.csv").is_file())
+            self.assertTrue((Path(tmp_dir) / "report_a.jsonl").is_file())
+            self.assertEqual(
+                (Path(tmp_dir) / "report_b.csv").read_text(encoding="utf-8"),
+                (Path(tmp_dir) / "single.csv").read_text(encoding="utf-8"),
+            )
+
+    def test_basd_design_strategy(self):
+        """Checks that the complete strategies report the same system designs"""
+        runner = CliRunner()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for strategy in ("exhaustive", "branch-and-bound", "milp"):
+                result = runner.invoke(
+                    *make_test_cmd(
+                        [
+                            "design",
+                            "-r",
+                            str(TEST_REQUIREMENTS_EXAMPLE),
+                            "-d",
+                            str(TEST_CELL_EXAMPLE_CELL),
+                            "--report",
+                            str(Path(tmp_dir) / strategy),
+                            "--cores",
+                            "1",
+                            "--no-cache",
+                            "--max-number-of-solutions",
+                            "10",
+                            "--strategy",
+                            strategy,
+                        ]
+                    )
+                )
+                self.assertEqual(result.exit_code, 0)
+                self.assertEqual(
+                    (Path(tmp_dir) / f"{strategy}.csv").read_text(encoding="utf-8"),
+                    (Path(tmp_dir) / "exhaustive.csv").read_text(encoding="utf-8"),
+                )
+
+    def test_basd_design_sweep(self):
+        """Checks that a sweep creates one report with the designs of all values"""
+        runner = CliRunner()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            report_file = Path(tmp_dir) / "sweep"
+            result = runner.invoke(
+                *make_test_cmd(
+                    [
+                        "design",
+                        "-r",
+                        str(TEST_REQUIREMENTS_EXAMPLE),
+                        "-d",
+                        str(TEST_CELL_EXAMPLE_CELL),
+                        "--report",
+                        str(report_file),
+                        "--cores",
+                        "1",
+                        "--no-cache",
+                        "--max-number-of-solutions",
+                        "5",
+                        "--sweep",
+                        "length=0.8,1.0",
+                    ]
+                )
+            )
+            self.assertEqual(result.exit_code, 0)
+            rows = report_file.with_suffix(".csv").read_text(encoding="utf-8")
+            self.assertEqual(
+                [x.split(",")[:2] for x in rows.splitlines()[1:]],
+                [["0.80", str(i)] for i in range(5)]
+                + [["1.00", str(i)] for i in range(5)],
+            )
+            result = runner.invoke(
+                *make_test_cmd(
+                    ["design", "-r", str(TEST_REQUIREMENTS_EXAMPLE)]
+                    + ["--sweep", "model=1:2:1"]
+                )
+            )
+            self.assertEqual(result.exit_code, 2)
+
+
 class TestDb(unittest.TestCase):
     """Tests the database functionalities"""
 
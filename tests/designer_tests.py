@@ -0,0 +1,938 @@
+"""Unit tests of the battery system designer"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import unittest
+from dataclasses import astuple
+from itertools import product
+from pathlib import Path
+
+import numpy as np
+from scipy import interpolate
+
+ROOT = Path(__file__).parent.parent
+sys.path.append(str((ROOT / "src").resolve()))
+
+# pylint: disable=wrong-import-position
+from basd.database import CellDatabase
+from basd.database.battery_cell import BatteryCell
+from basd.designer import BatterySystemDesigns
+from basd.designer.basic_sets import CellBlock, Module, Pack, String
+from basd.designer.best_system_designs import BestSystemDesigns
+from basd.designer.cooling import Cooling
+from basd.designer.count_caps import CountCaps
+from basd.designer.design_cache import DesignCache
+from basd.designer.direction_checks import DirectionChecks
+from basd.designer.electrical_configurations import electrical_configurations
+from basd.designer.find_parameter_sets import (
+    ParameterSetsMemo,
+    count_parameter_sets,
+    enumerate_parameter_sets,
+    find_parameter_sets,
+)
+from basd.designer.overhead_functions import OverheadFunctions
+from basd.designer.overhead_functions_abc import AbcOverheadFunctions
+from basd.designer.parameter_set import ParameterSet
+from basd.designer.parameter_set_arrays import (
+    LAYOUT_FIELDS,
+    OverheadCache,
+    ParameterSetArrays,
+)
+from basd.designer.pareto_system_designs import ParetoSystemDesigns, pareto_front
+from basd.designer.shared_precomputation import SharedPrecomputation
+from basd.designer.work_units import SystemDesignRecords
+from basd.requirements import Requirements
+
+sys.path.append(str((ROOT / "tests/custom_plugin/overhead_plugin").resolve()))
+# the custom overhead plugin only implements the overhead function of each layout
+import custom_overhead_function  # pylint: disable=wrong-import-order
+
+# pylint: enable=wrong-import-position
+
+TEST_CELL_EXAMPLE_CELL = ROOT / "tests/cells/Example_Cell.json"
+TEST_CELL_DUMMY_CELL = ROOT / "tests/cells/Dummy_Cell.json"
+TEST_REQUIREMENTS_EXAMPLE = ROOT / "tests/requirements/Example-Requirements.json"
+
+
+def load_example_cell() -> BatteryCell:
+    """Returns the example cell of the test data"""
+    return BatteryCell(json.loads(TEST_CELL_EXAMPLE_CELL.read_text(encoding="utf-8")))
+
+
+def layout_key(parameter_set: ParameterSet) -> tuple:
+    """Returns a hashable key of the layout of a parameter set"""
+    return (
+        parameter_set.overhead.cooling.value,
+        parameter_set.cell_rotation,
+        astuple(parameter_set.cell_block),
+        astuple(parameter_set.module),
+        astuple(parameter_set.string),
+        astuple(parameter_set.pack),
+    )
+
+
+def pareto_front_reference(values: np.ndarray) -> list[int]:
+    """Returns the indices of the non-dominated rows by comparing all pairs"""
+    return [
+        i
+        for i, row in enumerate(values)
+        if not np.any(np.all(values <= row, axis=1) & np.any(values < row, axis=1))
+    ]
+
+
+def check_upper_bounds_reference(  # pylint: disable=too-many-return-statements
+    parameter_set: ParameterSet,
+) -> tuple | None:
+    """Checks one parameter set with the scalar methods of ParameterSet"""
+    requirements = parameter_set.requirements
+    if parameter_set.get_maximum_module_voltage() >= requirements.max_module_voltage:
+        return None
+    bjb = False
+    dimensions = {}
+    for dim in ["length", "width", "height"]:
+        value, overhead = getattr(parameter_set, f"get_{dim}")(bjb=not bjb)
+        if value >= getattr(requirements, dim):
+            if bjb:
+                return None
+            value, overhead = getattr(parameter_set, f"get_{dim}")(bjb=False)
+            if value >= getattr(requirements, dim):
+                return None
+        else:
+            bjb = True
+        dimensions[dim] = (value, overhead)
+    if not bjb:
+        return None
+    weight = parameter_set.get_weight()
+    if weight[0] >= requirements.weight:
+        return None
+    slave_util = parameter_set.get_slave_utilization(requirements.slave_max)
+    if (
+        slave_util.min < requirements.slave_min
+        or slave_util.max > requirements.slave_max
+    ):
+        return None
+    return dimensions["height"], dimensions["length"], dimensions["width"], weight
+
+
+class TestEnumerateParameterSets(unittest.TestCase):
+    """Tests the direct enumeration of parameter sets"""
+
+    def test_same_parameter_sets_as_backtracking(self):
+        """Checks that the same parameter sets as find_parameter_sets are found"""
+        for target in list(range(1, 150)) + [997, 1024, 2310]:
+            with self.subTest(target=target):
+                expected = find_parameter_sets(
+                    [1, 1, 1, 1, 1],
+                    lambda x: np.prod(x)
+                    >= target,  # pylint: disable=cell-var-from-loop
+                )
+                parameter_sets = enumerate_parameter_sets(target)
+                self.assertEqual(parameter_sets.shape, (len(expected), 5))
+                self.assertEqual(
+                    set(expected), set(map(tuple, parameter_sets.tolist()))
+                )
+
+    def test_max_products(self):
+        """Checks that the caps only skip the parameter sets exceeding them and that
+        the parameter sets without caps are counted"""
+        for target in list(range(1, 80)) + [270]:
+            parameter_sets = enumerate_parameter_sets(target)
+            self.assertEqual(count_parameter_sets(target), len(parameter_sets))
+            for max_products in (
+                (((1, 3), 6),),
+                (((0, 1), 4), ((4,), 2)),
+                (((0, 1, 2, 3, 4), target),),
+            ):
+                with self.subTest(target=target, max_products=max_products):
+                    within_caps = np.ones(len(parameter_sets), dtype=bool)
+                    for positions, cap in max_products:
+                        within_caps &= (
+                            parameter_sets[:, list(positions)].prod(axis=1) <= cap
+                        )
+                    np.testing.assert_array_equal(
+                        enumerate_parameter_sets(target, max_products=max_products),
+                        parameter_sets[within_caps],
+                    )
+
+    def test_memo(self):
+        """Checks that the memoized parameter sets are shared and sorted by product"""
+        memo = ParameterSetsMemo()
+        parameter_sets = memo.parameter_sets(60)
+        self.assertIs(memo.parameter_sets(60), parameter_sets)
+        self.assertEqual((memo.hits, memo.misses), (1, 1))
+        self.assertFalse(parameter_sets.flags.writeable)
+        products = parameter_sets.prod(axis=1)
+        self.assertTrue(np.all(products[:-1] <= products[1:]))
+        self.assertEqual(
+            sorted(map(tuple, parameter_sets.tolist())),
+            sorted(map(tuple, enumerate_parameter_sets(60).tolist())),
+        )
+
+    def test_memo_persisted(self):
+        """Checks that persisted parameter sets are loaded instead of enumerated"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            expected = ParameterSetsMemo(Path(tmp_dir)).parameter_sets(60)
+            memo = ParameterSetsMemo(Path(tmp_dir))
+            np.testing.assert_array_equal(memo.parameter_sets(60), expected)
+            self.assertEqual((memo.hits, memo.misses), (1, 0))
+
+
+class TestElectricalConfigurations(unittest.TestCase):
+    """Tests the vectorized electrical configuration of many cells"""
+
+    def test_state_of_charge(self):
+        """Checks that the usable capacity is interpolated as by interp1d and that
+        the configuration of a cell does not depend on the other cells"""
+        cell = load_example_cell()
+        requirements = Requirements(TEST_REQUIREMENTS_EXAMPLE)
+        cells = []
+        for factor in (1.0, 0.8, 1.3):
+            scaled = load_example_cell()
+            scaled.electrics.capacity.initial *= factor
+            scaled.electrics.cont_current.discharge *= factor
+            cells.append(scaled)
+        configurations = electrical_configurations(cells + [cell], requirements)
+        self.assertEqual(astuple(configurations[0]), astuple(configurations[-1]))
+        for scaled, configuration in zip(cells, configurations):
+            self.assertEqual(
+                astuple(configuration),
+                astuple(electrical_configurations([scaled], requirements)[0]),
+            )
+            f_soc = interpolate.interp1d(
+                scaled.electrics.discharge_curve,
+                list(range(100, -1, -1)),
+                bounds_error=True,
+            )
+            self.assertAlmostEqual(
+                configuration.used_cell_capacity,
+                (
+                    f_soc(configuration.upper_bound_cell_voltage)
+                    - f_soc(configuration.lower_bound_cell_voltage)
+                )
+                / 100
+                * scaled.electrics.capacity.initial,
+            )
+            self.assertGreaterEqual(
+                configuration.system_energy, requirements.energy * 0.999
+            )
+
+    def test_invalid_discharge_curve(self):
+        """Checks that a discharge curve without one voltage per state of charge is
+        rejected"""
+        with self.assertRaises(ValueError):
+            electrical_configurations(
+                [
+                    BatteryCell(
+                        json.loads(TEST_CELL_DUMMY_CELL.read_text(encoding="utf-8"))
+                    )
+                ],
+                Requirements(TEST_REQUIREMENTS_EXAMPLE),
+            )
+
+
+class TestParameterSetArrays(unittest.TestCase):
+    """Tests the vectorized upper bound check against the scalar implementation"""
+
+    def setUp(self) -> None:
+        self.cell = load_example_cell()
+        self.requirements = Requirements(TEST_REQUIREMENTS_EXAMPLE)
+        self.overhead_functions = [OverheadFunctions(x) for x in Cooling]
+
+    def test_check_upper_bounds(self):
+        """Checks that the validated sets and properties match ParameterSet.get_*"""
+        series = find_parameter_sets([1] * 5, lambda x: np.prod(x) >= 40)
+        parallel = find_parameter_sets([1] * 5, lambda x: np.prod(x) >= 4)
+        parameter_sets = ParameterSetArrays.from_product(
+            self.cell,
+            self.requirements,
+            self.overhead_functions,
+            series,
+            parallel,
+        )
+        self.assertEqual(
+            len(parameter_sets),
+            len(self.overhead_functions) * len(series) * len(parallel) * 2,
+        )
+        expected = {}
+        for i in range(len(parameter_sets)):
+            parameter_set = parameter_sets.parameter_set(i)
+            result = check_upper_bounds_reference(parameter_set)
+            if result is not None:
+                expected[layout_key(parameter_set)] = result
+        checks = parameter_sets.check_upper_bounds()
+        self.assertGreater(len(checks), 0)
+        self.assertEqual(
+            sorted(expected),
+            sorted(
+                layout_key(checks.parameter_sets.parameter_set(i))
+                for i in range(len(checks))
+            ),
+        )
+        for i in range(len(checks)):
+            height, length, width, weight = expected[
+                layout_key(checks.parameter_sets.parameter_set(i))
+            ]
+            mech_prop = checks.mechanical_properties(i)
+            self.assertEqual(mech_prop.height, height[0])
+            self.assertEqual(mech_prop.length, length[0])
+            self.assertEqual(mech_prop.width, width[0])
+            self.assertEqual(mech_prop.weight, weight[0])
+            self.assertEqual(mech_prop.height_overhead, height[1])
+            self.assertEqual(mech_prop.length_overhead, length[1])
+            self.assertEqual(mech_prop.width_overhead, width[1])
+            self.assertEqual(mech_prop.weight_overhead, weight[1])
+
+    def test_iter_product_chunks(self):
+        """Checks that the chunks of iter_product add up to from_product"""
+        series = enumerate_parameter_sets(12)
+        parallel = enumerate_parameter_sets(3)
+        product_args = (
+            self.cell,
+            self.requirements,
+            self.overhead_functions,
+            series,
+            parallel,
+        )
+        parameter_sets = ParameterSetArrays.from_product(*product_args)
+        chunks = list(ParameterSetArrays.iter_product(*product_args, chunk_size=100))
+        self.assertTrue(all(len(x) <= 100 for x in chunks))
+        np.testing.assert_array_equal(
+            np.concatenate([x.counts for x in chunks]), parameter_sets.counts
+        )
+        np.testing.assert_array_equal(
+            np.concatenate([x.cooling for x in chunks]), parameter_sets.cooling
+        )
+        np.testing.assert_array_equal(
+            np.concatenate([x.cell_rotation for x in chunks]),
+            parameter_sets.cell_rotation,
+        )
+
+    def test_iter_product_prune(self):
+        """Checks that pruning skips parameter sets, but no valid parameter set"""
+        series = enumerate_parameter_sets(96)
+        parallel = enumerate_parameter_sets(4)
+        product_args = (
+            self.cell,
+            self.requirements,
+            self.overhead_functions,
+            series,
+            parallel,
+        )
+        self.assertTrue(all(x.monotone for x in self.overhead_functions))
+        parameter_sets = ParameterSetArrays.from_product(*product_args)
+        pruned = list(
+            ParameterSetArrays.iter_product(*product_args, chunk_size=500, prune=True)
+        )
+        self.assertLess(sum(len(x) for x in pruned), len(parameter_sets))
+        checks = parameter_sets.check_upper_bounds()
+        self.assertGreater(len(checks), 0)
+        expected = [
+            layout_key(checks.parameter_sets.parameter_set(i))
+            for i in range(len(checks))
+        ]
+        result = []
+        for chunk in pruned:
+            chunk_checks = chunk.check_upper_bounds()
+            result.extend(
+                layout_key(chunk_checks.parameter_sets.parameter_set(i))
+                for i in range(len(chunk_checks))
+            )
+        self.assertEqual(expected, result)
+
+    def test_iter_product_direction_checks(self):
+        """Checks that the joined direction checks skip parameter sets, but no valid
+        parameter set"""
+        series = enumerate_parameter_sets(96)
+        parallel = enumerate_parameter_sets(4)
+        product_args = (
+            self.cell,
+            self.requirements,
+            self.overhead_functions,
+            series,
+            parallel,
+        )
+        self.assertTrue(all(x.separable for x in self.overhead_functions))
+        parameter_sets = ParameterSetArrays.from_product(*product_args)
+        exceeded = DirectionChecks.from_parameters(
+            self.cell,
+            self.requirements,
+            self.overhead_functions,
+            (series, parallel, np.asarray((0, 1))),
+        ).join()
+        self.assertTrue(exceeded.any())
+        joined = list(
+            ParameterSetArrays.iter_product(
+                *product_args, chunk_size=500, exceeded=exceeded
+            )
+        )
+        self.assertEqual(
+            sum(len(x) for x in joined), len(parameter_sets) - exceeded.sum()
+        )
+        checks = parameter_sets.check_upper_bounds()
+        expected = [
+            layout_key(checks.parameter_sets.parameter_set(i))
+            for i in range(len(checks))
+        ]
+        result = []
+        for chunk in joined:
+            chunk_checks = chunk.check_upper_bounds()
+            result.extend(
+                layout_key(chunk_checks.parameter_sets.parameter_set(i))
+                for i in range(len(chunk_checks))
+            )
+        self.assertEqual(expected, result)
+
+    def test_overhead_cache(self):
+        """Checks that cached overheads give the same result as evaluating them"""
+        series = enumerate_parameter_sets(96)
+        parallel = enumerate_parameter_sets(4)
+        product_args = (
+            self.cell,
+            self.requirements,
+            self.overhead_functions,
+            series,
+            parallel,
+        )
+        checks = ParameterSetArrays.from_product(*product_args).check_upper_bounds()
+        overhead_cache = OverheadCache()
+        cached_checks = ParameterSetArrays.from_product(
+            *product_args, overhead_cache=overhead_cache
+        ).check_upper_bounds()
+        self.assertGreater(overhead_cache.hits, overhead_cache.misses)
+        np.testing.assert_array_equal(
+            checks.parameter_sets.counts, cached_checks.parameter_sets.counts
+        )
+        for name in ("overhead", "overhead_percentage", "dimensions"):
+            for key, value in getattr(checks, name).items():
+                np.testing.assert_array_equal(value, getattr(cached_checks, name)[key])
+
+    def test_batch_overheads(self):
+        """Checks that the batch overhead functions and the adapter of plugins without
+        them match the overhead functions of each layout"""
+        cell_data = json.loads(TEST_CELL_EXAMPLE_CELL.read_text(encoding="utf-8"))
+        names = sorted(AbcOverheadFunctions.__abstractmethods__ - {"__init__"})
+        for cell_format, overhead_class in product(
+            ("prismatic", "cylindrical", "pouch"),
+            (OverheadFunctions, custom_overhead_function.OverheadFunctions),
+        ):
+            cell_data["basics"]["mechanics"]["format"] = cell_format
+            parameter_sets = ParameterSetArrays.from_product(
+                BatteryCell(cell_data),
+                self.requirements,
+                [overhead_class(x) for x in Cooling],
+                enumerate_parameter_sets(12),
+                enumerate_parameter_sets(4),
+            )
+            base = np.linspace(0.1, 2.0, len(parameter_sets))
+            for cooling, overhead_functions in enumerate(
+                parameter_sets.overhead_functions
+            ):
+                index = np.flatnonzero(parameter_sets.cooling == cooling)
+                layouts = parameter_sets.subset(index).layout_arrays(cooling)
+                for name in names:
+                    with self.subTest(
+                        format=cell_format, plugin=overhead_class.__module__, name=name
+                    ):
+                        np.testing.assert_array_equal(
+                            overhead_functions.overheads(name, layouts, base[index]),
+                            [
+                                getattr(overhead_functions, name)(
+                                    parameter_sets.parameter_set(i), base[i]
+                                )
+                                for i in index
+                            ],
+                        )
+
+    def test_from_product_order(self):
+        """Checks that the parameter sets are created in itertools.product order"""
+        series = [(1, 2, 3, 4, 5), (5, 4, 3, 2, 1)]
+        parallel = [(2, 1, 1, 1, 1), (1, 2, 1, 1, 1), (1, 1, 1, 1, 2)]
+        parameter_sets = ParameterSetArrays.from_product(
+            self.cell, self.requirements, self.overhead_functions, series, parallel
+        )
+        for i, (overhead, ser, par, rotation) in enumerate(
+            product(self.overhead_functions, series, parallel, (0, 1))
+        ):
+            parameter_set = parameter_sets.parameter_set(i)
+            self.assertIs(parameter_set.overhead, overhead)
+            self.assertEqual((parameter_set.module.x, parameter_set.module.y), ser[0:2])
+            self.assertEqual(
+                (
+                    parameter_set.string.x,
+                    parameter_set.string.y,
+                    parameter_set.string.z,
+                ),
+                ser[2:5],
+            )
+            self.assertEqual(
+                (parameter_set.cell_block.x, parameter_set.cell_block.y), par[0:2]
+            )
+            self.assertEqual(
+                (parameter_set.pack.x, parameter_set.pack.y, parameter_set.pack.z),
+                par[2:5],
+            )
+            self.assertEqual(parameter_set.cell_rotation, rotation)
+
+
+class TestParameterSet(unittest.TestCase):
+    """Tests the layout of a parameter set"""
+
+    def test_slots(self):
+        """Checks that the layout objects have no instance dictionaries and that the
+        series and parallel accessors are preserved"""
+        parameter_set = ParameterSet(
+            cell=load_example_cell(),
+            overhead=OverheadFunctions(Cooling.AIR),
+            requirements=Requirements(TEST_REQUIREMENTS_EXAMPLE),
+        )
+        parameter_set["series"] = [1, 2, 3, 4, 5]
+        parameter_set["parallel"] = [2, 1, 1, 3, 1]
+        self.assertEqual(parameter_set["series"], (Module(1, 2), String(3, 4, 5)))
+        self.assertEqual(parameter_set["parallel"], (CellBlock(2, 1), Pack(1, 3, 1)))
+        for layout in (parameter_set,) + parameter_set["series"]:
+            with self.subTest(layout=type(layout).__name__):
+                self.assertFalse(hasattr(layout, "__dict__"))
+        with self.assertRaises(KeyError):
+            parameter_set["cells"] = [1, 1, 1, 1, 1]
+
+
+class TestBestSystemDesigns(unittest.TestCase):
+    """Tests the bounded collection of the best system designs"""
+
+    def test_bounded_and_sorted(self):
+        """Checks that only the best system designs are kept in sorted order"""
+        best = BestSystemDesigns(3)
+        for value, name in [(5.0, "a"), (1.0, "b"), (4.0, "c"), (2.0, "d"), (9.0, "e")]:
+            best.add(value, name)
+        self.assertEqual(len(best), 3)
+        self.assertEqual(best.sorted(), ["b", "d", "c"])
+        self.assertFalse(best.accepts(4.0))
+        self.assertTrue(best.accepts(3.0))
+
+    def test_ties_in_insertion_order(self):
+        """Checks that system designs with the same value keep the insertion order"""
+        best = BestSystemDesigns(2)
+        for name in ["a", "b", "c"]:
+            best.add(1.0, name)
+        self.assertEqual(best.sorted(), ["a", "b"])
+
+    def test_candidates(self):
+        """Checks that the candidates are the best values in ascending index order"""
+        best = BestSystemDesigns(2)
+        values = np.array([3.0, 1.0, 2.0, 1.0])
+        np.testing.assert_array_equal(best.candidates(values), [1, 3])
+        best.add(1.0, "a")
+        best.add(1.5, "b")
+        np.testing.assert_array_equal(best.candidates(values), [1, 3])
+        np.testing.assert_array_equal(best.candidates(np.array([2.0, 1.5])), [])
+
+
+class TestParetoSystemDesigns(unittest.TestCase):
+    """Tests the collection of the non-dominated system designs"""
+
+    def test_pareto_front(self):
+        """Checks the skyline algorithm against the pairwise comparison"""
+        rng = np.random.default_rng(0)
+        for objectives in (2, 3):
+            with self.subTest(objectives=objectives):
+                # few distinct values to get ties and duplicated rows
+                values = rng.integers(0, 8, size=(500, objectives)).astype(float)
+                front = pareto_front(values)
+                self.assertEqual(sorted(front.tolist()), pareto_front_reference(values))
+                self.assertEqual(values[front].tolist(), sorted(values[front].tolist()))
+
+    def test_pareto_front_ties(self):
+        """Checks that equal rows do not dominate each other and keep their order"""
+        values = np.array([[2.0, 1.0], [1.0, 2.0], [2.0, 1.0], [2.0, 2.0]])
+        np.testing.assert_array_equal(pareto_front(values), [1, 0, 2])
+
+    def test_streamed_candidates(self):
+        """Checks that adding batches keeps the front of all added values"""
+        rng = np.random.default_rng(1)
+        values = rng.random((300, 2))
+        pareto = ParetoSystemDesigns()
+        for start in range(0, len(values), 50):
+            batch = values[start : start + 50]
+            for i in pareto.candidates(batch):
+                pareto.add(batch[i], start + i)
+        self.assertEqual(pareto.sorted(), pareto_front(values).tolist())
+        self.assertEqual(len(pareto), len(pareto_front_reference(values)))
+
+
+class TestBatterySystemDesigns(unittest.TestCase):
+    """Tests the determination of the battery system designs"""
+
+    def test_independent_of_work_units(self):
+        """Checks that the designs do not depend on the cores and work units"""
+        results = []
+        for cores, chunk_size in ((1, 50000), (2, 50)):
+            designs = BatterySystemDesigns(
+                Requirements(TEST_REQUIREMENTS_EXAMPLE),
+                CellDatabase(TEST_CELL_EXAMPLE_CELL),
+                max_number_of_solutions=20,
+                overhead_plugin="",
+                cores=cores,
+                chunk_size=chunk_size,
+            )
+            results.append(
+                [
+                    (layout_key(x.layout), x.mechanical_properties.volume)
+                    for x in designs.system_designs
+                ]
+            )
+        self.assertEqual(len(results[0]), 20)
+        self.assertEqual(results[0], results[1])
+
+    def test_count_caps(self):
+        """Checks that the caps of the counts only skip parameter sets that can not
+        fulfill the requirements"""
+
+        class UncappedSystemDesigns(BatterySystemDesigns):
+            """enumerates all parameter sets"""
+
+            def _count_caps(self, cell, electrical_configuration):
+                return CountCaps()
+
+        requirements = json.loads(TEST_REQUIREMENTS_EXAMPLE.read_text(encoding="utf-8"))
+        # tight enough that the caps of the length and the weight exclude parameters
+        requirements["mechanical"]["length"] = 0.6
+        requirements["mechanical"]["weight"] = 40
+        results, sizes = [], []
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            requirements_file = Path(tmp_dir) / "requirements.json"
+            requirements_file.write_text(json.dumps(requirements), encoding="utf-8")
+            for designs_class in (BatterySystemDesigns, UncappedSystemDesigns):
+                designs = designs_class(
+                    Requirements(requirements_file),
+                    CellDatabase(TEST_CELL_EXAMPLE_CELL),
+                    max_number_of_solutions=20,
+                    overhead_plugin="",
+                    cores=1,
+                )
+                # pylint: disable-next=protected-access
+                sizes.append(len(designs._cell_parameters()[0]))
+                results.append(
+                    [
+                        (layout_key(x.layout), x.mechanical_properties.volume)
+                        for x in designs.system_designs
+                    ]
+                )
+        self.assertGreater(len(results[0]), 0)
+        self.assertEqual(results[0], results[1])
+        self.assertLess(sizes[0], sizes[1])
+
+    def test_count_caps_without_parameters(self):
+        """Checks that cells whose parameters are all excluded by the caps are
+        skipped"""
+        requirements = json.loads(TEST_REQUIREMENTS_EXAMPLE.read_text(encoding="utf-8"))
+        # the bare example cells exceed the weight, the lighter cells do not
+        requirements["mechanical"]["weight"] = 20
+        cell = json.loads(TEST_CELL_EXAMPLE_CELL.read_text(encoding="utf-8"))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            requirements_file = Path(tmp_dir) / "requirements.json"
+            requirements_file.write_text(json.dumps(requirements), encoding="utf-8")
+            cell_dir = Path(tmp_dir) / "cells"
+            cell_dir.mkdir()
+            (cell_dir / "Example_Cell.json").write_text(
+                json.dumps(cell), encoding="utf-8"
+            )
+            cell["identification"]["model"] = "Light_Cell"
+            cell["basics"]["mechanics"]["weight"] = 0.05
+            (cell_dir / "Light_Cell.json").write_text(
+                json.dumps(cell), encoding="utf-8"
+            )
+            designs = BatterySystemDesigns(
+                Requirements(requirements_file),
+                CellDatabase(cell_dir),
+                max_number_of_solutions=20,
+                overhead_plugin="",
+                cores=1,
+            )
+            # pylint: disable-next=protected-access
+            cell_parameters = designs._cell_parameters()
+        self.assertEqual(
+            sorted(len(x.parameters_parallel) > 0 for x in cell_parameters),
+            [False, True],
+        )
+        self.assertGreater(len(designs.system_designs), 0)
+        self.assertEqual(
+            {str(x.cell) for x in designs.system_designs}, {"Example:Light_Cell"}
+        )
+
+    def test_design_cache(self):
+        """Checks that cached designs equal the computed designs"""
+        results = []
+        with tempfile.TemporaryDirectory() as cache_dir:
+            for max_number in (20, 20, 10):
+                designs = BatterySystemDesigns(
+                    Requirements(TEST_REQUIREMENTS_EXAMPLE),
+                    CellDatabase(TEST_CELL_EXAMPLE_CELL),
+                    max_number_of_solutions=max_number,
+                    overhead_plugin="",
+                    cores=1,
+                    design_cache=DesignCache(Path(cache_dir)),
+                )
+                results.append(
+                    [
+                        (layout_key(x.layout), x.mechanical_properties.volume)
+                        for x in designs.system_designs
+                    ]
+                )
+            entries = DesignCache(Path(cache_dir)).entries()
+            self.assertEqual(len([x for x in entries if x.path.suffix == ".npz"]), 1)
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(results[0][:10], results[2])
+
+    def test_budgets(self):
+        """Checks that budgets return a subset of the designs and mark the search"""
+        results = {}
+        for name, budget in (
+            ("exhaustive", {}),
+            ("large", {"max_candidates": 10**9, "time_budget": 3600.0}),
+            ("candidates", {"max_candidates": 3000}),
+            ("time", {"time_budget": 0.0}),
+        ):
+            designs = BatterySystemDesigns(
+                Requirements(TEST_REQUIREMENTS_EXAMPLE),
+                CellDatabase(TEST_CELL_EXAMPLE_CELL),
+                max_number_of_solutions=100000,
+                overhead_plugin="",
+                cores=1,
+                **budget,
+            )
+            results[name] = (
+                designs.exhaustive,
+                [layout_key(x.layout) for x in designs.system_designs],
+            )
+        self.assertTrue(results["exhaustive"][0])
+        self.assertEqual(results["large"], results["exhaustive"])
+        self.assertFalse(results["candidates"][0])
+        self.assertTrue(0 < len(results["candidates"][1]) < len(results["large"][1]))
+        self.assertLessEqual(
+            set(results["candidates"][1]), set(results["exhaustive"][1])
+        )
+        self.assertEqual(results["time"], (False, []))
+
+    def test_statistics(self):
+        """Checks that each parameter set is counted once and that the statistics
+        are written next to the report"""
+        totals = []
+        for budget in ({"time_budget": 0.0}, {"max_candidates": 3000}, {}):
+            designs = BatterySystemDesigns(
+                Requirements(TEST_REQUIREMENTS_EXAMPLE),
+                CellDatabase(TEST_CELL_EXAMPLE_CELL),
+                max_number_of_solutions=20,
+                overhead_plugin="",
+                cores=1,
+                **budget,
+            )
+            total = designs.statistics.total()
+            self.assertEqual(list(designs.statistics.cells), ["Example:Example_Cell"])
+            self.assertGreater(total.candidates, 0)
+            self.assertEqual(
+                total.candidates,
+                total.pruned
+                + total.unchecked
+                + sum(total.rejected.values())
+                + total.accepted,
+            )
+            totals.append(total)
+        # the parameter sets beyond the budgets are candidates left unchecked
+        self.assertEqual(len({x.candidates for x in totals}), 1)
+        self.assertEqual(totals[0].unchecked, totals[0].candidates)
+        self.assertTrue(0 < totals[1].unchecked < totals[1].candidates)
+        self.assertEqual(totals[2].unchecked, 0)
+        self.assertGreaterEqual(total.accepted, len(designs.system_designs))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            designs.create_report(Path(tmp_dir) / "report")
+            statistics = json.loads(
+                (Path(tmp_dir) / "report.statistics.json").read_text(encoding="utf-8")
+            )
+        self.assertIn("check_work_units", statistics["stages"])
+        self.assertIn("report", statistics["stages"])
+        self.assertEqual(statistics["total"]["accepted"], total.accepted)
+
+    def test_stream(self):
+        """Checks that the stream contains the best parameter sets of all work units,
+        also if they are cached"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for cores, design_cache in ((2, None), (1, DesignCache(Path(tmp_dir)))):
+                for _ in range(1 if design_cache is None else 2):
+                    stream_file = Path(tmp_dir) / "report.jsonl"
+                    designs = BatterySystemDesigns(
+                        Requirements(TEST_REQUIREMENTS_EXAMPLE),
+                        CellDatabase(TEST_CELL_EXAMPLE_CELL),
+                        max_number_of_solutions=20,
+                        overhead_plugin="",
+                        cores=cores,
+                        chunk_size=500,
+                        design_cache=design_cache,
+                        stream_file=stream_file,
+                    )
+                    lines = [
+                        json.loads(x)
+                        for x in stream_file.read_text(encoding="utf-8").splitlines()
+                    ]
+                    streamed = {
+                        (x["cell_rotation"],) + tuple(x[name] for name in LAYOUT_FIELDS)
+                        for x in lines
+                    }
+                    self.assertLessEqual(
+                        {
+                            (x.layout.cell_rotation,)
+                            + astuple(x.layout.cell_block)
+                            + astuple(x.layout.module)
+                            + astuple(x.layout.string)
+                            + astuple(x.layout.pack)
+                            for x in designs.system_designs
+                        },
+                        streamed,
+                    )
+                    self.assertEqual(
+                        {x["cell"] for x in lines}, {"Example:Example_Cell"}
+                    )
+                    self.assertEqual(
+                        min(x["volume"] for x in lines),
+                        designs.system_designs[0].mechanical_properties.volume,
+                    )
+        # the cached parameter sets of the second run are streamed at once
+        self.assertEqual(len(lines), len(designs.system_designs))
+
+    def test_shared_precomputation(self):
+        """Checks that requirement variants sharing intermediate results are designed
+        as if they were designed on their own"""
+        requirements = json.loads(TEST_REQUIREMENTS_EXAMPLE.read_text(encoding="utf-8"))
+        shared = SharedPrecomputation()
+        number_of_overhead_tables = []
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for i, length in enumerate((1.0, 0.9)):
+                requirements["mechanical"]["length"] *= length
+                requirements_file = Path(tmp_dir) / f"{i}.json"
+                requirements_file.write_text(json.dumps(requirements), encoding="utf-8")
+                results = [
+                    [
+                        (layout_key(x.layout), x.mechanical_properties.volume)
+                        for x in BatterySystemDesigns(
+                            Requirements(requirements_file),
+                            CellDatabase(TEST_CELL_EXAMPLE_CELL),
+                            max_number_of_solutions=20,
+                            overhead_plugin="",
+                            cores=cores,
+                            shared=batch,
+                        ).system_designs
+                    ]
+                    for cores, batch in ((1, None), (1, shared), (2, shared))
+                ]
+                self.assertEqual(results[0], results[1])
+                self.assertEqual(results[0], results[2])
+                number_of_overhead_tables.append(len(shared.overhead_tables))
+        # the length does not change the electrical configuration and the overheads
+        self.assertEqual(len(shared.electrical_configurations), 1)
+        self.assertEqual(number_of_overhead_tables[0], number_of_overhead_tables[1])
+        self.assertEqual(shared.parameter_sets.misses, 2)
+
+    def test_pareto(self):
+        """Checks that the pareto mode reports the non-dominated system designs"""
+        requirements = json.loads(TEST_REQUIREMENTS_EXAMPLE.read_text(encoding="utf-8"))
+        designs = {}
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for optimized_by in ("volume", "pareto"):
+                requirements["system"]["optimized_by"] = optimized_by
+                requirements_file = Path(tmp_dir) / f"{optimized_by}.json"
+                requirements_file.write_text(json.dumps(requirements), encoding="utf-8")
+                designs[optimized_by] = BatterySystemDesigns(
+                    Requirements(requirements_file),
+                    CellDatabase(TEST_CELL_EXAMPLE_CELL),
+                    max_number_of_solutions=100000,
+                    overhead_plugin="",
+                    cores=1,
+                ).system_designs
+        values = np.array(
+            [
+                (x.mechanical_properties.volume, x.mechanical_properties.weight)
+                for x in designs["volume"]
+            ]
+        )
+        self.assertEqual(
+            sorted(
+                layout_key(designs["volume"][i].layout)
+                for i in pareto_front_reference(values)
+            ),
+            sorted(layout_key(x.layout) for x in designs["pareto"]),
+        )
+
+
+class TestDesignCache(unittest.TestCase):
+    """Tests the storage of the best parameter sets of a cell"""
+
+    def setUp(self) -> None:
+        # pylint: disable-next=consider-using-with
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = DesignCache(Path(self.tmp_dir.name))
+        self.records = SystemDesignRecords(
+            0,
+            np.array([1.0, 2.0, 3.0]),
+            np.array([0, 1, 0]),
+            np.arange(33).reshape(3, 11),
+            np.array([0, 1, 1]),
+        )
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_load(self):
+        """Checks that stored parameter sets are reused if they are sufficient"""
+        self.assertIsNone(self.cache.load("a", 0, 3))
+        self.cache.store("a", self.records, 3)
+        records = self.cache.load("a", 2, 2)
+        self.assertEqual(records.cell_index, 2)
+        np.testing.assert_array_equal(records.values, [1.0, 2.0])
+        np.testing.assert_array_equal(records.counts, self.records.counts[:2])
+        # three of three requested parameter sets might not be all valid ones
+        self.assertIsNone(self.cache.load("a", 0, 4))
+        # three of five requested parameter sets are all valid ones
+        self.cache.store("a", self.records, 5)
+        self.assertEqual(len(self.cache.load("a", 0, 10)), 3)
+
+    def test_evict(self):
+        """Checks that the least recently used files are removed"""
+        self.cache.store("a", self.records, 3)
+        self.cache.store("b", self.records, 3)
+        os.utime(self.cache.cache_dir / "a.npz", (0, 0))
+        self.cache.parameter_sets_dir.mkdir()
+        np.save(self.cache.parameter_sets_dir / "d.npy", self.records.counts)
+        os.utime(self.cache.parameter_sets_dir / "d.npy", (1, 1))
+        self.cache.max_size = self.cache.size() - 1
+        self.cache.store("c", self.records, 3)
+        self.assertEqual(sorted(x.path.stem for x in self.cache.entries()), ["b", "c"])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="BaSD designer unit test runner",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        dest="verbosity",
+        action="count",
+        default=0,
+        help="Sets the test verbosity",
+    )
+    args = parser.parse_args()
+    logging_levels = {
+        0: logging.CRITICAL,
+        1: logging.ERROR,
+        2: logging.WARNING,
+        3: logging.INFO,
+        4: logging.DEBUG,
+    }
+    logging.basicConfig(
+        level=logging_levels[min(args.verbosity, max(logging_levels.keys()))]
+    )
+    unittest.main()
@@ -0,0 +1,215 @@
+"""Unit tests of the search strategies and the requirement sweeps"""
+
+import argparse
+import json
+import logging
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).parent.parent
+sys.path.append(str((ROOT / "src").resolve()))
+
+# pylint: disable=wrong-import-position
+from basd.database import CellDatabase
+from basd.designer import BatterySystemDesigns
+from basd.designer.requirement_sweep import RequirementSweep, SweepSpecification
+from basd.designer.search_strategies import SamplingSearch
+from basd.requirements import Requirements
+
+sys.path.append(str((ROOT / "tests").resolve()))
+# the test data and helpers are shared with the designer tests
+from designer_tests import (  # pylint: disable=wrong-import-order
+    TEST_CELL_EXAMPLE_CELL,
+    TEST_REQUIREMENTS_EXAMPLE,
+    layout_key,
+)
+
+# pylint: enable=wrong-import-position
+
+
+class TestSearchStrategies(unittest.TestCase):
+    """Tests the search of the best system designs by each strategy"""
+
+    def test_complete_strategies(self):
+        """Checks that the complete strategies find the same designs, the pareto front
+        is not determined by mixed-integer linear programs"""
+        requirements = json.loads(TEST_REQUIREMENTS_EXAMPLE.read_text(encoding="utf-8"))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            requirements_file = Path(tmp_dir) / "requirements.json"
+            for optimized_by, only_best in (
+                ("volume", False),
+                ("weight", False),
+                ("volume", True),
+                ("pareto", False),
+            ):
+                requirements["system"].update(
+                    optimized_by=optimized_by, only_best=only_best
+                )
+                requirements_file.write_text(json.dumps(requirements), encoding="utf-8")
+                results = [
+                    [
+                        (str(x.cell), layout_key(x.layout), x.mechanical_properties)
+                        for x in BatterySystemDesigns(
+                            Requirements(requirements_file),
+                            CellDatabase(ROOT / "tests/cells"),
+                            max_number_of_solutions=20,
+                            overhead_plugin="",
+                            cores=1,
+                            strategy=strategy,
+                        ).system_designs
+                    ]
+                    for strategy in ("branch-and-bound", "exhaustive", "milp")
+                ]
+                with self.subTest(optimized_by=optimized_by, only_best=only_best):
+                    self.assertGreater(len(results[0]), 0)
+                    self.assertEqual(results[0], results[1])
+                    self.assertEqual(results[0], results[2])
+
+    def test_sampling_strategy(self):
+        """Checks that the sampling strategy finds validated designs reproducibly,
+        which are reported as not exhaustive if not all parameter sets are checked"""
+
+        class SmallSamples(SamplingSearch):
+            """checks a share of all parameter sets"""
+
+            minimum = 10
+
+        results = []
+        for share in (1.0, 0.1, 0.1):
+            with mock.patch.multiple(SamplingSearch, share=share, minimum=10):
+                designs = BatterySystemDesigns(
+                    Requirements(TEST_REQUIREMENTS_EXAMPLE),
+                    CellDatabase(TEST_CELL_EXAMPLE_CELL),
+                    max_number_of_solutions=20,
+                    overhead_plugin="",
+                    cores=1,
+                    strategy="sampling",
+                )
+            results.append(
+                (
+                    [layout_key(x.layout) for x in designs.system_designs],
+                    designs.exhaustive,
+                )
+            )
+        self.assertTrue(results[0][1])
+        self.assertFalse(results[1][1])
+        self.assertEqual(results[1], results[2])
+        self.assertGreater(len(results[1][0]), 0)
+        plugin = types.ModuleType("custom_search_strategy")
+        plugin.SearchStrategy = SmallSamples
+        with mock.patch.dict(sys.modules, {"custom_search_strategy": plugin}):
+            designs = BatterySystemDesigns(
+                Requirements(TEST_REQUIREMENTS_EXAMPLE),
+                CellDatabase(TEST_CELL_EXAMPLE_CELL),
+                max_number_of_solutions=20,
+                overhead_plugin="",
+                cores=1,
+                strategy_plugin="custom_search_strategy",
+            )
+        self.assertEqual(
+            ([layout_key(x.layout) for x in designs.system_designs], False),
+            results[1],
+        )
+
+
+class TestRequirementSweep(unittest.TestCase):
+    """Tests the sweep of a requirement"""
+
+    def test_parse(self):
+        """Checks the values of the sweep specifications"""
+        self.assertEqual(
+            SweepSpecification.parse("length=1.5:2.5:0.25").values,
+            [1.5, 1.75, 2.0, 2.25, 2.5],
+        )
+        self.assertEqual(
+            SweepSpecification.parse("energy=40000:120000:30000").values,
+            [40000.0, 70000.0, 100000.0],
+        )
+        self.assertEqual(
+            SweepSpecification.parse("weight=100,50").values, [100.0, 50.0]
+        )
+        for specification in ("length", "length=1:2", "length=2:1:1", "model=1,2"):
+            with self.subTest(specification=specification):
+                with self.assertRaises(ValueError):
+                    SweepSpecification.parse(specification)
+
+    def test_sweep(self):
+        """Checks that each value of a sweep is designed as if it was designed on its
+        own and that the stacked parameter sets are reused"""
+        requirements = Requirements(TEST_REQUIREMENTS_EXAMPLE)
+        cell_database = CellDatabase(TEST_CELL_EXAMPLE_CELL)
+        for name, factors, number_of_stacks in (
+            ("length", (0.8, 1.0, 0.9), 1),
+            ("weight", (1.0, 0.8), 1),
+            ("energy", (1.0, 1.05, 1.5), 2),
+        ):
+            specification = SweepSpecification(
+                name, [getattr(requirements, name) * x for x in factors]
+            )
+            sweep = RequirementSweep(
+                requirements,
+                cell_database,
+                specification,
+                max_number_of_solutions=20,
+                overhead_plugin="",
+                cores=1,
+            )
+            for value, designs in zip(specification.values, sweep.designs):
+                with self.subTest(name=name, value=value):
+                    self.assertEqual(getattr(designs.requirements, name), value)
+                    self.assertEqual(
+                        [
+                            (layout_key(x.layout), x.mechanical_properties.volume)
+                            for x in designs.system_designs
+                        ],
+                        [
+                            (layout_key(x.layout), x.mechanical_properties.volume)
+                            for x in BatterySystemDesigns(
+                                designs.requirements,
+                                cell_database,
+                                max_number_of_solutions=20,
+                                overhead_plugin="",
+                                cores=1,
+                            ).system_designs
+                        ],
+                    )
+            self.assertEqual(len(sweep.stacked_parameter_sets), number_of_stacks)
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                sweep.create_report(Path(tmp_dir) / "sweep")
+                report = (Path(tmp_dir) / "sweep.csv").read_text(encoding="utf-8")
+            rows = report.splitlines()
+            self.assertTrue(rows[0].startswith(f"{name},Rank,Manufacturer,"))
+            self.assertEqual(
+                len(rows) - 1, sum(len(x.system_designs) for x in sweep.designs)
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="BaSD search unit test runner",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        dest="verbosity",
+        action="count",
+        default=0,
+        help="Sets the test verbosity",
+    )
+    args = parser.parse_args()
+    logging_levels = {
+        0: logging.CRITICAL,
+        1: logging.ERROR,
+        2: logging.WARNING,
+        3: logging.INFO,
+        4: logging.DEBUG,
+    }
+    logging.basicConfig(
+        level=logging_levels[min(args.verbosity, max(logging_levels.keys()))]
+    )
+    unittest.main()